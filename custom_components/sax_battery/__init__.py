@@ -2,63 +2,97 @@
 
 from __future__ import annotations
 
+import functools
 import logging
 
 import pymodbus
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryNotReady
-
-from .const import CONF_PILOT_FROM_HA, DOMAIN
+from homeassistant.helpers import entity_registry as er
+
+from .const import (
+    CONF_DEVICE_ID,
+    CONF_PILOT_FROM_HA,
+    CONF_PROXY_HOST,
+    CONF_PROXY_PORT,
+    DEFAULT_PROXY_HOST,
+    DOMAIN,
+)
 from .coordinator import SAXBatteryCoordinator
 from .hub import create_hub
+from .proxy import async_start_proxies
+from .scheduler import DATA_SCHEDULER, async_get_scheduler
+from .services import async_setup_services, async_unload_services
 
 _LOGGER = logging.getLogger(__name__)
 
 
-def setup_pymodbus_logging() -> None:
-    """Set up aggressive PyModbus logging suppression."""
-    # Disable pymodbus logging completely
-    logging.getLogger("pymodbus.logging").disabled = True
-    logging.getLogger("pymodbus.client.tcp").disabled = True
-    logging.getLogger("pymodbus.client").disabled = True
-    logging.getLogger("pymodbus.transaction").disabled = True
-    logging.getLogger("pymodbus").setLevel(logging.CRITICAL + 10)  # Above CRITICAL
-
-    # Add a filter to catch any remaining pymodbus messages
-    class PyModbusFilter(logging.Filter):
-        """Filter to block pymodbus transaction ID and other noise."""
-
-        def filter(self, record) -> bool:
-            """Filter out pymodbus noise messages."""
-            if hasattr(record, "name") and "pymodbus" in record.name:
-                return False
-            message = getattr(record, "msg", "") or getattr(record, "message", "")
-            if isinstance(message, str):
-                return not any(
-                    phrase in message.lower()
-                    for phrase in [
-                        "transaction_id",
-                        "request ask for",
-                        "but got id",
-                        "skipping",
-                        "recv:",
-                        "send:",
-                        "extra data",
-                    ]
-                )
-            return True
-
-    # Apply the filter to root logger to catch everything
-    root_logger = logging.getLogger()
-    pymodbus_filter = PyModbusFilter()
-    root_logger.addFilter(pymodbus_filter)
+class _PyModbusLogSuppression:
+    """Silence the pymodbus logger hierarchy while any config entry is loaded.
+
+    Only loggers below ``pymodbus`` are touched, so records from the rest of
+    Home Assistant never pass through an extra filter. The previous logger
+    settings are restored once the last entry is unloaded.
+    """
+
+    _LOGGER_NAMES = (
+        "pymodbus.logging",
+        "pymodbus.client.tcp",
+        "pymodbus.client",
+        "pymodbus.transaction",
+    )
+
+    def __init__(self) -> None:
+        """Initialize the suppression state."""
+        self._entry_ids: set[str] = set()
+        self._saved_level = logging.NOTSET
+        self._saved_disabled: dict[str, bool] = {}
+
+    def acquire(self, entry_id: str) -> None:
+        """Install the suppression on first use."""
+        if not self._entry_ids:
+            root = logging.getLogger("pymodbus")
+            self._saved_level = root.level
+            root.setLevel(logging.CRITICAL + 10)  # Above CRITICAL
+            for name in self._LOGGER_NAMES:
+                logger = logging.getLogger(name)
+                self._saved_disabled[name] = logger.disabled
+                logger.disabled = True
+        self._entry_ids.add(entry_id)
+
+    def release(self, entry_id: str) -> None:
+        """Restore the pymodbus loggers once no entry needs the suppression."""
+        if entry_id not in self._entry_ids:
+            return
+        self._entry_ids.discard(entry_id)
+        if self._entry_ids:
+            return
+        logging.getLogger("pymodbus").setLevel(self._saved_level)
+        for name, disabled in self._saved_disabled.items():
+            logging.getLogger(name).disabled = disabled
+        self._saved_disabled.clear()
+
+
+_PYMODBUS_LOG_SUPPRESSION = _PyModbusLogSuppression()
+
+
+def setup_pymodbus_logging(entry_id: str) -> None:
+    """Set up PyModbus logging suppression for a config entry."""
+    _PYMODBUS_LOG_SUPPRESSION.acquire(entry_id)
+
+
+def remove_pymodbus_logging(entry_id: str) -> None:
+    """Remove PyModbus logging suppression for a config entry."""
+    _PYMODBUS_LOG_SUPPRESSION.release(entry_id)
 
 
 PLATFORMS = [Platform.NUMBER, Platform.SENSOR, Platform.SWITCH]
 
+SCAN_INTERVAL = 60  # seconds
+
 
 def get_device_id_parameter(unit_id: int) -> dict[str, int]:
     """Get the correct parameter name for device/slave ID based on pymodbus version.
@@ -67,16 +101,21 @@ def get_device_id_parameter(unit_id: int) -> dict[str, int]:
     In 3.11+, 'slave' parameter was renamed to 'device_id'.
     """
 
+    return {_device_id_keyword(): unit_id}
+
+
+@functools.cache
+def _device_id_keyword() -> str:
+    """Return the device ID keyword of the installed pymodbus, detected once."""
     try:
         version = pymodbus.__version__
         major, minor = map(int, version.split(".")[:2])
     except (AttributeError, ValueError):
         # Fallback to old parameter name if version detection fails
-        return {"slave": unit_id}
-    else:
-        if major > 3 or (major == 3 and minor >= 11):
-            return {"device_id": unit_id}
-        return {"slave": unit_id}
+        return "slave"
+    if major > 3 or (major == 3 and minor >= 11):
+        return "device_id"
+    return "slave"
 
 
 async def read_holding_registers_compat(client, address: int, count: int, unit_id: int):
@@ -97,27 +136,75 @@ async def write_registers_compat(client, address: int, values, unit_id: int):
     return await client.write_registers(address, values, **params)
 
 
+async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Migrate an old config entry."""
+    if entry.version > 1:
+        return False
+
+    if entry.minor_version < 2:
+        # Unique IDs used to be global, scope them to the config entry. IDs
+        # that already contain the device ID are unique per entry.
+        prefix = f"{DOMAIN}_"
+        scoped_prefix = f"{DOMAIN}_{entry.entry_id}_"
+        device_id = entry.data.get(CONF_DEVICE_ID)
+
+        @callback
+        def _scope_unique_id(entity_entry: er.RegistryEntry) -> dict[str, str] | None:
+            unique_id = entity_entry.unique_id
+            if (
+                not unique_id.startswith(prefix)
+                or unique_id.startswith(scoped_prefix)
+                or (device_id and unique_id.endswith(device_id))
+            ):
+                return None
+            return {"new_unique_id": scoped_prefix + unique_id.removeprefix(prefix)}
+
+        await er.async_migrate_entries(hass, entry.entry_id, _scope_unique_id)
+        hass.config_entries.async_update_entry(entry, minor_version=2)
+
+    return True
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up SAX Battery from a config entry."""
-    # Set up aggressive PyModbus logging suppression to reduce noise
-    setup_pymodbus_logging()
+    # Set up PyModbus logging suppression to reduce noise
+    setup_pymodbus_logging(entry.entry_id)
+    proxies = []
 
     try:
         # Create the hub
         hub = await create_hub(hass, dict(entry.data))
 
+        # Share one poll scheduler between all config entries
+        hub.scheduler = async_get_scheduler(hass)
+        hub.scheduler.register(entry.entry_id, SCAN_INTERVAL)
+
         # Create the coordinator
-        coordinator = SAXBatteryCoordinator(hass, hub, 60, entry)
+        coordinator = SAXBatteryCoordinator(hass, hub, SCAN_INTERVAL, entry)
 
         # Initial data fetch
         await coordinator.async_config_entry_first_refresh()
 
+        # Share the battery connections with other Modbus clients if enabled,
+        # serving registers read within the last update interval
+        if proxy_port := entry.data.get(CONF_PROXY_PORT, 0):
+            proxies = await async_start_proxies(
+                hub,
+                entry.data.get(CONF_PROXY_HOST, DEFAULT_PROXY_HOST),
+                proxy_port,
+                SCAN_INTERVAL,
+            )
+            coordinator.proxies = proxies
+
         # Store coordinator in hass.data
         hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
 
         # Set up platforms
         await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+        # Register integration services (shared by all entries)
+        async_setup_services(hass)
+
         # Set up pilot service if enabled
         if entry.data.get(CONF_PILOT_FROM_HA, False):
             from .pilot import async_setup_pilot  # noqa: PLC0415
@@ -126,6 +213,10 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     except Exception as err:
         _LOGGER.error("Failed to setup SAX Battery: %s", err)
+        for proxy in proxies:
+            await proxy.async_stop()
+        _async_unregister_scheduler(hass, entry.entry_id)
+        remove_pymodbus_logging(entry.entry_id)
         raise ConfigEntryNotReady from err
     else:
         return True
@@ -142,9 +233,27 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         if hasattr(coordinator.hub, "pilot"):
             await coordinator.hub.pilot.async_stop()
 
+        # Stop the proxies before their battery connections close
+        for proxy in coordinator.proxies:
+            await proxy.async_stop()
+
         # Disconnect the hub
         await coordinator.hub.disconnect()
 
         hass.data[DOMAIN].pop(entry.entry_id)
+        async_unload_services(hass)
+        _async_unregister_scheduler(hass, entry.entry_id)
+
+        remove_pymodbus_logging(entry.entry_id)
 
     return unload_ok
+
+
+@callback
+def _async_unregister_scheduler(hass: HomeAssistant, entry_id: str) -> None:
+    """Remove an entry from the poll scheduler, dropping it after the last one."""
+    if (scheduler := hass.data.get(DATA_SCHEDULER)) is None:
+        return
+    scheduler.unregister(entry_id)
+    if not scheduler.entries:
+        hass.data.pop(DATA_SCHEDULER)
@@ -0,0 +1,99 @@
+"""Per-battery circuit breaker for the SAX Battery hub."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from enum import StrEnum
+import random
+import time
+from typing import Any
+
+FAILURE_THRESHOLD = 3  # Consecutive failed cycles before the breaker opens
+PROBE_BACKOFF_INITIAL = 30.0  # seconds
+PROBE_BACKOFF_MAX = 900.0  # seconds
+
+
+class BreakerState(StrEnum):
+    """State of a circuit breaker."""
+
+    CLOSED = "closed"  # Battery is polled normally
+    OPEN = "open"  # Battery is skipped until the next probe
+    HALF_OPEN = "half_open"  # A single probe decides whether to close
+
+
+@dataclass(slots=True)
+class CircuitBreaker:
+    """Stop polling a battery after repeated failures.
+
+    Once ``failure_threshold`` consecutive cycles failed the breaker opens and
+    the battery is skipped. After an exponentially growing, jittered backoff
+    a single probe is allowed; success closes the breaker, failure opens it
+    again with twice the backoff.
+    """
+
+    failure_threshold: int = FAILURE_THRESHOLD
+    initial_backoff: float = PROBE_BACKOFF_INITIAL
+    max_backoff: float = PROBE_BACKOFF_MAX
+    clock: Callable[[], float] = time.monotonic
+    rng: random.Random = field(default_factory=random.Random)
+    state: BreakerState = BreakerState.CLOSED
+    failures: int = 0  # Consecutive failures
+    trips: int = 0  # Consecutive openings without a successful probe
+    probe_at: float = 0.0  # clock() time of the next probe while open
+
+    @property
+    def closed(self) -> bool:
+        """Return whether the battery is polled normally."""
+        return self.state is BreakerState.CLOSED
+
+    def allow_request(self) -> bool:
+        """Return whether the battery may be contacted now.
+
+        An open breaker moves to half-open once its backoff has passed, which
+        allows exactly one probe.
+        """
+        if self.state is BreakerState.CLOSED:
+            return True
+        if self.state is BreakerState.OPEN and self.clock() >= self.probe_at:
+            self.state = BreakerState.HALF_OPEN
+            return True
+        return False
+
+    def record_success(self) -> None:
+        """Close the breaker after a successful cycle or probe."""
+        self.state = BreakerState.CLOSED
+        self.failures = 0
+        self.trips = 0
+
+    def record_failure(self) -> bool:
+        """Count a failed cycle or probe and return whether the breaker opened."""
+        self.failures += 1
+        if self.state is BreakerState.HALF_OPEN or (
+            self.state is BreakerState.CLOSED
+            and self.failures >= self.failure_threshold
+        ):
+            self._open()
+            return True
+        return False
+
+    def _open(self) -> None:
+        """Open the breaker and schedule the next probe."""
+        self.trips += 1
+        backoff = min(self.initial_backoff * 2 ** (self.trips - 1), self.max_backoff)
+        # Equal jitter keeps probes of batteries that failed together apart
+        self.probe_at = self.clock() + backoff / 2 + self.rng.uniform(0, backoff / 2)
+        self.state = BreakerState.OPEN
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the breaker state for diagnostics."""
+        return {
+            "state": self.state.value,
+            "failures": self.failures,
+            "trips": self.trips,
+            "probe_in": (
+                round(max(0.0, self.probe_at - self.clock()), 1)
+                if self.state is BreakerState.OPEN
+                else None
+            ),
+        }
@@ -15,22 +15,39 @@ from .const import (
     CONF_ENABLE_SOLAR_CHARGING,
     CONF_LIMIT_POWER,
     CONF_MASTER_BATTERY,
+    CONF_MAX_DATA_AGE,
     CONF_MIN_SOC,
+    CONF_OPTIMIZER_HORIZON,
     CONF_PF_SENSOR,
     CONF_PILOT_FROM_HA,
     CONF_POWER_SENSOR,
+    CONF_PRICE_SENSOR,
     CONF_PRIORITY_DEVICES,
+    CONF_PROXY_HOST,
+    CONF_PROXY_PORT,
+    CONF_PV_FORECAST_SENSOR,
+    CONF_SAMPLE_SKEW,
+    CONF_SYNC_SAMPLING,
     DEFAULT_AUTO_PILOT_INTERVAL,
+    DEFAULT_MAX_DATA_AGE,
     DEFAULT_MIN_SOC,
+    DEFAULT_OPTIMIZER_HORIZON,
     DEFAULT_PORT,
+    DEFAULT_PROXY_HOST,
+    DEFAULT_SAMPLE_SKEW,
     DOMAIN,
+    MAX_BATTERY_COUNT,
+    TRANSPORT_PYMODBUS,
+    TRANSPORTS,
 )
+from .hub import battery_id_for_index
 
 
 class SAXBatteryConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for SAX Battery."""
 
     VERSION = 1
+    MINOR_VERSION = 2
 
     def __init__(self) -> None:
         """Initialize the config flow."""
@@ -57,7 +74,7 @@ class SAXBatteryConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             data_schema=vol.Schema(
                 {
                     vol.Required(CONF_BATTERY_COUNT, default=1): vol.All(
-                        vol.Coerce(int), vol.Range(min=1, max=3)
+                        vol.Coerce(int), vol.Range(min=1, max=MAX_BATTERY_COUNT)
                     ),
                 }
             ),
@@ -85,6 +102,17 @@ class SAXBatteryConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 {
                     vol.Required(CONF_PILOT_FROM_HA, default=False): bool,
                     vol.Required(CONF_LIMIT_POWER, default=False): bool,
+                    vol.Optional(
+                        CONF_MAX_DATA_AGE, default=DEFAULT_MAX_DATA_AGE
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3600)),
+                    vol.Optional(CONF_SYNC_SAMPLING, default=False): bool,
+                    vol.Optional(
+                        CONF_SAMPLE_SKEW, default=DEFAULT_SAMPLE_SKEW
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0.05, max=10)),
+                    vol.Optional(CONF_PROXY_PORT, default=0): vol.All(
+                        vol.Coerce(int), vol.Range(min=0, max=65535)
+                    ),
+                    vol.Optional(CONF_PROXY_HOST, default=DEFAULT_PROXY_HOST): str,
                 }
             ),
             errors=errors,
@@ -132,6 +160,9 @@ class SAXBatteryConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                         CONF_AUTO_PILOT_INTERVAL, default=DEFAULT_AUTO_PILOT_INTERVAL
                     ): vol.All(vol.Coerce(int), vol.Range(min=5, max=300)),
                     vol.Required(CONF_ENABLE_SOLAR_CHARGING, default=True): bool,
+                    vol.Optional(
+                        CONF_OPTIMIZER_HORIZON, default=DEFAULT_OPTIMIZER_HORIZON
+                    ): vol.All(vol.Coerce(int), vol.Range(min=24, max=48)),
                 }
             ),
             errors=errors,
@@ -156,6 +187,12 @@ class SAXBatteryConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     vol.Required(CONF_PF_SENSOR): selector.EntitySelector(
                         selector.EntitySelectorConfig(domain="sensor"),
                     ),
+                    vol.Optional(CONF_PRICE_SENSOR): selector.EntitySelector(
+                        selector.EntitySelectorConfig(domain="sensor"),
+                    ),
+                    vol.Optional(CONF_PV_FORECAST_SENSOR): selector.EntitySelector(
+                        selector.EntitySelectorConfig(domain="sensor"),
+                    ),
                 }
             )
 
@@ -214,14 +251,17 @@ class SAXBatteryConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         battery_choices = []
         battery_count = self._battery_count or 0  # Default to 0 if None
 
-        for i in range(1, battery_count + 1):
-            battery_id = f"battery_{chr(96 + i)}"
+        for i in range(battery_count):
+            battery_id = battery_id_for_index(i)
             battery_choices.append(battery_id)
 
             schema[vol.Required(f"{battery_id}_host")] = str
             schema[vol.Required(f"{battery_id}_port", default=DEFAULT_PORT)] = vol.All(
                 vol.Coerce(int), vol.Range(min=1, max=65535)
             )
+            schema[
+                vol.Optional(f"{battery_id}_transport", default=TRANSPORT_PYMODBUS)
+            ] = vol.In(TRANSPORTS)
 
         # Add master battery selection
         schema[vol.Required(CONF_MASTER_BATTERY)] = vol.In(battery_choices)
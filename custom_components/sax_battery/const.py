@@ -36,11 +36,30 @@ CONF_ENABLE_SOLAR_CHARGING = "enable_solar_charging"
 CONF_AUTO_PILOT_INTERVAL = "auto_pilot_interval"
 
 CONF_MANUAL_CONTROL = "manual_control"
+CONF_MAX_DATA_AGE = "max_data_age"
+CONF_PRICE_SENSOR = "price_sensor_entity_id"
+CONF_PV_FORECAST_SENSOR = "pv_forecast_sensor_entity_id"
+CONF_OPTIMIZER_HORIZON = "optimizer_horizon"
+CONF_SYNC_SAMPLING = "synchronized_sampling"
+CONF_SAMPLE_SKEW = "sample_skew"
+CONF_PROXY_PORT = "proxy_port"  # 0 disables the Modbus TCP proxy
+CONF_PROXY_HOST = "proxy_host"
 
 DEFAULT_PORT = 502  # Default Modbus port
 
+# Modbus TCP client per battery, stored as "<battery_id>_transport"
+TRANSPORT_PYMODBUS = "pymodbus"
+TRANSPORT_NATIVE = "native"
+TRANSPORTS = [TRANSPORT_PYMODBUS, TRANSPORT_NATIVE]
+MAX_BATTERY_COUNT = 32
+
 DEFAULT_MIN_SOC = 15
 DEFAULT_AUTO_PILOT_INTERVAL = 60  # seconds
+DEFAULT_MAX_DATA_AGE = 300  # seconds a failed value keeps its last good reading
+DEFAULT_SAMPLE_SKEW = 0.5  # seconds between samples that are combined
+DEFAULT_PROXY_HOST = "127.0.0.1"  # Only local clients unless configured
+DEFAULT_OPTIMIZER_HORIZON = 24  # hours, at most 48
+PILOT_MAX_DATA_AGE = 180  # seconds, the pilot holds off on older SOC or power
 
 SAX_PHASE_CURRENTS_SUM = "phase_currents_sum"
 SAX_CURRENT_L1 = "current_l1"
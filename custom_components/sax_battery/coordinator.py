@@ -3,19 +3,57 @@
 from __future__ import annotations
 
 import asyncio
+from collections.abc import Iterable
+from dataclasses import dataclass
 from datetime import timedelta
+from enum import StrEnum
 import logging
-from typing import Any
+import time
+from typing import Any, cast
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-
-from .const import CONF_DEVICE_ID
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.update_coordinator import (
+    CoordinatorEntity,
+    DataUpdateCoordinator,
+    UpdateFailed,
+)
+
+from .const import (
+    CONF_DEVICE_ID,
+    CONF_MAX_DATA_AGE,
+    CONF_SAMPLE_SKEW,
+    DEFAULT_MAX_DATA_AGE,
+    DEFAULT_SAMPLE_SKEW,
+    DOMAIN,
+    SAX_COMBINED_POWER,
+    SAX_COMBINED_SOC,
+)
+from .derived import DerivedMetricsEngine, default_metrics
 from .hub import HubConnectionError, HubException, SAXBatteryHub
+from .proxy import ModbusProxy
+from .timeseries import HISTORY_DURATION, RegisterSeries
 
 _LOGGER = logging.getLogger(__name__)
 
+# Combined values and the per-battery register they are derived from
+COMBINED_SOURCES = {"combined_soc": "soc", "combined_power": "power"}
+
+
+class ValueQuality(StrEnum):
+    """Quality of a value in the coordinator data."""
+
+    GOOD = "good"  # Read in the latest cycle
+    STALE = "stale"  # Latest read failed, the last good value is served
+
+
+@dataclass(frozen=True, slots=True)
+class Demand:
+    """Data keys a consumer needs and the oldest value it accepts."""
+
+    keys: tuple[str, ...]
+    max_age: float | None = None  # Seconds, None needs every cycle
+
 
 class SAXBatteryCoordinator(DataUpdateCoordinator):
     """SAX Battery data update coordinator."""
@@ -34,9 +72,15 @@ class SAXBatteryCoordinator(DataUpdateCoordinator):
             name="SAX Battery Coordinator",
             update_interval=timedelta(seconds=scan_interval),
         )
+        # Update in flight, shared by concurrent refreshes
+        self._update_task: asyncio.Task[dict[str, Any]] | None = None
         self._hub = hub
         self.entry = entry
-        self.device_id = entry.data.get(CONF_DEVICE_ID)
+        # Set by the config flow, typed for the entities' device info
+        self.device_id = cast(str, entry.data.get(CONF_DEVICE_ID))
+
+        # Entity unique IDs are scoped to the config entry
+        self.unique_id_prefix = f"{DOMAIN}_{entry.entry_id}"
 
         # Add other attributes that platforms might expect
         self.power_sensor_entity_id = entry.data.get("power_sensor_entity_id")
@@ -49,19 +93,52 @@ class SAXBatteryCoordinator(DataUpdateCoordinator):
             # Set each battery's _data_manager reference to this coordinator
             battery._data_manager = self  # noqa: SLF001
 
-        # Add master_battery attribute for compatibility (use first battery)
+        # Battery reporting the system values, the first unless configured
+        self.master_battery_id = hub.master_battery_id
         self.master_battery = (
-            next(iter(hub.batteries.values())) if hub.batteries else None
+            hub.batteries[hub.master_battery_id]
+            if hub.master_battery_id is not None
+            else None
         )
 
         # Add other attributes that might be expected
         self.modbus_clients = hub._clients  # noqa: SLF001
 
-        # Add more compatibility attributes that might be expected
-        self.last_updates: dict[str, Any] = {}
+        # time.monotonic() of the last good read and quality of every value
+        self.last_updates: dict[str, float] = {}
+        self.quality: dict[str, ValueQuality] = {}
+        self.max_data_age = entry.data.get(CONF_MAX_DATA_AGE, DEFAULT_MAX_DATA_AGE)
+        # Largest spread of sample times combined in synchronized sampling mode
+        self.sample_skew = entry.data.get(CONF_SAMPLE_SKEW, DEFAULT_SAMPLE_SKEW)
+        # Local Modbus TCP proxies serving other clients, one per battery
+        self.proxies: list[ModbusProxy] = []
+
+        # Registers outside a battery's read plan, i.e. marked as system
+        # registers in the register map, never have a value
+        self.unread_keys = {
+            battery.data_keys[key]
+            for battery in self.batteries.values()
+            for key in battery.data_keys.keys() - battery.read_plan.keys()
+        }
+
+        # Values derived from each snapshot, also exposed as sensors
+        self.derived = DerivedMetricsEngine(
+            default_metrics(
+                list(self.batteries), self.master_battery_id, self.unread_keys
+            )
+        )
+
+        # Active demands; once anything subscribed only these keys are read
+        self._demands: list[Demand] = []
+        self._demand_driven = False
+        self._demand_changed = False
+
+        # Recent good values of every numeric key, about HISTORY_DURATION long
+        self.history: dict[str, RegisterSeries] = {}
+        self._history_size = max(2, round(HISTORY_DURATION / scan_interval))
 
         # Add modbus_registers for compatibility with switch platform
-        self.modbus_registers = {}
+        self.modbus_registers: dict[str, dict[str, dict[str, Any]]] = {}
         for battery_id in self.batteries:
             self.modbus_registers[battery_id] = {
                 "sax_status": {
@@ -149,38 +226,292 @@ class SAXBatteryCoordinator(DataUpdateCoordinator):
                 return False
 
     async def _async_update_data(self) -> dict[str, Any]:
-        """Fetch data from the hub with timeout and sequential processing."""
-        # Prevent concurrent data fetching
-        if hasattr(self, "_fetching_lock"):
-            if self._fetching_lock.locked():
-                _LOGGER.debug("Data fetch already in progress, using cached data")
-                return self.data or {}
+        """Fetch data from the hub, joining an update that is already running.
+
+        Concurrent refreshes all receive the result of the same update.
+        """
+        if self._update_task is None or self._update_task.done():
+            self._update_task = self.hass.async_create_task(
+                self._async_fetch_data(), "sax_battery coordinator update"
+            )
         else:
-            self._fetching_lock = asyncio.Lock()
+            _LOGGER.debug("Data fetch already in progress, waiting for its result")
+        return await asyncio.shield(self._update_task)
 
-        async with self._fetching_lock:
-            try:
-                # Reduce timeout to prevent HA coordinator timeouts
-                raw_data = await asyncio.wait_for(
-                    self._hub.read_data(),
-                    timeout=20.0,  # Reduced from 25 to 20 seconds
+    async def _async_fetch_data(self) -> dict[str, Any]:
+        """Fetch data from the hub with timeout and sequential processing."""
+        # Keep clear of the read cycles of other config entries, except
+        # for the first refresh during setup
+        if self._hub.scheduler is not None and self.data is not None:
+            await self._hub.scheduler.async_wait_for_slot()
+
+        if self._demand_changed:
+            self._demand_changed = False
+            self._hub.set_demand(self._register_demand())
+
+        try:
+            # Reduce timeout to prevent HA coordinator timeouts
+            raw_data = await asyncio.wait_for(
+                self._hub.read_data(),
+                timeout=20.0,  # Reduced from 25 to 20 seconds
+            )
+
+        except TimeoutError:
+            _LOGGER.warning("Data fetch timed out after 20 seconds")
+            # Serve the last good values until they expire
+            raw_data = {}
+        except Exception as error:
+            _LOGGER.error("Error communicating with API: %s", error)
+            raise UpdateFailed(f"Error communicating with API: {error}") from error
+
+        data = self._merge_snapshot(raw_data)
+
+        # Calculate combined values for multi-battery systems
+        if self._samples_aligned():
+            data.update(self._calculate_combined_values(data))
+            self._update_combined_freshness()
+        else:
+            self._keep_combined_values(data)
+        for key in COMBINED_SOURCES:
+            if self.quality.get(key) is ValueQuality.GOOD:
+                self._record_history(key, self.last_updates[key], data[key])
+        self.combined_data = {
+            SAX_COMBINED_SOC: data["combined_soc"],
+            SAX_COMBINED_POWER: data["combined_power"],
+        }
+        data.update(self.derived.evaluate(data))
+
+        return data
+
+    def _merge_snapshot(self, raw_data: dict[str, Any]) -> dict[str, Any]:
+        """Merge a read cycle into the data, keeping recent good values.
+
+        Values that could not be read keep their last good value, marked
+        stale, until it is older than max_data_age. Expired values are dropped.
+        """
+        now = time.monotonic()
+        previous = self.data or {}
+        data: dict[str, Any] = {}
+
+        sample_times = self._hub.sample_times
+        for key, value in raw_data.items():
+            if value is not None:
+                acquired = sample_times.get(key, now)
+                data[key] = value
+                self.last_updates[key] = acquired
+                self.quality[key] = ValueQuality.GOOD
+                self._record_history(key, acquired, value)
+
+        deferred = self._hub.deferred_keys
+        for key, acquired in list(self.last_updates.items()):
+            if key in data or key in COMBINED_SOURCES:
+                continue
+            if key in deferred and key in previous:
+                # Not due this cycle, still as fresh as its consumers need
+                data[key] = previous[key]
+                continue
+            if key in previous and now - acquired <= self.max_data_age:
+                data[key] = previous[key]
+                self.quality[key] = ValueQuality.STALE
+            else:
+                del self.last_updates[key]
+                self.quality.pop(key, None)
+
+        # Values that were never read successfully stay None
+        for key, value in raw_data.items():
+            data.setdefault(key, value)
+
+        return data
+
+    @callback
+    def async_subscribe(
+        self, keys: Iterable[str], max_age: float | None = None
+    ) -> CALLBACK_TYPE:
+        """Register interest in data keys, return a callback removing it.
+
+        Once anything subscribed, the hub only reads the registers backing
+        subscribed keys. A register is read again when its value would be
+        older than the smallest ``max_age`` in seconds of its subscribers by
+        the next cycle; None reads it every cycle.
+        """
+        demand = Demand(tuple(keys), max_age)
+        self._demands.append(demand)
+        self._demand_driven = self._demand_changed = True
+
+        @callback
+        def _unsubscribe() -> None:
+            self._demands.remove(demand)
+            self._demand_changed = True
+
+        return _unsubscribe
+
+    def _register_demand(self) -> dict[str, dict[str, float]] | None:
+        """Return the age from which each demanded register is read again."""
+        if not self._demand_driven:
+            return None
+        interval = self.update_interval.total_seconds() if self.update_interval else 0.0
+        registers: dict[str, dict[str, float]] = {
+            battery_id: {} for battery_id in self.batteries
+        }
+        for demand in self._demands:
+            due = 0.0 if demand.max_age is None else max(0.0, demand.max_age - interval)
+            for battery_id, register in self._demanded_registers(demand.keys):
+                battery = registers[battery_id]
+                battery[register] = min(due, battery.get(register, due))
+        return registers
+
+    def _demanded_registers(self, keys: Iterable[str]) -> set[tuple[str, str]]:
+        """Return the (battery ID, register) pairs the keys are computed from."""
+        registers = set()
+        pending = list(keys)
+        seen = set()
+        while pending:
+            if (key := pending.pop()) in seen:
+                continue
+            seen.add(key)
+            if (data_key := self._hub.data_keys.get(key)) is not None:
+                registers.add((data_key.battery_id, data_key.register))
+            elif (register := COMBINED_SOURCES.get(key)) is not None:
+                pending.extend(
+                    f"{battery_id}_{register}" for battery_id in self.batteries
                 )
-
-                # Calculate combined values for multi-battery systems
-                combined_data = self._calculate_combined_values(raw_data)
-
-                # Merge raw data with combined values
-                raw_data.update(combined_data)
-
-                return raw_data  # noqa: TRY300
-
-            except TimeoutError:
-                _LOGGER.warning("Data fetch timed out after 20 seconds")
-                # Return last known data if available
-                return self.data or {}
-            except Exception as error:
-                _LOGGER.error("Error communicating with API: %s", error)
-                raise UpdateFailed(f"Error communicating with API: {error}") from error
+            elif (metric := self.derived.metrics.get(key)) is not None:
+                pending.extend(metric.inputs)
+            elif self.master_battery_id is not None:
+                # Unprefixed copy of a master battery register
+                registers.add((self.master_battery_id, key))
+        return registers
+
+    @callback
+    def async_set_registers(
+        self, battery_id: str, slave: int, address: int, registers: list[int]
+    ) -> None:
+        """Merge registers read outside a cycle, e.g. along with a write.
+
+        Updates the values, the combined and derived values and notifies the
+        listeners without rescheduling the next refresh.
+        """
+        battery = self.batteries[battery_id]
+        if self.data is None or not (
+            values := battery.decode_registers(slave, address, registers)
+        ):
+            return
+        keys = {
+            battery.data_keys[register]: value for register, value in values.items()
+        }
+        if battery_id == self.master_battery_id:
+            keys.update(values)
+        self.async_set_values(keys)
+
+    @callback
+    def async_set_values(self, values: dict[str, Any]) -> None:
+        """Merge data values read outside a cycle and notify the listeners.
+
+        The values count as fresh; the combined and derived values are
+        recomputed. The next refresh is not rescheduled.
+        """
+        if not self.data:
+            return
+        now = time.monotonic()
+        for key, value in values.items():
+            self.data[key] = value
+            self.last_updates[key] = now
+            self.quality[key] = ValueQuality.GOOD
+            self._record_history(key, now, value)
+        self.data.update(self._calculate_combined_values(self.data))
+        self._update_combined_freshness()
+        self.combined_data = {
+            SAX_COMBINED_SOC: self.data["combined_soc"],
+            SAX_COMBINED_POWER: self.data["combined_power"],
+        }
+        self.data.update(self.derived.evaluate(self.data))
+        self.async_update_listeners()
+
+    def _record_history(self, key: str, timestamp: float, value: Any) -> None:
+        """Append a good numeric value to the history of its key."""
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return
+        if (series := self.history.get(key)) is None:
+            series = self.history[key] = RegisterSeries(self._history_size)
+        series.append(timestamp, value)
+
+    def _update_combined_freshness(self) -> None:
+        """Age combined values by their oldest contributing battery value."""
+        for combined_key, register in COMBINED_SOURCES.items():
+            keys = [
+                key
+                for battery_id in self.batteries
+                if (key := f"{battery_id}_{register}") in self.last_updates
+            ]
+            if not keys:
+                self.last_updates.pop(combined_key, None)
+                self.quality.pop(combined_key, None)
+                continue
+            self.last_updates[combined_key] = min(
+                self.last_updates[key] for key in keys
+            )
+            self.quality[combined_key] = (
+                ValueQuality.STALE
+                if any(self.quality[key] is ValueQuality.STALE for key in keys)
+                else ValueQuality.GOOD
+            )
+
+    def _samples_aligned(self) -> bool:
+        """Return whether this cycle's battery values may be combined.
+
+        Always true unless the hub samples synchronously. Then every value
+        read in this cycle must come from the burst, and all burst samples
+        must lie within ``sample_skew`` seconds of each other.
+        """
+        if not self._hub.synchronized_sampling:
+            return True
+        sample_times = self._hub.sample_times
+        times = []
+        for battery_id in self.batteries:
+            for register in COMBINED_SOURCES.values():
+                key = f"{battery_id}_{register}"
+                if self.quality.get(key) is not ValueQuality.GOOD:
+                    continue  # Not read in this cycle
+                if (sampled_at := sample_times.get(key)) is None:
+                    _LOGGER.debug("No synchronized sample of %s this cycle", key)
+                    return False
+                times.append(sampled_at)
+        if times and (spread := max(times) - min(times)) > self.sample_skew:
+            _LOGGER.debug(
+                "Battery samples %.3fs apart, more than %ss", spread, self.sample_skew
+            )
+            return False
+        return True
+
+    def _keep_combined_values(self, data: dict[str, Any]) -> None:
+        """Serve the previous combined values as stale until they expire."""
+        now = time.monotonic()
+        previous = self.data or {}
+        for key in COMBINED_SOURCES:
+            acquired = self.last_updates.get(key)
+            if (
+                acquired is not None
+                and previous.get(key) is not None
+                and now - acquired <= self.max_data_age
+            ):
+                data[key] = previous[key]
+                self.quality[key] = ValueQuality.STALE
+            else:
+                data[key] = None
+                self.last_updates.pop(key, None)
+                self.quality.pop(key, None)
+
+    def value_age(self, key: str) -> float | None:
+        """Return the seconds since a value was last read, None if it never was."""
+        if (acquired := self.last_updates.get(key)) is None:
+            return None
+        return time.monotonic() - acquired
+
+    def freshness_attributes(self, key: str) -> dict[str, Any]:
+        """Return the age and quality of a value as entity attributes."""
+        if (age := self.value_age(key)) is None:
+            return {}
+        return {"data_age": round(age), "data_quality": self.quality[key].value}
 
     def _calculate_combined_values(self, data: dict[str, Any]) -> dict[str, Any]:
         """Calculate combined values from all batteries."""
@@ -261,3 +592,23 @@ class SAXBatteryCoordinator(DataUpdateCoordinator):
     def hub(self) -> SAXBatteryHub:
         """Return the hub."""
         return self._hub
+
+
+class SAXBatteryEntity(CoordinatorEntity[SAXBatteryCoordinator]):
+    """Entity showing coordinator data, subscribed to it while added.
+
+    Subclasses set ``_demand_keys`` to the data keys they read.
+    """
+
+    _demand_keys: tuple[str, ...] = ()
+    _demand_max_age: float | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to the data keys of the entity."""
+        await super().async_added_to_hass()
+        if self._demand_keys:
+            self.async_on_remove(
+                self.coordinator.async_subscribe(
+                    self._demand_keys, self._demand_max_age
+                )
+            )
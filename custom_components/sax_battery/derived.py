@@ -0,0 +1,220 @@
+"""Declarative metrics derived from the coordinator snapshot."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from graphlib import TopologicalSorter
+import logging
+from typing import Any
+
+from homeassistant.components.sensor import SensorDeviceClass
+from homeassistant.const import PERCENTAGE, UnitOfEnergy, UnitOfPower, UnitOfTime
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class DerivedMetric:
+    """A value computed from snapshot fields or other derived metrics.
+
+    ``function`` receives the values of ``inputs`` in order and is only called
+    when none of them is None. It may return None when the metric does not
+    apply, e.g. time to full while discharging.
+    """
+
+    key: str
+    inputs: tuple[str, ...]
+    function: Callable[..., float | None]
+    name: str
+    unit: str | None = None
+    device_class: SensorDeviceClass | None = None
+    precision: int = 1
+    battery_id: str | None = None  # Battery the metric belongs to, if any
+
+
+class DerivedMetricsEngine:
+    """Evaluate derived metrics once per snapshot in dependency order.
+
+    Metrics are sorted once so that every metric is evaluated after the
+    metrics it depends on. A metric is only recomputed when one of its input
+    values changed since the previous snapshot.
+    """
+
+    def __init__(self, metrics: Iterable[DerivedMetric]) -> None:
+        """Initialize the engine, raises graphlib.CycleError on cycles."""
+        self.metrics = {metric.key: metric for metric in metrics}
+        graph = {
+            key: [name for name in metric.inputs if name in self.metrics]
+            for key, metric in self.metrics.items()
+        }
+        self._order = list(TopologicalSorter(graph).static_order())
+        self._inputs: dict[str, tuple[float | None, ...]] = {}
+        self._values: dict[str, float | None] = {}
+        self.evaluations = 0  # Metric functions called, for diagnostics
+
+    def evaluate(self, data: dict[str, Any]) -> dict[str, float | None]:
+        """Return all derived values for a snapshot."""
+        values: dict[str, float | None] = {}
+        for key in self._order:
+            metric = self.metrics[key]
+            inputs = tuple(
+                values[name] if name in self.metrics else data.get(name)
+                for name in metric.inputs
+            )
+            if key in self._inputs and self._inputs[key] == inputs:
+                values[key] = self._values[key]
+                continue
+            self._inputs[key] = inputs
+            values[key] = self._compute(metric, inputs)
+        self._values = values
+        return values
+
+    def _compute(
+        self, metric: DerivedMetric, inputs: tuple[float | None, ...]
+    ) -> float | None:
+        """Call the metric function, None if an input is missing."""
+        if any(value is None for value in inputs):
+            return None
+        self.evaluations += 1
+        try:
+            result = metric.function(*inputs)
+        except (ArithmeticError, TypeError, ValueError) as err:
+            _LOGGER.debug("Cannot compute %s: %s", metric.key, err)
+            return None
+        return None if result is None else round(result, metric.precision)
+
+
+def _stored_energy(capacity: float, soc: float) -> float:
+    """Return the energy in Wh stored at a state of charge."""
+    return capacity * soc / 100
+
+
+def _time_to_full(capacity: float, stored: float, power: float) -> float | None:
+    """Return the hours until full while charging (negative power)."""
+    if power >= 0:
+        return None
+    return (capacity - stored) / -power
+
+
+def _time_to_empty(stored: float, power: float) -> float | None:
+    """Return the hours until empty while discharging (positive power)."""
+    if power <= 0:
+        return None
+    return stored / power
+
+
+def _round_trip_efficiency(produced: float, consumed: float) -> float | None:
+    """Return discharged over charged lifetime energy in percent."""
+    if consumed <= 0:
+        return None
+    return 100 * produced / consumed
+
+
+def _phase_imbalance(*currents: float) -> float:
+    """Return the spread of the phase currents relative to their mean in percent."""
+    mean = sum(currents) / len(currents)
+    if mean == 0:
+        return 0.0
+    return 100 * (max(currents) - min(currents)) / mean
+
+
+def battery_metrics(battery_id: str) -> list[DerivedMetric]:
+    """Return the derived metrics of one battery."""
+
+    def key(register: str) -> str:
+        return f"{battery_id}_{register}"
+
+    return [
+        DerivedMetric(
+            key("stored_energy"),
+            (key("capacity"), key("soc")),
+            _stored_energy,
+            "Stored Energy",
+            UnitOfEnergy.WATT_HOUR,
+            SensorDeviceClass.ENERGY_STORAGE,
+            precision=0,
+            battery_id=battery_id,
+        ),
+        DerivedMetric(
+            key("time_to_full"),
+            (key("capacity"), key("stored_energy"), key("power")),
+            _time_to_full,
+            "Time To Full",
+            UnitOfTime.HOURS,
+            SensorDeviceClass.DURATION,
+            precision=2,
+            battery_id=battery_id,
+        ),
+        DerivedMetric(
+            key("time_to_empty"),
+            (key("stored_energy"), key("power")),
+            _time_to_empty,
+            "Time To Empty",
+            UnitOfTime.HOURS,
+            SensorDeviceClass.DURATION,
+            precision=2,
+            battery_id=battery_id,
+        ),
+        DerivedMetric(
+            key("round_trip_efficiency"),
+            (key("energy_produced"), key("energy_consumed")),
+            _round_trip_efficiency,
+            "Round Trip Efficiency",
+            PERCENTAGE,
+            battery_id=battery_id,
+        ),
+        DerivedMetric(
+            key("phase_imbalance"),
+            (key("current_l1"), key("current_l2"), key("current_l3")),
+            _phase_imbalance,
+            "Phase Imbalance",
+            PERCENTAGE,
+            battery_id=battery_id,
+        ),
+    ]
+
+
+def default_metrics(
+    battery_ids: list[str],
+    master_battery_id: str | None,
+    unread: Iterable[str] = (),
+) -> list[DerivedMetric]:
+    """Return the derived metrics of a battery system.
+
+    ``unread`` are data keys no battery reads, e.g. the system registers of
+    batteries other than the master; metrics depending on them are left out.
+    """
+    unavailable = set(unread)
+    metrics = []
+    for battery_id in battery_ids:
+        for metric in battery_metrics(battery_id):
+            if unavailable.isdisjoint(metric.inputs):
+                metrics.append(metric)
+            else:
+                unavailable.add(metric.key)
+    combined_stored_energy = DerivedMetric(
+        "combined_stored_energy",
+        tuple(f"{battery_id}_stored_energy" for battery_id in battery_ids),
+        lambda *stored: sum(stored),
+        "Combined Stored Energy",
+        UnitOfEnergy.WATT_HOUR,
+        SensorDeviceClass.ENERGY_STORAGE,
+        precision=0,
+    )
+    if unavailable.isdisjoint(combined_stored_energy.inputs):
+        metrics.append(combined_stored_energy)
+    if master_battery_id is not None:
+        # Grid import from the smart meter plus battery discharge
+        metrics.append(
+            DerivedMetric(
+                "net_household_load",
+                (f"{master_battery_id}_smartmeter", "combined_power"),
+                lambda grid, battery: grid + battery,
+                "Net Household Load",
+                UnitOfPower.WATT,
+                SensorDeviceClass.POWER,
+                precision=0,
+            )
+        )
+    return metrics
@@ -0,0 +1,42 @@
+"""Diagnostics support for SAX Battery integration."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .coordinator import SAXBatteryCoordinator
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: SAXBatteryCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    # Battery host keys are dynamic (battery_a_host, battery_b_host, ...)
+    to_redact = {CONF_HOST} | {key for key in entry.data if key.endswith("_host")}
+
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), to_redact),
+            "options": dict(entry.options),
+        },
+        "metrics": coordinator.hub.metrics.as_dict(),
+        "breakers": {
+            battery_id: breaker.as_dict()
+            for battery_id, breaker in coordinator.hub.breakers.items()
+        },
+        "timeouts": {
+            battery_id: estimator.as_dict()
+            for battery_id, estimator in coordinator.hub.rtt.items()
+        },
+        "readwrite_supported": coordinator.hub.readwrite_supported,
+        "proxies": {proxy.battery_id: proxy.as_dict() for proxy in coordinator.proxies},
+        "data": coordinator.data,
+    }
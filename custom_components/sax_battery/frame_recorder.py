@@ -0,0 +1,233 @@
+"""Opt-in Modbus frame recorder for the SAX Battery hub."""
+
+from __future__ import annotations
+
+from collections import OrderedDict, deque
+from dataclasses import asdict, dataclass
+import json
+from pathlib import Path
+import struct
+import time
+from typing import Any
+
+DEFAULT_FRAME_CAPACITY = 5000
+MAX_PENDING_REQUESTS = 256  # Unanswered requests kept for a late response
+
+FC_READ_HOLDING_REGISTERS = 3
+FC_WRITE_MULTIPLE_REGISTERS = 16
+FC_READ_WRITE_MULTIPLE_REGISTERS = 23
+
+# Transaction ID, protocol ID, length of unit ID plus PDU, unit ID
+MBAP_HEADER = struct.Struct(">HHHB")
+MAX_PDU_LENGTH = 253
+EXCEPTION_FLAG = 0x80
+
+
+@dataclass(slots=True, frozen=True)
+class ModbusFrame:
+    """A captured Modbus TCP request and its response as sent on the wire.
+
+    ``request`` and ``response`` are complete frames including the MBAP
+    header. Responses nobody asked for and bytes that do not parse as a
+    frame are kept as a response without a request.
+    """
+
+    timestamp: float  # time.monotonic() when the request was sent
+    battery_id: str
+    slave: int | None
+    function_code: int | None
+    address: int | None
+    count: int | None
+    transaction_id: int | None
+    request: bytes
+    response: bytes | None
+    latency: float | None
+    error: str | None = None
+
+    def as_json(self) -> dict[str, Any]:
+        """Return the frame as a JSON serialisable dict."""
+        data = asdict(self)
+        data["request"] = self.request.hex()
+        data["response"] = self.response.hex() if self.response is not None else None
+        return data
+
+
+def encode_write_request(address: int, values: list[int]) -> bytes:
+    """Return the PDU payload of a write multiple registers request."""
+    return struct.pack(
+        f">HHB{len(values)}H", address, len(values), 2 * len(values), *values
+    )
+
+
+def encode_registers(registers: list[int]) -> bytes:
+    """Return the PDU payload of a register response."""
+    return struct.pack(f">B{len(registers)}H", 2 * len(registers), *registers)
+
+
+def _frame_error(response: bytes) -> str | None:
+    """Return the error a response frame reports, if any."""
+    pdu = response[MBAP_HEADER.size :]
+    if pdu and pdu[0] & EXCEPTION_FLAG:
+        return f"exception response {pdu[1] if len(pdu) > 1 else None}"
+    return None
+
+
+class ModbusFrameRecorder:
+    """Bounded in-memory ring buffer of Modbus exchanges.
+
+    Fed with the bytes the Modbus clients send and receive; responses are
+    matched to their request by MBAP transaction ID. Recording is off until
+    ``start`` is called, so the hub only pays for a boolean check per frame
+    in normal operation.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_FRAME_CAPACITY) -> None:
+        """Initialize the recorder."""
+        self.enabled = False
+        self._frames: deque[ModbusFrame] = deque(maxlen=capacity)
+        # (battery ID, transaction ID) -> time sent and request frame
+        self._pending: OrderedDict[tuple[str, int], tuple[float, bytes]] = OrderedDict()
+        # Received bytes not forming a complete frame yet, per battery
+        self._buffers: dict[str, bytearray] = {}
+
+    def __len__(self) -> int:
+        """Return the number of buffered frames."""
+        return len(self._frames)
+
+    def start(self, capacity: int | None = None) -> None:
+        """Start recording, optionally resizing the buffer."""
+        if capacity is not None and capacity != self._frames.maxlen:
+            self._frames = deque(self._frames, maxlen=capacity)
+        self.enabled = True
+
+    def stop(self) -> None:
+        """Stop recording and keep the buffered frames."""
+        self.enabled = False
+        while self._pending:
+            self._flush_oldest()
+        self._buffers.clear()
+
+    def clear(self) -> None:
+        """Drop all buffered frames."""
+        self._frames.clear()
+        self._pending.clear()
+        self._buffers.clear()
+
+    def record_sent(self, battery_id: str, frame: bytes) -> None:
+        """Record a request frame written to a battery."""
+        if len(frame) < MBAP_HEADER.size:
+            self._append(battery_id, time.monotonic(), frame, None, "malformed")
+            return
+        key = (battery_id, MBAP_HEADER.unpack_from(frame)[0])
+        if key in self._pending:
+            # Transaction ID reused, the earlier request never got an answer
+            self._pending.move_to_end(key, last=False)
+            self._flush_oldest()
+        self._pending[key] = (time.monotonic(), bytes(frame))
+        if len(self._pending) > MAX_PENDING_REQUESTS:
+            self._flush_oldest()
+
+    def record_received(self, battery_id: str, data: bytes) -> None:
+        """Record the frames in a chunk of bytes received from a battery."""
+        buffer = self._buffers.setdefault(battery_id, bytearray())
+        buffer += data
+        while len(buffer) >= MBAP_HEADER.size:
+            transaction_id, protocol, length, _ = MBAP_HEADER.unpack_from(buffer)
+            if protocol != 0 or not 2 <= length <= MAX_PDU_LENGTH + 1:
+                # Not a Modbus TCP frame, keep the bytes as they arrived
+                self._append(battery_id, None, b"", bytes(buffer), "malformed")
+                buffer.clear()
+                return
+            end = MBAP_HEADER.size - 1 + length
+            if len(buffer) < end:
+                return
+            response = bytes(buffer[:end])
+            del buffer[:end]
+            if (
+                pending := self._pending.pop((battery_id, transaction_id), None)
+            ) is None:
+                self._append(battery_id, None, b"", response, "stray response")
+            else:
+                sent, request = pending
+                self._append(
+                    battery_id, sent, request, response, _frame_error(response)
+                )
+
+    def snapshot(self) -> list[ModbusFrame]:
+        """Return a copy of the buffered frames, unanswered requests last."""
+        frames = list(self._frames)
+        frames.extend(
+            self._frame(battery_id, sent, request, None, "no response")
+            for (battery_id, _), (sent, request) in self._pending.items()
+        )
+        return frames
+
+    def _flush_oldest(self) -> None:
+        """Record the oldest pending request as unanswered."""
+        (battery_id, _), (sent, request) = self._pending.popitem(last=False)
+        self._append(battery_id, sent, request, None, "no response")
+
+    def _append(
+        self,
+        battery_id: str,
+        sent: float | None,
+        request: bytes,
+        response: bytes | None,
+        error: str | None,
+    ) -> None:
+        """Add an exchange to the ring buffer."""
+        self._frames.append(self._frame(battery_id, sent, request, response, error))
+
+    @staticmethod
+    def _frame(
+        battery_id: str,
+        sent: float | None,
+        request: bytes,
+        response: bytes | None,
+        error: str | None,
+    ) -> ModbusFrame:
+        """Return the frame of an exchange, decoding what the bytes allow."""
+        now = time.monotonic()
+        header = request if len(request) > MBAP_HEADER.size else response or b""
+        transaction_id = slave = function_code = address = count = None
+        if len(header) > MBAP_HEADER.size:
+            transaction_id, _, _, slave = MBAP_HEADER.unpack_from(header)
+            function_code = header[MBAP_HEADER.size] & ~EXCEPTION_FLAG
+        if len(request) >= MBAP_HEADER.size + 5:
+            # Read, write and read/write requests start with address and count
+            address, count = struct.unpack_from(">HH", request, MBAP_HEADER.size + 1)
+        return ModbusFrame(
+            timestamp=sent if sent is not None else now,
+            battery_id=battery_id,
+            slave=slave,
+            function_code=function_code,
+            address=address,
+            count=count,
+            transaction_id=transaction_id,
+            request=request,
+            response=response,
+            latency=now - sent if sent is not None and response is not None else None,
+            error=error,
+        )
+
+
+def write_frames_jsonl(path: Path, frames: list[ModbusFrame]) -> int:
+    """Write frames as JSON lines. Blocking, run in the executor."""
+    with path.open("w", encoding="utf-8") as file:
+        for frame in frames:
+            file.write(json.dumps(frame.as_json(), separators=(",", ":")))
+            file.write("\n")
+    return len(frames)
+
+
+def read_frames_jsonl(path: Path) -> list[ModbusFrame]:
+    """Load frames written by write_frames_jsonl. Blocking."""
+    frames = []
+    with path.open(encoding="utf-8") as file:
+        for line in file:
+            data = json.loads(line)
+            data["request"] = bytes.fromhex(data["request"])
+            if data["response"] is not None:
+                data["response"] = bytes.fromhex(data["response"])
+            frames.append(ModbusFrame(**data))
+    return frames
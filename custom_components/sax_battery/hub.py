@@ -3,9 +3,14 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import functools
+import itertools
 import logging
+import math
 import socket
-from typing import Any
+import time
+from typing import Any, NamedTuple
 
 from pymodbus.client import AsyncModbusTcpClient
 from pymodbus.exceptions import ConnectionException, ModbusIOException
@@ -14,16 +19,130 @@ from homeassistant.const import CONF_HOST, CONF_PORT
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import HomeAssistantError
 
+from .circuit_breaker import CircuitBreaker
+from .const import (
+    CONF_MASTER_BATTERY,
+    CONF_SYNC_SAMPLING,
+    TRANSPORT_NATIVE,
+    TRANSPORT_PYMODBUS,
+)
+from .frame_recorder import (
+    FC_WRITE_MULTIPLE_REGISTERS,
+    ModbusFrameRecorder,
+    encode_write_request,
+)
+from .metrics import HubMetrics
+from .modbus_tcp import ModbusResponse, NativeModbusTcpClient
+from .register_cache import DEFAULT_REGISTER_TTL, RegisterCache
+from .rtt import RttEstimator
+from .scheduler import SAXPollScheduler
+
 _LOGGER = logging.getLogger(__name__)
 
+type ModbusClient = AsyncModbusTcpClient | NativeModbusTcpClient
+
 # Improved timeout constants for multi-device coordination
 MODBUS_TIMEOUT = 10.0  # Increased from 8 to 10 seconds
 MODBUS_RETRIES = 3  # Increased from 2 to 3 retries
 READ_TIMEOUT = 8.0  # Increased from 5 to 8 seconds
 RETRY_DELAY = 1.0  # Increased from 0.5 to 1.0 second
 WRITE_DELAY = 2.0  # New: Delay before writes to avoid conflicts
+WRITE_TIMEOUT = 12.0  # Late write acknowledgements are a SAX quirk
 GLOBAL_DELAY = 0.1  # New: Small delay between all operations
 
+# Time budget of one read cycle, leaves room within the coordinator timeout
+READ_CYCLE_BUDGET = 17.0
+READ_CYCLE_GRACE = 1.0  # Slack for in-flight attempts at the deadline
+MIN_READ_TIMEOUT = 0.5  # Smallest attempt timeout and per-block reserve
+
+# Single read that decides whether an unavailable battery is back
+PROBE_SLAVE = 64
+PROBE_ADDRESS = 46  # SOC
+PROBE_TIMEOUT = 2.0
+
+# Fast writes return once sent and are confirmed by reading the registers back
+MBAP_UNIT_OFFSET = 6  # Unit ID and PDU follow the first MBAP header fields
+FAST_WRITE_ACK_TIMEOUT = 2.0  # Wait for the acknowledgement in the background
+WRITE_VERIFY_DELAY = 1.0  # Settle time before the read-back
+WRITE_VERIFY_RETRIES = 2  # Re-sends of a write the read-back did not confirm
+
+# Combined write and read requests (function code 23)
+MODBUS_ILLEGAL_FUNCTION = 1  # Exception code of unsupported function codes
+READWRITE_MAX_FAILURES = 3  # Failures before the first success that disable it
+
+# Status watcher cadence: poll fast right after a command, then back off
+STATUS_WATCH_INITIAL_INTERVAL = 1.0
+STATUS_WATCH_MAX_INTERVAL = 15.0
+STATUS_WATCH_BACKOFF = 1.5
+
+# Registers read together from all batteries in synchronized sampling mode,
+# consecutive addresses on the same slave
+FAST_REGISTERS = ("soc", "power", "smartmeter")
+
+
+def battery_id_for_index(index: int) -> str:
+    """Return the battery ID for a zero-based index.
+
+    Batteries are named battery_a to battery_z, followed by battery_aa,
+    battery_ab and so on, so existing IDs stay stable.
+    """
+    suffix = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        suffix = chr(97 + remainder) + suffix
+    return f"battery_{suffix}"
+
+
+def _contiguous_runs(registers: dict[int, int]) -> list[tuple[int, list[int]]]:
+    """Group register values into runs of consecutive addresses."""
+    runs: list[tuple[int, list[int]]] = []
+    for address in sorted(registers):
+        if runs and runs[-1][0] + len(runs[-1][1]) == address:
+            runs[-1][1].append(registers[address])
+        else:
+            runs.append((address, [registers[address]]))
+    return runs
+
+
+class BatteryDataKey(NamedTuple):
+    """Identity of a per-battery value in the coordinator data."""
+
+    battery_index: int
+    battery_id: str
+    register: str
+
+
+class ReadBudget:
+    """Time left for the outstanding register blocks of one battery.
+
+    Every attempt may use an equal share of the remaining time, so time saved
+    by fast reads flows to the blocks still outstanding. Retries are only
+    made while each outstanding block keeps its minimum share.
+    """
+
+    __slots__ = ("deadline", "outstanding")
+
+    def __init__(self, deadline: float, outstanding: int) -> None:
+        """Initialize the budget with a time.monotonic() deadline."""
+        self.deadline = deadline
+        self.outstanding = outstanding
+
+    def remaining(self) -> float:
+        """Return the seconds left until the deadline."""
+        return self.deadline - time.monotonic()
+
+    def attempt_timeout(self, limit: float = READ_TIMEOUT) -> float:
+        """Return the timeout of the next read attempt, at most ``limit``."""
+        remaining = self.remaining()
+        share = max(remaining / max(self.outstanding, 1), MIN_READ_TIMEOUT)
+        return max(0.0, min(limit, remaining, share))
+
+    def allows_retry(self, delay: float) -> bool:
+        """Return whether a retry after ``delay`` seconds fits in the budget."""
+        reserve = MIN_READ_TIMEOUT * max(self.outstanding, 1)
+        return self.remaining() - delay >= reserve
+
 
 class HubException(HomeAssistantError):
     """Base exception for hub errors."""
@@ -41,27 +160,146 @@ class SAXBatteryHub:
     """Main hub for SAX Battery communication."""
 
     def __init__(
-        self, hass: HomeAssistant, battery_configs: list[dict[str, Any]]
+        self,
+        hass: HomeAssistant,
+        battery_configs: list[dict[str, Any]],
+        *,
+        master_battery: str | None = None,
+        synchronized_sampling: bool = False,
     ) -> None:
         """Initialize the hub with multiple battery configurations."""
         self._hass = hass
         self._battery_configs = battery_configs
-        self._clients: dict[str, AsyncModbusTcpClient | None] = {}
+        # Battery reporting the system and smart meter values, first by default
+        battery_ids = [config["battery_id"] for config in battery_configs]
+        self.master_battery_id = (
+            master_battery
+            if master_battery in battery_ids
+            else next(iter(battery_ids), None)
+        )
+        # Read the fast registers of all batteries in one burst per cycle
+        self.synchronized_sampling = synchronized_sampling
+        # time.monotonic() at which each data key of the last burst was sampled
+        self.sample_times: dict[str, float] = {}
+        # Demanded data keys not read in the last cycle because still fresh
+        self.deferred_keys: set[str] = set()
+        self._clients: dict[str, ModbusClient | None] = {}
         self._connected: dict[str, bool] = {}
         self._lock = asyncio.Lock()  # Global lock for all operations
         self._battery_locks: dict[str, asyncio.Lock] = {}  # Per-battery locks
         self._write_lock = asyncio.Lock()  # Add missing write lock
-        self._reading = False  # Prevent concurrent reads
+        # Read cycle in flight, shared by all concurrent callers
+        self._read_task: asyncio.Task[dict[str, Any]] | None = None
         self.batteries: dict[str, SAXBattery] = {}
 
+        # Structured identity of every flattened per-battery data key
+        self.data_keys: dict[str, BatteryDataKey] = {}
+
         # Initialize batteries and per-battery locks
-        for config in battery_configs:
+        for index, config in enumerate(battery_configs):
             battery_id = config["battery_id"]
-            battery = SAXBattery(self, battery_id, config["host"], config["port"])
+            battery = SAXBattery(
+                self,
+                battery_id,
+                config["host"],
+                config["port"],
+                index=index,
+                transport=config.get("transport", TRANSPORT_PYMODBUS),
+                system_registers=battery_id == self.master_battery_id,
+            )
             self.batteries[battery_id] = battery
             self._clients[battery_id] = None
             self._connected[battery_id] = False
             self._battery_locks[battery_id] = asyncio.Lock()  # One lock per battery
+            for register, data_key in battery.data_keys.items():
+                self.data_keys[data_key] = BatteryDataKey(index, battery_id, register)
+
+        # Read latency and health statistics
+        self.metrics = HubMetrics(list(self.batteries))
+
+        # Opt-in capture of raw Modbus exchanges
+        self.frame_recorder = ModbusFrameRecorder()
+
+        # Shared with other config entries, set up by the integration
+        self.scheduler: SAXPollScheduler | None = None
+
+        # Skip batteries that keep failing until a probe succeeds
+        self.breakers = {battery_id: CircuitBreaker() for battery_id in self.batteries}
+
+        # Request timeouts adapted to the measured round trip times
+        self.rtt = {
+            battery_id: RttEstimator(ceiling=READ_TIMEOUT)
+            for battery_id in self.batteries
+        }
+
+        # Fast writes awaiting read-back, by (battery_id, slave) and address
+        self._pending_writes: dict[tuple[str, int], dict[int, int]] = {}
+        self._write_attempts: dict[tuple[str, int], int] = {}
+        self._write_tasks: dict[tuple[str, int], set[asyncio.Task]] = {}
+        self._verify_tasks: dict[tuple[str, int], asyncio.Task] = {}
+        # Events set once a fast write is on the wire, by battery and frame
+        self._write_sent: dict[tuple[str, bytes], list[asyncio.Event]] = {}
+
+        # Whether each battery supports function code 23, None until known
+        self.readwrite_supported: dict[str, bool | None] = dict.fromkeys(self.batteries)
+        self._readwrite_failures = dict.fromkeys(self.batteries, 0)
+
+        # Raw registers recently read from each battery
+        self.register_caches = {
+            battery_id: RegisterCache() for battery_id in self.batteries
+        }
+        self._refresh_tasks: set[asyncio.Task] = set()
+
+    def is_battery_available(self, battery_id: str) -> bool:
+        """Return whether a battery is polled, i.e. its breaker is closed."""
+        return self.breakers[battery_id].closed
+
+    def _record_battery_failure(self, battery_id: str) -> None:
+        """Count a failed cycle and stop polling the battery if it keeps failing."""
+        breaker = self.breakers[battery_id]
+        if not breaker.record_failure():
+            return
+        _LOGGER.warning(
+            "Battery %s failed %d times in a row, pausing polls for %.0f seconds",
+            battery_id,
+            breaker.failures,
+            breaker.probe_at - time.monotonic(),
+        )
+        # Also stops the client's own reconnect attempts
+        self._connected[battery_id] = False
+        if client := self._clients.get(battery_id):
+            client.close()
+
+    async def _probe_battery(self, battery_id: str) -> bool:
+        """Check whether an unavailable battery answers a single read."""
+        client = self._clients.get(battery_id)
+        if client is None:
+            return False
+        try:
+            if not client.connected and not await asyncio.wait_for(
+                client.connect(), timeout=PROBE_TIMEOUT
+            ):
+                return False
+            async with self._modbus_slot():
+                result: ModbusResponse = await asyncio.wait_for(
+                    client.read_holding_registers(
+                        PROBE_ADDRESS, count=1, device_id=PROBE_SLAVE
+                    ),
+                    timeout=PROBE_TIMEOUT,
+                )
+        except (TimeoutError, ConnectionException, ModbusIOException, OSError) as err:
+            _LOGGER.debug("Probe of battery %s failed: %s", battery_id, err)
+            return False
+        if result.isError():
+            return False
+        self._connected[battery_id] = True
+        return True
+
+    def _modbus_slot(self) -> contextlib.AbstractAsyncContextManager:
+        """Return a context limiting concurrent Modbus transactions."""
+        if self.scheduler is None:
+            return contextlib.nullcontext()
+        return self.scheduler.transactions
 
     @property
     def host(self) -> str:
@@ -80,7 +318,7 @@ class SAXBatteryHub:
         return 502
 
     @property
-    def client(self) -> AsyncModbusTcpClient | None:
+    def client(self) -> ModbusClient | None:
         """Return the first battery client for backward compatibility."""
         if self.batteries:
             first_battery = next(iter(self.batteries.values()))
@@ -90,9 +328,12 @@ class SAXBatteryHub:
     async def connect(self) -> bool:
         """Connect to all battery inverters."""
         async with self._lock:
-            all_connected = True
+            failed: set[str] = set()
 
             for battery_id, battery in self.batteries.items():
+                # Batteries behind an open breaker are only contacted by probes
+                if not self.breakers[battery_id].closed:
+                    continue
                 try:
                     _LOGGER.debug(
                         "Attempting to connect to SAX Battery %s at %s:%s",
@@ -103,14 +344,29 @@ class SAXBatteryHub:
 
                     if self._clients[battery_id] is None:
                         _LOGGER.debug(
-                            "Creating new AsyncModbusTcpClient for %s", battery_id
-                        )
-                        self._clients[battery_id] = AsyncModbusTcpClient(
-                            host=battery.host,
-                            port=battery.port,
-                            timeout=MODBUS_TIMEOUT,  # Increased timeout
-                            retries=MODBUS_RETRIES,  # Moderate retries
+                            "Creating new %s Modbus client for %s",
+                            battery.transport,
+                            battery_id,
                         )
+                        if battery.transport == TRANSPORT_NATIVE:
+                            self._clients[battery_id] = NativeModbusTcpClient(
+                                battery.host,
+                                battery.port,
+                                timeout=MODBUS_TIMEOUT,
+                                trace_packet=functools.partial(
+                                    self._trace_packet, battery_id
+                                ),
+                            )
+                        else:
+                            self._clients[battery_id] = AsyncModbusTcpClient(
+                                host=battery.host,
+                                port=battery.port,
+                                timeout=MODBUS_TIMEOUT,  # Increased timeout
+                                retries=0,  # Retried by the hub within the read budget
+                                trace_packet=functools.partial(
+                                    self._trace_packet, battery_id
+                                ),
+                            )
 
                     client = self._clients[battery_id]
                     if client and not client.connected:
@@ -132,16 +388,17 @@ class SAXBatteryHub:
                                     battery.port,
                                     result,
                                 )
-                                all_connected = False
+                                failed.add(battery_id)
                                 continue
                         except OSError as e:
                             _LOGGER.error(
                                 "Network test failed for %s: %s", battery_id, e
                             )
-                            all_connected = False
+                            failed.add(battery_id)
                             continue
 
                         # Add timeout to connection attempt
+                        self.metrics.record_reconnect(battery_id)
                         result = await asyncio.wait_for(
                             client.connect(), timeout=MODBUS_TIMEOUT
                         )
@@ -153,7 +410,7 @@ class SAXBatteryHub:
                                 battery.host,
                                 battery.port,
                             )
-                            all_connected = False
+                            failed.add(battery_id)
                             continue
 
                     self._connected[battery_id] = True
@@ -169,16 +426,29 @@ class SAXBatteryHub:
                         battery.port,
                     )
                     self._connected[battery_id] = False
-                    all_connected = False
+                    failed.add(battery_id)
                 except (ConnectionException, OSError) as e:
                     _LOGGER.error("Connection error to %s: %s", battery_id, e)
                     self._connected[battery_id] = False
-                    all_connected = False
+                    failed.add(battery_id)
 
-            return all_connected
+            for battery_id in failed:
+                self._record_battery_failure(battery_id)
+            return not failed
 
     async def disconnect(self) -> None:
         """Disconnect from all battery inverters."""
+        for task in [
+            *itertools.chain.from_iterable(self._write_tasks.values()),
+            *self._verify_tasks.values(),
+            *self._refresh_tasks,
+        ]:
+            task.cancel()
+        if self._read_task is not None:
+            self._read_task.cancel()
+        self._pending_writes.clear()
+        for cache in self.register_caches.values():
+            cache.clear()
         async with self._lock:
             for battery_id, client in self._clients.items():
                 if client:
@@ -216,10 +486,18 @@ class SAXBatteryHub:
                 )
 
                 # Use device_id parameter for pymodbus 3.11.1+
-                result = await asyncio.wait_for(
-                    client.write_registers(address, values, device_id=slave),
-                    timeout=12.0,  # Increased timeout for writes
-                )
+                async with self._modbus_slot():
+                    started = time.monotonic()
+                    try:
+                        result: ModbusResponse = await asyncio.wait_for(
+                            client.write_registers(address, values, device_id=slave),
+                            # Late acknowledgements are a SAX quirk, not a lost frame,
+                            # so they neither fail the write nor back off the reads
+                            timeout=max(WRITE_TIMEOUT, self.rtt[battery_id].timeout),
+                        )
+                    finally:
+                        self._registers_written(battery_id, slave, address, len(values))
+                    self.rtt[battery_id].observe(time.monotonic() - started)
 
                 if result.isError():
                     _LOGGER.error(
@@ -253,20 +531,344 @@ class SAXBatteryHub:
                 _LOGGER.error("Modbus write error for battery %s: %s", battery_id, e)
                 return False
 
+    async def modbus_write_registers_fast(
+        self, battery_id: str, address: int, values: list[int], slave: int = 64
+    ) -> bool:
+        """Send a register write without waiting for its acknowledgement.
+
+        Returns as soon as the request is sent, False only if it could not be
+        sent. The acknowledgement is awaited in the background and the written
+        registers are read back on the next scheduler slot. Registers that do
+        not hold the written value are sent again up to WRITE_VERIFY_RETRIES
+        times. Read-backs of writes to the same battery and slave are coalesced.
+        """
+        if not await self._send_write(battery_id, address, values, slave):
+            return False
+
+        key = (battery_id, slave)
+        pending = self._pending_writes.setdefault(key, {})
+        for offset, value in enumerate(values):
+            pending[address + offset] = value
+        # A new write deserves its own retries
+        self._write_attempts[key] = 0
+
+        task = self._verify_tasks.get(key)
+        if task is None or task.done():
+            self._verify_tasks[key] = self._hass.async_create_background_task(
+                self._verify_writes(battery_id, slave),
+                f"{battery_id} write verification",
+            )
+        return True
+
+    async def _send_write(
+        self, battery_id: str, address: int, values: list[int], slave: int
+    ) -> bool:
+        """Send a write request and await its acknowledgement in the background."""
+        client = self._clients.get(battery_id)
+        if not client:
+            _LOGGER.error("No Modbus client found for battery %s", battery_id)
+            return False
+        if not client.connected and not await client.connect():
+            _LOGGER.error("Cannot write to battery %s: not connected", battery_id)
+            return False
+
+        # Set by _trace_packet when the client writes the request frame
+        sent = asyncio.Event()
+        frame = bytes([slave, FC_WRITE_MULTIPLE_REGISTERS]) + encode_write_request(
+            address, values
+        )
+        waiters = self._write_sent.setdefault((battery_id, frame), [])
+        waiters.append(sent)
+        task = self._hass.async_create_background_task(
+            self._await_write_ack(battery_id, client, address, values, slave, sent),
+            f"{battery_id} write acknowledgement",
+        )
+        tasks = self._write_tasks.setdefault((battery_id, slave), set())
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+        # Also covers a task cancelled before it ran
+        task.add_done_callback(lambda _: sent.set())
+        try:
+            await sent.wait()
+        finally:
+            if sent in waiters:
+                waiters.remove(sent)
+            if not waiters:
+                self._write_sent.pop((battery_id, frame), None)
+        return True
+
+    def _trace_packet(self, battery_id: str, sending: bool, packet: bytes) -> bytes:
+        """Record the bytes on the wire and wake fast writes once sent."""
+        if self.frame_recorder.enabled:
+            if sending:
+                self.frame_recorder.record_sent(battery_id, packet)
+            else:
+                self.frame_recorder.record_received(battery_id, packet)
+        if sending and (
+            waiters := self._write_sent.get((battery_id, packet[MBAP_UNIT_OFFSET:]))
+        ):
+            waiters.pop(0).set()
+        return packet
+
+    async def _await_write_ack(  # noqa: PLR0917
+        self,
+        battery_id: str,
+        client: ModbusClient,
+        address: int,
+        values: list[int],
+        slave: int,
+        sent: asyncio.Event,
+    ) -> None:
+        """Write registers and wait a short while for the acknowledgement.
+
+        The battery lock is not taken, so the write is not held up by a slow
+        write or a read cycle of the same battery. Only the read-back decides
+        whether the write succeeded, so errors and the SAX "Request cancelled"
+        quirk are only logged.
+        """
+        try:
+            async with self._modbus_slot():
+                try:
+                    result: ModbusResponse = await asyncio.wait_for(
+                        client.write_registers(address, values, device_id=slave),
+                        timeout=FAST_WRITE_ACK_TIMEOUT,
+                    )
+                except (TimeoutError, ConnectionException, ModbusIOException) as err:
+                    self._registers_written(battery_id, slave, address, len(values))
+                    _LOGGER.debug(
+                        "Write to battery %s (address %d) not acknowledged: %s",
+                        battery_id,
+                        address,
+                        err,
+                    )
+                    return
+                self._registers_written(battery_id, slave, address, len(values))
+                if result.isError():
+                    _LOGGER.debug(
+                        "Write to battery %s (address %d) rejected: %s",
+                        battery_id,
+                        address,
+                        result,
+                    )
+        finally:
+            sent.set()
+
+    async def modbus_readwrite_registers(  # noqa: PLR0917
+        self,
+        battery_id: str,
+        address: int,
+        values: list[int],
+        read_address: int,
+        read_count: int,
+        slave: int = 64,
+    ) -> list[int] | None:
+        """Write registers and read others in a single request where supported.
+
+        Uses Read/Write Multiple Registers (function code 23), whose response
+        confirms the write, so no read-back is needed; the read registers are
+        returned and cached. Batteries answering with an illegal function
+        exception, or failing READWRITE_MAX_FAILURES times before ever
+        succeeding, are written with modbus_write_registers_fast from then on.
+        That fallback, also taken when a single request fails, returns None.
+        Raises HubConnectionError if the write could not be sent at all.
+        """
+        if self.readwrite_supported[battery_id] is not False:
+            registers = await self._readwrite(
+                battery_id, address, values, read_address, read_count, slave
+            )
+            if registers is not None:
+                return registers
+        if not await self.modbus_write_registers_fast(
+            battery_id, address, values, slave
+        ):
+            raise HubConnectionError(f"Cannot write to battery {battery_id}")
+        return None
+
+    async def _readwrite(  # noqa: PLR0917
+        self,
+        battery_id: str,
+        address: int,
+        values: list[int],
+        read_address: int,
+        read_count: int,
+        slave: int,
+    ) -> list[int] | None:
+        """Send one function code 23 request, None if it did not succeed."""
+        client = self._clients.get(battery_id)
+        if not client or (not client.connected and not await client.connect()):
+            return None
+        rtt = self.rtt[battery_id]
+        # Late acknowledgements are a SAX quirk, not a lost frame, so they
+        # neither fail the write nor back off the reads
+        timeout = max(WRITE_TIMEOUT, rtt.timeout)
+        result: ModbusResponse | None = None
+        error: BaseException | str | None = None
+        async with self._battery_locks[battery_id], self._modbus_slot():
+            started = time.monotonic()
+            try:
+                result = await asyncio.wait_for(
+                    client.readwrite_registers(
+                        read_address=read_address,
+                        read_count=read_count,
+                        write_address=address,
+                        values=values,
+                        device_id=slave,
+                    ),
+                    timeout=timeout,
+                )
+            except (TimeoutError, ConnectionException, ModbusIOException) as err:
+                error = err if str(err) else "timeout"
+        latency = time.monotonic() - started
+        # The write may have been applied even without a response
+        self._registers_written(battery_id, slave, address, len(values))
+
+        if result is None or result.isError():
+            if result is not None and (
+                getattr(result, "exception_code", None) == MODBUS_ILLEGAL_FUNCTION
+            ):
+                _LOGGER.info(
+                    "Battery %s does not support combined write and read requests",
+                    battery_id,
+                )
+                self.readwrite_supported[battery_id] = False
+                return None
+            self._readwrite_failures[battery_id] = failures = (
+                self._readwrite_failures[battery_id] + 1
+            )
+            _LOGGER.debug(
+                "Combined write and read to battery %s failed: %s",
+                battery_id,
+                result if result is not None else error,
+            )
+            if (
+                self.readwrite_supported[battery_id] is None
+                and failures >= READWRITE_MAX_FAILURES
+            ):
+                _LOGGER.info(
+                    "Battery %s never answered combined write and read requests, "
+                    "using separate writes and reads",
+                    battery_id,
+                )
+                self.readwrite_supported[battery_id] = False
+            return None
+
+        rtt.observe(latency)
+        self.readwrite_supported[battery_id] = True
+        self._readwrite_failures[battery_id] = 0
+        registers = list(result.registers)
+        self.register_caches[battery_id].put(
+            slave,
+            read_address,
+            registers,
+            self.batteries[battery_id].register_ttl(slave, read_address, read_count),
+        )
+        return registers
+
+    async def wait_for_write_acks(self, battery_id: str, slave: int) -> None:
+        """Wait until the fast writes sent so far are acknowledged or timed out."""
+        if acks := self._write_tasks.get((battery_id, slave)):
+            await asyncio.wait(set(acks))
+
+    async def _verify_writes(self, battery_id: str, slave: int) -> None:
+        """Read back pending fast writes and send those again that did not stick."""
+        key = (battery_id, slave)
+        while pending := self._pending_writes.get(key):
+            # Only the transaction limit applies, a read-back does not take
+            # the read cycle slot of a config entry
+            await asyncio.sleep(WRITE_VERIFY_DELAY)
+            # Read back after the writes were acknowledged or timed out
+            await self.wait_for_write_acks(battery_id, slave)
+
+            expected = dict(pending)
+            start = min(expected)
+            count = max(expected) - start + 1
+            try:
+                registers = await self.modbus_read_holding_registers(
+                    start, count, slave, battery_id, cached=False
+                )
+            except HubException as err:
+                _LOGGER.debug(
+                    "Write read-back of battery %s failed: %s", battery_id, err
+                )
+                registers = []
+
+            mismatched: dict[int, int] = {}
+            for address, value in expected.items():
+                if pending.get(address) != value:
+                    continue  # Overwritten meanwhile, checked next round
+                offset = address - start
+                if offset < len(registers) and registers[offset] == value:
+                    del pending[address]
+                else:
+                    mismatched[address] = value
+            if not mismatched:
+                continue
+
+            self._write_attempts[key] = attempts = self._write_attempts[key] + 1
+            if attempts > WRITE_VERIFY_RETRIES:
+                _LOGGER.error(
+                    "Write to battery %s not confirmed after %d attempts: %s",
+                    battery_id,
+                    attempts,
+                    mismatched,
+                )
+                self.metrics.record_write_failure(battery_id)
+                for address in mismatched:
+                    del pending[address]
+                continue
+
+            _LOGGER.warning(
+                "Write to battery %s not confirmed, sending again: %s",
+                battery_id,
+                mismatched,
+            )
+            self.metrics.record_write_retry(battery_id)
+            for address, values in _contiguous_runs(mismatched):
+                await self._send_write(battery_id, address, values, slave)
+
+        self._pending_writes.pop(key, None)
+
     async def modbus_read_holding_registers(
-        self, address: int, count: int, slave: int = 1, battery_id: str | None = None
+        self,
+        address: int,
+        count: int,
+        slave: int = 1,
+        battery_id: str | None = None,
+        *,
+        budget: ReadBudget | None = None,
+        cached: bool = True,
+        max_age: float | None = None,
     ) -> list[int]:
-        """Read holding registers with timeout protection."""
+        """Read holding registers with timeout protection.
+
+        With a ``budget``, attempt timeouts and retries are limited to the
+        time left in the read cycle. Registers read within their TTL, or
+        with ``max_age`` at most that many seconds ago, are served from the
+        battery's register cache and cached themselves unless ``cached`` is
+        False.
+        """
+        if budget is None:
+            budget = ReadBudget(math.inf, 1)
+
         if battery_id is None:
             battery_id = list(self.batteries.keys())[0] if self.batteries else ""
 
-        _LOGGER.debug(
-            "Reading %d registers from address %d (slave %d) for battery %s",
-            count,
-            address,
-            slave,
-            battery_id,
-        )
+        if cached and (
+            registers := self._cached_registers(
+                battery_id, slave, address, count, max_age
+            )
+        ):
+            return registers
+        cache = self.register_caches.get(battery_id)
+
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(
+                "Reading %d registers from address %d (slave %d) for battery %s",
+                count,
+                address,
+                slave,
+                battery_id,
+            )
 
         client = self._clients.get(battery_id)
         is_connected = self._connected.get(battery_id, False)
@@ -279,11 +881,12 @@ class SAXBatteryHub:
             # Don't call full connect() here - just reconnect this specific client
             client = self._clients.get(battery_id)
             if client:
+                self.metrics.record_reconnect(battery_id)
                 try:
-                    result = await asyncio.wait_for(
+                    connected = await asyncio.wait_for(
                         client.connect(), timeout=MODBUS_TIMEOUT
                     )
-                    if result:
+                    if connected:
                         self._connected[battery_id] = True
                     else:
                         raise HubConnectionError(
@@ -298,24 +901,36 @@ class SAXBatteryHub:
                     f"No client available for battery {battery_id}"
                 )
 
+        rtt = self.rtt[battery_id]
         try:
             # Add retry logic with exponential backoff for transaction ID issues
             for attempt in range(MODBUS_RETRIES + 1):
+                backoff = RETRY_DELAY * (attempt + 1)
                 try:
                     # Add small delay between operations to reduce conflicts
                     if attempt > 0:
                         await asyncio.sleep(GLOBAL_DELAY)
 
                     # Add timeout to individual register reads
-                    result = await asyncio.wait_for(
-                        client.read_holding_registers(
-                            address, count=count, device_id=slave
-                        ),
-                        timeout=READ_TIMEOUT,  # 8 second timeout per read
-                    )
+                    async with self._modbus_slot():
+                        started = time.monotonic()
+                        timeout = budget.attempt_timeout(rtt.timeout)
+                        try:
+                            result: ModbusResponse = await asyncio.wait_for(
+                                client.read_holding_registers(
+                                    address, count=count, device_id=slave
+                                ),
+                                timeout=timeout,
+                            )
+                        except (TimeoutError, ConnectionException, ModbusIOException):
+                            # pymodbus turns the cancellation into ModbusIOException
+                            if time.monotonic() - started >= timeout:
+                                rtt.timed_out()
+                            raise
 
                     if result.isError():
-                        if attempt < MODBUS_RETRIES:
+                        if attempt < MODBUS_RETRIES and budget.allows_retry(backoff):
+                            self.metrics.record_retry(battery_id)
                             _LOGGER.warning(
                                 "Modbus error response for battery %s (attempt %d/%d): %s",
                                 battery_id,
@@ -323,30 +938,44 @@ class SAXBatteryHub:
                                 MODBUS_RETRIES + 1,
                                 result,
                             )
-                            await asyncio.sleep(
-                                RETRY_DELAY * (attempt + 1)
-                            )  # Exponential backoff
+                            await asyncio.sleep(backoff)  # Exponential backoff
                             continue
                         _LOGGER.error(
                             "Modbus error response for battery %s after %d attempts: %s",
                             battery_id,
-                            MODBUS_RETRIES + 1,
+                            attempt + 1,
                             result,
                         )
+                        self.metrics.record_error(battery_id)
                         raise HubException(
                             f"Modbus error for battery {battery_id}: {result}"
                         )
 
-                    _LOGGER.debug(
-                        "Successfully read %d registers from battery %s (attempt %d)",
-                        len(result.registers),
-                        battery_id,
-                        attempt + 1,
-                    )
+                    latency = time.monotonic() - started
+                    rtt.observe(latency)
+                    self.metrics.record_read(battery_id, slave, address, count, latency)
+                    if cached and cache is not None:
+                        cache.put(
+                            slave,
+                            address,
+                            result.registers,
+                            self.batteries[battery_id].register_ttl(
+                                slave, address, count
+                            ),
+                        )
+                    if _LOGGER.isEnabledFor(logging.DEBUG):
+                        _LOGGER.debug(
+                            "Successfully read %d registers from battery %s (attempt %d)",
+                            len(result.registers),
+                            battery_id,
+                            attempt + 1,
+                        )
                     return result.registers  # noqa: TRY300
 
                 except TimeoutError:
-                    if attempt < MODBUS_RETRIES:
+                    self.metrics.record_read_timeout(battery_id)
+                    if attempt < MODBUS_RETRIES and budget.allows_retry(backoff):
+                        self.metrics.record_retry(battery_id)
                         _LOGGER.warning(
                             "Register read timeout for battery %s (attempt %d/%d, address %d)",
                             battery_id,
@@ -354,23 +983,23 @@ class SAXBatteryHub:
                             MODBUS_RETRIES + 1,
                             address,
                         )
-                        await asyncio.sleep(
-                            RETRY_DELAY * (attempt + 1)
-                        )  # Exponential backoff
+                        await asyncio.sleep(backoff)  # Exponential backoff
                         continue
                     _LOGGER.error(
                         "Register read timeout for battery %s after %d attempts (address %d)",
                         battery_id,
-                        MODBUS_RETRIES + 1,
+                        attempt + 1,
                         address,
                     )
                     self._connected[battery_id] = False  # Mark as disconnected
+                    self.metrics.record_error(battery_id)
                     raise HubConnectionError(
                         f"Read timeout for battery {battery_id} at address {address}"
                     ) from None
 
                 except (ConnectionException, ModbusIOException) as err:
-                    if attempt < MODBUS_RETRIES:
+                    if attempt < MODBUS_RETRIES and budget.allows_retry(backoff):
+                        self.metrics.record_retry(battery_id)
                         _LOGGER.warning(
                             "Modbus communication error for battery %s (attempt %d/%d): %s",
                             battery_id,
@@ -379,17 +1008,16 @@ class SAXBatteryHub:
                             err,
                         )
                         self._connected[battery_id] = False
-                        await asyncio.sleep(
-                            RETRY_DELAY * (attempt + 1)
-                        )  # Exponential backoff
+                        await asyncio.sleep(backoff)  # Exponential backoff
                         continue
                     _LOGGER.error(
                         "Modbus communication error for battery %s after %d attempts: %s",
                         battery_id,
-                        MODBUS_RETRIES + 1,
+                        attempt + 1,
                         err,
                     )
                     self._connected[battery_id] = False
+                    self.metrics.record_error(battery_id)
                     raise HubConnectionError(
                         f"Modbus communication error for battery {battery_id}: {err}"
                     ) from err
@@ -422,89 +1050,343 @@ class SAXBatteryHub:
                 f"Modbus communication error for battery {battery_id}: {e}"
             ) from e
 
-    async def read_data(self) -> dict[str, Any]:
-        """Read data from all batteries with improved concurrency and timeout protection."""
-        # Prevent concurrent reads
-        if self._reading:
-            _LOGGER.debug("Read already in progress, skipping duplicate request")
-            return {}
+    def _cached_registers(
+        self,
+        battery_id: str,
+        slave: int,
+        address: int,
+        count: int,
+        max_age: float | None = None,
+    ) -> list[int] | None:
+        """Return registers from the battery's cache if they are still valid."""
+        cache = self.register_caches.get(battery_id)
+        if (
+            cache is None
+            or (registers := cache.get(slave, address, count, max_age)) is None
+        ):
+            return None
+        self.metrics.record_cache_hit(battery_id)
+        return registers
+
+    def _registers_written(
+        self, battery_id: str, slave: int, address: int, count: int
+    ) -> None:
+        """Invalidate cached registers a write touched.
+
+        Blocks the battery reads for a consumer are read again; the others
+        are left to the next read that asks for them.
+        """
+        cache = self.register_caches.get(battery_id)
+        if cache is None:
+            return
+        battery = self.batteries[battery_id]
+        ranges = [
+            (start, length)
+            for start, length in cache.invalidate(slave, address, count)
+            if battery.reads_range(slave, start, length)
+        ]
+        if not ranges:
+            return
+        task = self._hass.async_create_background_task(
+            self._refresh_registers(battery_id, slave, ranges),
+            f"{battery_id} register refresh",
+        )
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+
+    async def _refresh_registers(
+        self, battery_id: str, slave: int, ranges: list[tuple[int, int]]
+    ) -> None:
+        """Read invalidated register blocks again to refill the cache."""
+        for address, count in ranges:
+            try:
+                await self.modbus_read_holding_registers(
+                    address, count, slave, battery_id
+                )
+            except HubException as err:
+                _LOGGER.debug(
+                    "Refresh of battery %s (address %d) failed: %s",
+                    battery_id,
+                    address,
+                    err,
+                )
+
+    async def wait_for_register_value(
+        self,
+        battery_id: str,
+        address: int,
+        expected: int,
+        slave: int = 64,
+        timeout: float = 180.0,
+    ) -> int | None:
+        """Poll a single register of one battery until it reports the expected value.
+
+        Only the watched register is read, so the rest of the bus is left alone.
+        The poll interval starts short and backs off towards
+        STATUS_WATCH_MAX_INTERVAL. Returns the last value seen, which equals
+        ``expected`` on success, or None if the register could not be read.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        interval = STATUS_WATCH_INITIAL_INTERVAL
+        last_value: int | None = None
+
+        while True:
+            try:
+                registers = await self.modbus_read_holding_registers(
+                    address=address, count=1, slave=slave, battery_id=battery_id
+                )
+            except HubException as err:
+                _LOGGER.debug(
+                    "Status watch read failed for battery %s (address %d): %s",
+                    battery_id,
+                    address,
+                    err,
+                )
+            else:
+                if registers:
+                    last_value = int(registers[0])
+                    if last_value == expected:
+                        return last_value
 
-        self._reading = True
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return last_value
+
+            await asyncio.sleep(min(interval, remaining))
+            interval = min(interval * STATUS_WATCH_BACKOFF, STATUS_WATCH_MAX_INTERVAL)
+
+    def set_demand(self, demand: dict[str, dict[str, float]] | None) -> None:
+        """Only read registers with consumers, None reads every register.
+
+        ``demand`` maps battery IDs to their demanded registers and the age
+        in seconds from which each is read again.
+        """
+        for battery_id, battery in self.batteries.items():
+            battery.demand = None if demand is None else demand.get(battery_id, {})
+
+    async def read_data(self, budget: float = READ_CYCLE_BUDGET) -> dict[str, Any]:
+        """Read data from all batteries with improved concurrency and timeout protection.
+
+        All reads of the cycle share one deadline ``budget`` seconds from now.
+        Callers arriving while a cycle is in flight wait for that cycle and get
+        its result. A caller that is cancelled does not cancel the shared cycle.
+        """
+        if self._read_task is None or self._read_task.done():
+            self._read_task = self._hass.async_create_task(
+                self._read_cycle(budget), "sax_battery read cycle"
+            )
+        else:
+            _LOGGER.debug("Read already in progress, waiting for its result")
+        return await asyncio.shield(self._read_task)
+
+    async def _read_cycle(self, budget: float) -> dict[str, Any]:
+        """Run one read cycle within ``budget`` seconds."""
+        started = time.monotonic()
         try:
             _LOGGER.debug("Starting coordinated data read from all batteries")
 
             # Add overall timeout to prevent coordinator getting stuck
-            return await asyncio.wait_for(
-                self._read_data_internal(),
-                timeout=30.0,  # Overall timeout for all batteries
+            data = await asyncio.wait_for(
+                self._read_data_internal(started + budget),
+                timeout=budget + 2 * READ_CYCLE_GRACE,
             )
 
         except TimeoutError:
-            _LOGGER.error("Overall data read timeout (>30s), aborting")
+            self.metrics.record_cycle(time.monotonic() - started, timed_out=True)
+            _LOGGER.error("Overall data read timeout (>%ss), aborting", budget)
             # Reset connection states to force reconnect
             for battery_id in self.batteries:
                 self._connected[battery_id] = False
             return {}
-        finally:
-            self._reading = False
+        else:
+            self.metrics.record_cycle(time.monotonic() - started)
+            return data
 
-    async def _read_data_internal(self) -> dict[str, Any]:
+    async def _read_data_internal(self, deadline: float) -> dict[str, Any]:
         """Read internal data logic."""
-        # Quick connect check
-        if not await self.connect():
-            _LOGGER.warning("Failed to connect to batteries, returning empty data")
-            return {}
+        # Quick connect check, failed batteries are skipped this cycle
+        await self.connect()
 
-        data = {}
+        data: dict[str, Any] = {}
+        self.sample_times = {}
+        self.deferred_keys = set()
 
-        # Read from all batteries concurrently instead of sequentially
-        battery_tasks = []
+        due = {}
+        now = time.monotonic()
         for battery_id, battery in self.batteries.items():
-            task = asyncio.create_task(
-                self._read_battery_data_safe(battery_id, battery)
+            registers = battery.due_registers(now)
+            if battery.demand is not None:
+                deferred = battery.demand.keys() & battery.read_plan.keys()
+                deferred -= registers.keys()
+                self.deferred_keys.update(battery.data_keys[key] for key in deferred)
+                if battery_id == self.master_battery_id:
+                    self.deferred_keys.update(deferred)
+            if registers:
+                due[battery_id] = registers
+        if not due:
+            _LOGGER.debug("No registers due, skipping read cycle")
+            return data
+
+        samples = (
+            await self._read_samples(
+                deadline,
+                [
+                    battery_id
+                    for battery_id, registers in due.items()
+                    if registers.keys() & FAST_REGISTERS
+                ],
             )
-            battery_tasks.append((battery_id, task))
+            if self.synchronized_sampling
+            else {}
+        )
+
+        # Read from all batteries concurrently instead of sequentially
+        battery_tasks = []
+        for battery_id, registers in due.items():
+            battery = self.batteries[battery_id]
+            if battery_id in samples:
+                # Registers read in the burst are not read again
+                sampled = samples[battery_id][1]
+                registers = {
+                    key: config
+                    for key, config in registers.items()
+                    if key not in sampled
+                }
+            breaker = self.breakers[battery_id]
+            if not registers:
+                read = _no_registers()
+            elif breaker.closed:
+                if not self._connected[battery_id]:
+                    continue  # Counted as a failure by connect()
+                read = self._read_battery_data_safe(
+                    battery_id, battery, deadline, registers
+                )
+            elif breaker.allow_request():
+                read = self._probe_and_read(battery_id, battery, deadline, registers)
+            else:
+                continue
+            battery_tasks.append((battery_id, asyncio.create_task(read)))
+
+        if not battery_tasks:
+            _LOGGER.warning("Failed to connect to batteries, returning empty data")
+            return {}
+
+        # Batteries stop reading at the deadline, allow for in-flight attempts
+        await asyncio.wait(
+            [task for _, task in battery_tasks],
+            timeout=max(0.0, deadline - time.monotonic()) + READ_CYCLE_GRACE,
+        )
 
-        # Wait for all battery reads with timeout
         for battery_id, task in battery_tasks:
+            if not task.done():
+                task.cancel()
+                self.metrics.record_battery_timeout(battery_id)
+                _LOGGER.error(
+                    "Battery %s missed the read cycle deadline, marking as disconnected",
+                    battery_id,
+                )
+                self._connected[battery_id] = False
+                self._record_battery_failure(battery_id)
+                continue
             try:
-                battery_data = await asyncio.wait_for(task, timeout=15.0)
+                battery_data = task.result()
+                if battery_id in samples:
+                    # Prefer the time-aligned burst over the sequential reads
+                    sampled_at, values = samples[battery_id]
+                    battery_data.update(values)
+                    for key in values:
+                        self.sample_times[self.batteries[battery_id].data_keys[key]] = (
+                            sampled_at
+                        )
+                if any(value is not None for value in battery_data.values()):
+                    self.breakers[battery_id].record_success()
+                else:
+                    self._record_battery_failure(battery_id)
                 if battery_data:
                     # Add battery-specific keys
+                    data_keys = self.batteries[battery_id].data_keys
                     for key, value in battery_data.items():
-                        data[f"{battery_id}_{key}"] = value
+                        data[data_keys[key]] = value
 
-                    # First battery also gets direct keys (backward compatibility)
-                    if battery_id == list(self.batteries.keys())[0]:
+                    # Master battery also gets direct keys (backward compatibility)
+                    if battery_id == self.master_battery_id:
                         data.update(battery_data)
 
-                    _LOGGER.debug(
-                        "Successfully read %d keys from %s",
-                        len(battery_data),
-                        battery_id,
-                    )
-            except TimeoutError:
-                _LOGGER.error(
-                    "Battery %s read timeout (>15s), marking as disconnected",
-                    battery_id,
-                )
-                self._connected[battery_id] = False
+                    if _LOGGER.isEnabledFor(logging.DEBUG):
+                        _LOGGER.debug(
+                            "Successfully read %d keys from %s",
+                            len(battery_data),
+                            battery_id,
+                        )
             except Exception as e:  # noqa: BLE001
                 _LOGGER.error("Error reading from %s: %s", battery_id, e)
 
-        _LOGGER.debug(
-            "Completed data read with %d total keys from %d batteries",
-            len(data),
-            len(self.batteries),
-        )
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(
+                "Completed data read with %d total keys from %d batteries",
+                len(data),
+                len(self.batteries),
+            )
         return data
 
+    async def _read_samples(
+        self, deadline: float, battery_ids: list[str]
+    ) -> dict[str, tuple[float, dict[str, float | int]]]:
+        """Read the fast registers of the given batteries in one burst.
+
+        The requests of all batteries are sent together once every battery is
+        ready. Each sample is tagged with the time.monotonic() midpoint of its
+        request, batteries whose read failed are left out.
+        """
+        batteries = [
+            self.batteries[battery_id]
+            for battery_id in battery_ids
+            if self.breakers[battery_id].closed and self._connected[battery_id]
+        ]
+        if not batteries:
+            return {}
+        barrier = asyncio.Barrier(len(batteries))
+        results = await asyncio.gather(
+            *(battery.read_sample(barrier, deadline) for battery in batteries),
+            return_exceptions=True,
+        )
+        samples = {}
+        for battery, result in zip(batteries, results, strict=True):
+            if isinstance(result, BaseException):
+                _LOGGER.debug(
+                    "Synchronized sample of %s failed: %s", battery.battery_id, result
+                )
+                continue
+            samples[battery.battery_id] = result
+        return samples
+
+    async def _probe_and_read(
+        self,
+        battery_id: str,
+        battery: SAXBattery,
+        deadline: float,
+        registers: dict[str, dict[str, Any]] | None = None,
+    ) -> dict[str, float | int | None]:
+        """Probe an unavailable battery and read it if it answers."""
+        if not await self._probe_battery(battery_id):
+            return {}
+        _LOGGER.info("Battery %s is reachable again, resuming polls", battery_id)
+        self.breakers[battery_id].record_success()
+        return await self._read_battery_data_safe(
+            battery_id, battery, deadline, registers
+        )
+
     async def _read_battery_data_safe(
-        self, battery_id: str, battery: SAXBattery
+        self,
+        battery_id: str,
+        battery: SAXBattery,
+        deadline: float,
+        registers: dict[str, dict[str, Any]] | None = None,
     ) -> dict[str, float | int | None]:
         """Safely read data from a single battery with error handling."""
         try:
-            return await battery.read_data()
+            return await battery.read_data(deadline, registers)
         except Exception as e:  # noqa: BLE001
             _LOGGER.error("Error reading data from %s: %s", battery_id, e)
             return {}
@@ -514,16 +1396,80 @@ class SAXBattery:
     """SAX Battery representation."""
 
     def __init__(
-        self, hub: SAXBatteryHub, battery_id: str, host: str, port: int
+        self,
+        hub: SAXBatteryHub,
+        battery_id: str,
+        host: str,
+        port: int,
+        *,
+        index: int = 0,
+        transport: str = TRANSPORT_PYMODBUS,
+        system_registers: bool = True,
     ) -> None:
-        """Initialize the battery."""
+        """Initialize the battery.
+
+        Registers marked ``system`` in the register map are reported for the
+        whole system by the master battery; they are only read when
+        ``system_registers`` is set.
+        """
         self._hub = hub
         self.battery_id = battery_id
+        self.index = index
         self.host = host
         self.port = port
+        self.transport = transport
         self._register_map = self._get_register_map()
+        self.system_registers = system_registers
+        # Registers read every cycle, in register map order
+        self.read_plan = {
+            key: config
+            for key, config in self._register_map.items()
+            if system_registers or not config.get("system", False)
+        }
+        # Demanded registers and the age from which they are read again
+        self.demand: dict[str, float] | None = None
+        self._read_at: dict[str, float] = {}  # time.monotonic() of the last read
+        # Flattened coordinator data key for each register
+        self.data_keys = {key: f"{battery_id}_{key}" for key in self._register_map}
+        # Seconds a register may be served from the hub's register cache
+        self._register_ttls: dict[tuple[int, int], float] = {
+            (config["slave"], config["address"]): config.get(
+                "ttl", DEFAULT_REGISTER_TTL
+            )
+            for config in self._register_map.values()
+        }
         self._data_manager: Any = None  # Will be set by coordinator
 
+    def due_registers(self, now: float) -> dict[str, dict[str, Any]]:
+        """Return the registers of the read plan to read in a cycle at ``now``."""
+        if self.demand is None:
+            return self.read_plan
+        return {
+            key: config
+            for key, config in self.read_plan.items()
+            if key in self.demand
+            and (
+                key not in self._read_at or now - self._read_at[key] >= self.demand[key]
+            )
+        }
+
+    def reads_range(self, slave: int, address: int, count: int) -> bool:
+        """Return whether a demanded register of the read plan is in a range."""
+        return any(
+            config["slave"] == slave
+            and config["address"] < address + count
+            and address < config["address"] + config["count"]
+            for key, config in self.read_plan.items()
+            if self.demand is None or key in self.demand
+        )
+
+    def register_ttl(self, slave: int, address: int, count: int) -> float:
+        """Return the shortest TTL of the registers in a range."""
+        return min(
+            self._register_ttls.get((slave, register), DEFAULT_REGISTER_TTL)
+            for register in range(address, address + count)
+        )
+
     def _get_register_map(self) -> dict[str, dict[str, Any]]:
         """Get the complete register map for SAX Battery from original working version."""
         return {
@@ -563,6 +1509,7 @@ class SAXBattery:
                 "signed": True,
                 "offset": -16384,
                 "slave": 64,
+                "system": True,
             },
             # Slave 40 registers (detailed battery info)
             "capacity": {
@@ -572,6 +1519,7 @@ class SAXBattery:
                 "unit": "Wh",
                 "name": "Capacity",
                 "slave": 40,
+                "ttl": 3600,  # Seconds the raw value may be served from cache
             },
             "cycles": {
                 "address": 40116,
@@ -580,6 +1528,7 @@ class SAXBattery:
                 "unit": "cycles",
                 "name": "Cycles",
                 "slave": 40,
+                "ttl": 600,
             },
             "temp": {
                 "address": 40117,
@@ -721,6 +1670,7 @@ class SAXBattery:
                 "name": "Smart Meter Current L1",
                 "signed": True,
                 "slave": 40,
+                "system": True,
             },
             "smartmeter_current_l2": {
                 "address": 40101,
@@ -730,6 +1680,7 @@ class SAXBattery:
                 "name": "Smart Meter Current L2",
                 "signed": True,
                 "slave": 40,
+                "system": True,
             },
             "smartmeter_current_l3": {
                 "address": 40102,
@@ -739,6 +1690,7 @@ class SAXBattery:
                 "name": "Smart Meter Current L3",
                 "signed": True,
                 "slave": 40,
+                "system": True,
             },
             "active_power_l1": {
                 "address": 40103,
@@ -748,6 +1700,7 @@ class SAXBattery:
                 "name": "Active Power L1",
                 "signed": True,
                 "slave": 40,
+                "system": True,
             },
             "active_power_l2": {
                 "address": 40104,
@@ -757,6 +1710,7 @@ class SAXBattery:
                 "name": "Active Power L2",
                 "signed": True,
                 "slave": 40,
+                "system": True,
             },
             "active_power_l3": {
                 "address": 40105,
@@ -766,6 +1720,7 @@ class SAXBattery:
                 "name": "Active Power L3",
                 "signed": True,
                 "slave": 40,
+                "system": True,
             },
             "smartmeter_voltage_l1": {
                 "address": 40107,
@@ -774,6 +1729,7 @@ class SAXBattery:
                 "unit": "V",
                 "name": "Smart Meter Voltage L1",
                 "slave": 40,
+                "system": True,
             },
             "smartmeter_voltage_l2": {
                 "address": 40108,
@@ -782,6 +1738,7 @@ class SAXBattery:
                 "unit": "V",
                 "name": "Smart Meter Voltage L2",
                 "slave": 40,
+                "system": True,
             },
             "smartmeter_voltage_l3": {
                 "address": 40109,
@@ -790,6 +1747,7 @@ class SAXBattery:
                 "unit": "V",
                 "name": "Smart Meter Voltage L3",
                 "slave": 40,
+                "system": True,
             },
             "smartmeter_total_power": {
                 "address": 40110,
@@ -799,6 +1757,7 @@ class SAXBattery:
                 "name": "Smart Meter Total Power",
                 "signed": True,
                 "slave": 40,
+                "system": True,
             },
         }
 
@@ -854,52 +1813,129 @@ class SAXBattery:
 
         return float(value)
 
-    async def read_data(self) -> dict[str, float | int | None]:
-        """Read battery data."""
-        _LOGGER.debug("Starting to read battery data...")
-        _LOGGER.debug(
-            "Will read %d registers: %s",
-            len(self._register_map),
-            list(self._register_map.keys()),
+    async def read_sample(
+        self, barrier: asyncio.Barrier, deadline: float
+    ) -> tuple[float, dict[str, float | int]]:
+        """Read FAST_REGISTERS in one request once all batteries pass ``barrier``.
+
+        Only the fast registers of the read plan are read, the smart meter is
+        left to the master. Returns the time.monotonic() midpoint of the
+        request and the values.
+        """
+        configs = [
+            self.read_plan[key] for key in FAST_REGISTERS if key in self.read_plan
+        ]
+        address = configs[0]["address"]
+        count = configs[-1]["address"] + configs[-1]["count"] - address
+        budget = ReadBudget(deadline, 1)
+        await barrier.wait()
+        started = time.monotonic()
+        registers = await self._hub.modbus_read_holding_registers(
+            address,
+            count,
+            configs[0]["slave"],
+            self.battery_id,
+            budget=budget,
+            cached=False,
         )
-        data: dict[str, float | int | None] = {}
+        sampled_at = (started + time.monotonic()) / 2
+        values = self.decode_registers(configs[0]["slave"], address, registers)
+        for key in values:
+            self._read_at[key] = sampled_at
+        return sampled_at, values
+
+    def decode_registers(
+        self, slave: int, address: int, registers: list[int]
+    ) -> dict[str, float | int]:
+        """Return the values of the read plan contained in a block of registers."""
+        values = {}
+        for key, config in self.read_plan.items():
+            offset = config["address"] - address
+            if (
+                config["slave"] != slave
+                or offset < 0
+                or offset + config["count"] > len(registers)
+            ):
+                continue
+            raw = registers[offset : offset + config["count"]]
+            values[key] = self._convert_value(
+                raw[0] if config["count"] == 1 else raw, config
+            )
+        return values
 
-        for key, config in self._register_map.items():
-            slave_id = config.get("slave", 1)  # Get slave ID from config
+    async def read_data(
+        self,
+        deadline: float | None = None,
+        registers: dict[str, dict[str, Any]] | None = None,
+    ) -> dict[str, float | int | None]:
+        """Read battery data.
+
+        Reads ``registers``, by default the whole read plan. With a
+        time.monotonic() ``deadline``, blocks still outstanding when it
+        passes are not read and reported as None.
+        """
+        if registers is None:
+            registers = self.read_plan
+        debug = _LOGGER.isEnabledFor(logging.DEBUG)
+        if debug:
+            _LOGGER.debug("Starting to read battery data...")
             _LOGGER.debug(
-                "Reading register for %s: address=%d, count=%d, slave=%d",
-                key,
-                config["address"],
-                config["count"],
-                slave_id,
+                "Will read %d registers: %s",
+                len(registers),
+                list(registers.keys()),
             )
+        data: dict[str, float | int | None] = {}
+        blocks = len(registers)
+        budget = ReadBudget(deadline, blocks) if deadline is not None else None
+        skipped = 0
+
+        for index, (key, config) in enumerate(registers.items()):
+            if budget is not None:
+                if budget.remaining() <= 0:
+                    data[key] = None
+                    skipped += 1
+                    continue
+                budget.outstanding = blocks - index
+            slave_id = config.get("slave", 1)  # Get slave ID from config
+            if debug:
+                _LOGGER.debug(
+                    "Reading register for %s: address=%d, count=%d, slave=%d",
+                    key,
+                    config["address"],
+                    config["count"],
+                    slave_id,
+                )
             try:
                 raw_registers = await self._hub.modbus_read_holding_registers(
                     address=config["address"],
                     count=config["count"],
                     slave=slave_id,
                     battery_id=self.battery_id,  # Pass battery_id to specify which client to use
+                    budget=budget,
                 )
 
                 if raw_registers is not None:
-                    _LOGGER.debug(
-                        "Successfully read %d registers for %s: %s",
-                        len(raw_registers),
-                        key,
-                        raw_registers,
-                    )
+                    if debug:
+                        _LOGGER.debug(
+                            "Successfully read %d registers for %s: %s",
+                            len(raw_registers),
+                            key,
+                            raw_registers,
+                        )
                     if config["count"] == 1:
                         value = self._convert_value(raw_registers[0], config)
                     else:
                         value = self._convert_value(raw_registers, config)
 
                     data[key] = value
-                    _LOGGER.debug(
-                        "Converted value for %s: %s %s",
-                        key,
-                        value,
-                        config.get("unit", ""),
-                    )
+                    self._read_at[key] = time.monotonic()
+                    if debug:
+                        _LOGGER.debug(
+                            "Converted value for %s: %s %s",
+                            key,
+                            value,
+                            config.get("unit", ""),
+                        )
                 else:
                     _LOGGER.warning(
                         "No data received for %s (address %d)", key, config["address"]
@@ -911,10 +1947,23 @@ class SAXBattery:
                 )
                 data[key] = None
 
-        _LOGGER.debug("Finished reading battery data, got %d values", len(data))
+        if skipped:
+            _LOGGER.warning(
+                "Read cycle deadline passed for battery %s, skipped %d of %d blocks",
+                self.battery_id,
+                skipped,
+                blocks,
+            )
+        if debug:
+            _LOGGER.debug("Finished reading battery data, got %d values", len(data))
         return data
 
 
+async def _no_registers() -> dict[str, float | int | None]:
+    """Return the values of a battery with nothing left to read."""
+    return {}
+
+
 async def create_hub(hass: HomeAssistant, config: dict[str, Any]) -> SAXBatteryHub:
     """Create and initialize the hub with multi-battery support."""
     _LOGGER.debug("Creating hub with config: %s", list(config.keys()))
@@ -922,32 +1971,35 @@ async def create_hub(hass: HomeAssistant, config: dict[str, Any]) -> SAXBatteryH
     # Collect battery configurations (battery_a_host, battery_b_host, etc.)
     battery_configs = []
 
-    # Look for battery_a_host, battery_b_host, battery_c_host
-    for battery_letter in ["a", "b", "c"]:
-        host_key = f"battery_{battery_letter}_host"
-        port_key = f"battery_{battery_letter}_port"
-
-        if host_key in config:
-            host = config[host_key]
-            port = config.get(port_key, 502)
-
-            # Ensure port is an integer
-            if isinstance(port, str):
-                port = int(port)
-            elif port is None:
-                port = 502
-
-            battery_id = f"battery_{battery_letter}"
-            battery_configs.append(
-                {
-                    "battery_id": battery_id,
-                    "host": host,
-                    "port": port,
-                }
-            )
-            _LOGGER.debug(
-                "Found battery config: %s=%s, %s=%s", host_key, host, port_key, port
-            )
+    # Batteries are numbered consecutively, stop at the first missing host
+    for index in itertools.count():
+        battery_id = battery_id_for_index(index)
+        host_key = f"{battery_id}_host"
+        port_key = f"{battery_id}_port"
+
+        if host_key not in config:
+            break
+
+        host = config[host_key]
+        port = config.get(port_key, 502)
+
+        # Ensure port is an integer
+        if isinstance(port, str):
+            port = int(port)
+        elif port is None:
+            port = 502
+
+        battery_configs.append(
+            {
+                "battery_id": battery_id,
+                "host": host,
+                "port": port,
+                "transport": config.get(f"{battery_id}_transport", TRANSPORT_PYMODBUS),
+            }
+        )
+        _LOGGER.debug(
+            "Found battery config: %s=%s, %s=%s", host_key, host, port_key, port
+        )
 
     if not battery_configs:
         # Fallback to direct host/port for single battery setup (backward compatibility)
@@ -987,7 +2039,12 @@ async def create_hub(hass: HomeAssistant, config: dict[str, Any]) -> SAXBatteryH
             config_item["port"],
         )
 
-    hub = SAXBatteryHub(hass, battery_configs)
+    hub = SAXBatteryHub(
+        hass,
+        battery_configs,
+        master_battery=config.get(CONF_MASTER_BATTERY),
+        synchronized_sampling=config.get(CONF_SYNC_SAMPLING, False),
+    )
 
     # Test connection to all batteries
     try:
@@ -1012,8 +2069,15 @@ async def create_hub(hass: HomeAssistant, config: dict[str, Any]) -> SAXBatteryH
                     {"addr": 40115, "slave": 40, "desc": "Capacity"},
                     {"addr": 40117, "slave": 40, "desc": "Temperature"},
                 ]
+                # Diagnostics get one read cycle budget like a regular poll
+                budget = ReadBudget(
+                    time.monotonic() + READ_CYCLE_BUDGET, len(test_configs)
+                )
 
-                for test_config in test_configs:
+                for index, test_config in enumerate(test_configs):
+                    if budget.remaining() <= 0:
+                        break
+                    budget.outstanding = len(test_configs) - index
                     try:
                         _LOGGER.debug(
                             "Testing register %d (slave %d) for %s",
@@ -1026,6 +2090,7 @@ async def create_hub(hass: HomeAssistant, config: dict[str, Any]) -> SAXBatteryH
                             count=1,
                             slave=int(test_config["slave"]),
                             battery_id=first_battery_id,
+                            budget=budget,
                         )
                         _LOGGER.info(
                             "SUCCESS: %s register at address %d (slave %d) with value: %s",
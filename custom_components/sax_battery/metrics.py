@@ -0,0 +1,207 @@
+"""Lightweight read statistics for the SAX Battery hub."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import deque
+from dataclasses import dataclass, field
+import time
+from typing import Any
+
+# Upper bucket bounds in seconds for read latency histograms
+LATENCY_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 8.0, 15.0, 30.0)
+
+# Number of recent read cycles kept for percentile calculation
+CYCLE_HISTORY = 120
+
+RECONNECT_WINDOW = 3600.0  # seconds
+
+
+def _percentile(samples: list[float], percent: float) -> float | None:
+    """Return the nearest-rank percentile of the samples."""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(percent / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+@dataclass(slots=True)
+class LatencyHistogram:
+    """Fixed-bucket latency histogram."""
+
+    counts: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+    count: int = 0
+    total: float = 0.0
+    maximum: float = 0.0
+
+    def observe(self, latency: float) -> None:
+        """Record one latency sample in seconds."""
+        self.counts[bisect_left(LATENCY_BUCKETS, latency)] += 1
+        self.count += 1
+        self.total += latency
+        self.maximum = max(self.maximum, latency)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the histogram for diagnostics."""
+        buckets = {
+            f"le_{bound}": self.counts[index]
+            for index, bound in enumerate(LATENCY_BUCKETS)
+        }
+        buckets["le_inf"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 4) if self.count else None,
+            "max": round(self.maximum, 4),
+            "buckets": buckets,
+        }
+
+
+@dataclass(slots=True)
+class BatteryMetrics:
+    """Counters for a single battery."""
+
+    reads: int = 0
+    errors: int = 0
+    retries: int = 0
+    read_timeouts: int = 0
+    battery_timeouts: int = 0
+    reconnects: int = 0
+    write_retries: int = 0
+    write_failures: int = 0
+    cache_hits: int = 0
+    reconnect_times: deque[float] = field(default_factory=deque)
+    blocks: dict[tuple[int, int, int], LatencyHistogram] = field(default_factory=dict)
+
+    @property
+    def error_rate(self) -> float | None:
+        """Return the share of failed reads in percent."""
+        attempts = self.reads + self.errors
+        if not attempts:
+            return None
+        return round(100 * self.errors / attempts, 2)
+
+    def reconnects_per_hour(self, now: float) -> int:
+        """Return the number of reconnects in the last hour."""
+        while self.reconnect_times and now - self.reconnect_times[0] > RECONNECT_WINDOW:
+            self.reconnect_times.popleft()
+        return len(self.reconnect_times)
+
+    def as_dict(self, now: float) -> dict[str, Any]:
+        """Return the counters for diagnostics."""
+        return {
+            "reads": self.reads,
+            "errors": self.errors,
+            "error_rate": self.error_rate,
+            "retries": self.retries,
+            "read_timeouts": self.read_timeouts,
+            "battery_timeouts": self.battery_timeouts,
+            "reconnects": self.reconnects,
+            "reconnects_per_hour": self.reconnects_per_hour(now),
+            "write_retries": self.write_retries,
+            "write_failures": self.write_failures,
+            "cache_hits": self.cache_hits,
+            "blocks": {
+                f"{slave}:{address}+{count}": histogram.as_dict()
+                for (slave, address, count), histogram in sorted(self.blocks.items())
+            },
+        }
+
+
+class HubMetrics:
+    """Collect read latency and health statistics for all batteries."""
+
+    def __init__(self, battery_ids: list[str]) -> None:
+        """Initialize the metrics."""
+        self.batteries = {battery_id: BatteryMetrics() for battery_id in battery_ids}
+        self.cycle_durations: deque[float] = deque(maxlen=CYCLE_HISTORY)
+        self.cycles = 0
+        self.cycle_timeouts = 0
+        self.last_cycle_duration: float | None = None
+
+    def _battery(self, battery_id: str) -> BatteryMetrics:
+        """Return the metrics for a battery, creating them on first use."""
+        if (metrics := self.batteries.get(battery_id)) is None:
+            metrics = self.batteries[battery_id] = BatteryMetrics()
+        return metrics
+
+    def record_read(
+        self, battery_id: str, slave: int, address: int, count: int, latency: float
+    ) -> None:
+        """Record a successful register block read."""
+        metrics = self._battery(battery_id)
+        metrics.reads += 1
+        block = (slave, address, count)
+        if (histogram := metrics.blocks.get(block)) is None:
+            histogram = metrics.blocks[block] = LatencyHistogram()
+        histogram.observe(latency)
+
+    def record_error(self, battery_id: str) -> None:
+        """Record a register block read that failed after all retries."""
+        self._battery(battery_id).errors += 1
+
+    def record_retry(self, battery_id: str) -> None:
+        """Record a retried read attempt."""
+        self._battery(battery_id).retries += 1
+
+    def record_read_timeout(self, battery_id: str) -> None:
+        """Record a single read attempt hitting READ_TIMEOUT."""
+        self._battery(battery_id).read_timeouts += 1
+
+    def record_battery_timeout(self, battery_id: str) -> None:
+        """Record a battery exceeding its share of the cycle budget."""
+        self._battery(battery_id).battery_timeouts += 1
+
+    def record_reconnect(self, battery_id: str) -> None:
+        """Record a reconnect attempt."""
+        metrics = self._battery(battery_id)
+        metrics.reconnects += 1
+        metrics.reconnect_times.append(time.monotonic())
+
+    def record_write_retry(self, battery_id: str) -> None:
+        """Record a write sent again after its read-back did not match."""
+        self._battery(battery_id).write_retries += 1
+
+    def record_write_failure(self, battery_id: str) -> None:
+        """Record a write that was not confirmed after all retries."""
+        self._battery(battery_id).write_failures += 1
+
+    def record_cache_hit(self, battery_id: str) -> None:
+        """Record a register read served from the register cache."""
+        self._battery(battery_id).cache_hits += 1
+
+    def record_cycle(self, duration: float, timed_out: bool = False) -> None:
+        """Record the wall time of a full read cycle."""
+        self.cycles += 1
+        if timed_out:
+            self.cycle_timeouts += 1
+        self.cycle_durations.append(duration)
+        self.last_cycle_duration = duration
+
+    def cycle_percentile(self, percent: float) -> float | None:
+        """Return a percentile of recent cycle durations in seconds."""
+        value = _percentile(list(self.cycle_durations), percent)
+        return round(value, 3) if value is not None else None
+
+    def error_rate(self, battery_id: str) -> float | None:
+        """Return the read error rate of a battery in percent."""
+        return self._battery(battery_id).error_rate
+
+    def reconnects_per_hour(self, battery_id: str) -> int:
+        """Return the reconnects of a battery within the last hour."""
+        return self._battery(battery_id).reconnects_per_hour(time.monotonic())
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return all metrics for diagnostics."""
+        now = time.monotonic()
+        return {
+            "cycles": self.cycles,
+            "cycle_timeouts": self.cycle_timeouts,
+            "last_cycle_duration": self.last_cycle_duration,
+            "cycle_duration_p50": self.cycle_percentile(50),
+            "cycle_duration_p95": self.cycle_percentile(95),
+            "batteries": {
+                battery_id: metrics.as_dict(now)
+                for battery_id, metrics in self.batteries.items()
+            },
+        }
@@ -0,0 +1,330 @@
+"""Minimal asyncio Modbus TCP client for the SAX Battery hub.
+
+Only the function codes the integration uses are implemented: read holding
+registers (3), write multiple registers (16) and read/write multiple
+registers (23). The client mirrors the small part of the pymodbus client API
+the hub relies on, so both can be selected per battery.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass, field
+import logging
+import struct
+from typing import Protocol, cast
+
+from pymodbus import exceptions
+
+from .frame_recorder import (
+    EXCEPTION_FLAG,
+    FC_READ_HOLDING_REGISTERS,
+    FC_READ_WRITE_MULTIPLE_REGISTERS,
+    FC_WRITE_MULTIPLE_REGISTERS,
+    MAX_PDU_LENGTH,
+    MBAP_HEADER,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 10.0  # seconds
+
+# Constructors of the pymodbus exceptions the hub handles, which pymodbus
+# does not annotate
+_connection_error = cast(Callable[[str], Exception], exceptions.ConnectionException)
+_io_error = cast(Callable[[str], Exception], exceptions.ModbusIOException)
+
+
+class ModbusResponse(Protocol):
+    """The part of a response both clients return that the hub uses."""
+
+    registers: list[int]
+
+    def isError(self) -> bool:
+        """Return whether the device answered with an exception."""
+
+
+@dataclass(slots=True)
+class ModbusTcpResponse:
+    """Decoded response to a single request."""
+
+    transaction_id: int
+    device_id: int
+    function_code: int
+    registers: list[int] = field(default_factory=list)
+    exception_code: int | None = None
+
+    def isError(self) -> bool:
+        """Return whether the device answered with an exception (pymodbus API)."""
+        return self.exception_code is not None
+
+    def __str__(self) -> str:
+        """Describe the response like pymodbus does in log messages."""
+        if self.exception_code is not None:
+            return (
+                f"Exception response {self.function_code | EXCEPTION_FLAG} "
+                f"/ {self.exception_code}"
+            )
+        return f"Response {self.function_code} ({len(self.registers)} registers)"
+
+
+class ModbusTcpProtocol(asyncio.Protocol):
+    """Match Modbus TCP responses to pending requests by transaction ID.
+
+    Incoming bytes are parsed in place through a memoryview; only register
+    values are copied out. Responses nobody waits for, e.g. late answers to
+    timed-out requests, are dropped. Bytes that cannot start a frame are
+    skipped one at a time until the stream is aligned to a header again.
+    """
+
+    def __init__(
+        self, trace_packet: Callable[[bool, bytes], bytes] | None = None
+    ) -> None:
+        """Initialize the protocol.
+
+        ``trace_packet`` is called with every frame sent and every chunk of
+        bytes received, like the pymodbus callback of the same name.
+        """
+        self.transport: asyncio.Transport | None = None
+        self._trace_packet = trace_packet
+        self._buffer = bytearray()
+        # Transaction ID -> function code and future of the pending request
+        self._pending: dict[int, tuple[int, asyncio.Future[ModbusTcpResponse]]] = {}
+        self.stray_frames = 0
+        self.skipped_bytes = 0
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        """Store the transport."""
+        assert isinstance(transport, asyncio.Transport)
+        self.transport = transport
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        """Fail all pending requests."""
+        self.transport = None
+        for _, future in self._pending.values():
+            if not future.done():
+                future.set_exception(_connection_error(f"Connection lost: {exc}"))
+        self._pending.clear()
+        self._buffer.clear()
+
+    def send(
+        self,
+        transaction_id: int,
+        device_id: int,
+        pdu: bytes,
+        future: asyncio.Future[ModbusTcpResponse],
+    ) -> None:
+        """Send a request and register the future its response resolves."""
+        assert self.transport is not None
+        self._pending[transaction_id] = (pdu[0], future)
+        frame = MBAP_HEADER.pack(transaction_id, 0, len(pdu) + 1, device_id) + pdu
+        if self._trace_packet is not None:
+            frame = self._trace_packet(True, frame)
+        self.transport.write(frame)
+
+    def forget(self, transaction_id: int) -> None:
+        """Stop waiting for the response to a request."""
+        self._pending.pop(transaction_id, None)
+
+    def in_use(self, transaction_id: int) -> bool:
+        """Return whether a request with this transaction ID is pending."""
+        return transaction_id in self._pending
+
+    def data_received(self, data: bytes) -> None:
+        """Parse all complete frames in the receive buffer."""
+        if self._trace_packet is not None:
+            data = self._trace_packet(False, data)
+        self._buffer += data
+        if consumed := self._parse_frames():
+            del self._buffer[:consumed]
+
+    def _parse_frames(self) -> int:
+        """Dispatch complete frames and return the number of bytes consumed."""
+        offset = 0
+        with memoryview(self._buffer) as view:
+            size = len(view)
+            # A frame holds at least the header and a function code
+            while size - offset > MBAP_HEADER.size:
+                transaction_id, protocol, length, device_id = MBAP_HEADER.unpack_from(
+                    view, offset
+                )
+                if protocol != 0 or not 2 <= length <= MAX_PDU_LENGTH + 1:
+                    offset += 1
+                    self.skipped_bytes += 1
+                    continue
+                end = offset + MBAP_HEADER.size - 1 + length
+                if end > size:
+                    break
+                with view[offset + MBAP_HEADER.size : end] as pdu:
+                    self._dispatch(transaction_id, device_id, pdu)
+                offset = end
+        return offset
+
+    def _dispatch(self, transaction_id: int, device_id: int, pdu: memoryview) -> None:
+        """Resolve the pending request a response belongs to."""
+        pending = self._pending.pop(transaction_id, None)
+        if pending is None or pending[1].done():
+            self.stray_frames += 1
+            _LOGGER.debug("Dropped stray response, transaction %d", transaction_id)
+            return
+        request_code, future = pending
+        function_code = pdu[0]
+        response = ModbusTcpResponse(
+            transaction_id, device_id, function_code & ~EXCEPTION_FLAG
+        )
+
+        if response.function_code != request_code:
+            future.set_exception(
+                _io_error(
+                    f"Function code {function_code} in response to {request_code}"
+                )
+            )
+        elif function_code & EXCEPTION_FLAG:
+            response.exception_code = pdu[1] if len(pdu) > 1 else 0
+            future.set_result(response)
+        elif function_code == FC_WRITE_MULTIPLE_REGISTERS:
+            future.set_result(response)
+        else:
+            byte_count = pdu[1] if len(pdu) > 1 else -1
+            if byte_count < 0 or byte_count % 2 or byte_count + 2 > len(pdu):
+                future.set_exception(_io_error("Malformed register response"))
+                return
+            response.registers = list(
+                struct.unpack_from(f">{byte_count // 2}H", pdu, 2)
+            )
+            future.set_result(response)
+
+
+class NativeModbusTcpClient:
+    """Modbus TCP client built on ModbusTcpProtocol.
+
+    Requests on one connection are pipelined; each waits for the response
+    with its own transaction ID for at most ``timeout`` seconds. There are no
+    internal retries, the hub retries within its read budget.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        timeout: float = DEFAULT_TIMEOUT,
+        *,
+        trace_packet: Callable[[bool, bytes], bytes] | None = None,
+    ) -> None:
+        """Initialize the client."""
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.trace_packet = trace_packet
+        self._protocol: ModbusTcpProtocol | None = None
+        self._transaction_id = 0
+
+    @property
+    def connected(self) -> bool:
+        """Return whether the connection is open."""
+        return self._protocol is not None and self._protocol.transport is not None
+
+    @property
+    def protocol(self) -> ModbusTcpProtocol | None:
+        """Return the protocol of the open connection."""
+        return self._protocol
+
+    async def connect(self) -> bool:
+        """Open the connection, return whether it succeeded."""
+        if self.connected:
+            return True
+        loop = asyncio.get_running_loop()
+        try:
+            async with asyncio.timeout(self.timeout):
+                _, protocol = await loop.create_connection(
+                    lambda: ModbusTcpProtocol(self.trace_packet), self.host, self.port
+                )
+        except (TimeoutError, OSError) as err:
+            _LOGGER.debug("Connection to %s:%s failed: %s", self.host, self.port, err)
+            return False
+        self._protocol = protocol
+        return True
+
+    def close(self) -> None:
+        """Close the connection."""
+        if self._protocol is not None and self._protocol.transport is not None:
+            self._protocol.transport.close()
+        self._protocol = None
+
+    def _next_transaction_id(self, protocol: ModbusTcpProtocol) -> int:
+        """Return the next transaction ID not used by a pending request."""
+        while True:
+            self._transaction_id = (self._transaction_id + 1) & 0xFFFF
+            if not protocol.in_use(self._transaction_id):
+                return self._transaction_id
+
+    async def _execute(self, device_id: int, pdu: bytes) -> ModbusTcpResponse:
+        """Send a request PDU and wait for its response."""
+        protocol = self._protocol
+        if protocol is None or protocol.transport is None:
+            raise _connection_error(f"Not connected to {self.host}:{self.port}")
+        transaction_id = self._next_transaction_id(protocol)
+        future: asyncio.Future[ModbusTcpResponse] = (
+            asyncio.get_running_loop().create_future()
+        )
+        protocol.send(transaction_id, device_id, pdu, future)
+        try:
+            async with asyncio.timeout(self.timeout):
+                return await future
+        except TimeoutError as err:
+            raise _io_error(
+                f"No response received after {self.timeout} seconds"
+            ) from err
+        finally:
+            protocol.forget(transaction_id)
+
+    async def read_holding_registers(
+        self, address: int, *, count: int = 1, device_id: int = 1
+    ) -> ModbusTcpResponse:
+        """Read holding registers (function code 3)."""
+        return await self._execute(
+            device_id, struct.pack(">BHH", FC_READ_HOLDING_REGISTERS, address, count)
+        )
+
+    async def write_registers(
+        self, address: int, values: list[int], *, device_id: int = 1
+    ) -> ModbusTcpResponse:
+        """Write multiple registers (function code 16)."""
+        count = len(values)
+        return await self._execute(
+            device_id,
+            struct.pack(
+                f">BHHB{count}H",
+                FC_WRITE_MULTIPLE_REGISTERS,
+                address,
+                count,
+                2 * count,
+                *values,
+            ),
+        )
+
+    async def readwrite_registers(
+        self,
+        *,
+        read_address: int,
+        read_count: int,
+        write_address: int,
+        values: list[int],
+        device_id: int = 1,
+    ) -> ModbusTcpResponse:
+        """Write registers, then read registers in one request (function code 23)."""
+        count = len(values)
+        return await self._execute(
+            device_id,
+            struct.pack(
+                f">BHHHHB{count}H",
+                FC_READ_WRITE_MULTIPLE_REGISTERS,
+                read_address,
+                read_count,
+                write_address,
+                count,
+                2 * count,
+                *values,
+            ),
+        )
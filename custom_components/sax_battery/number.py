@@ -62,7 +62,7 @@ class SAXBatteryMaxChargeNumber(NumberEntity):
     def __init__(self, coordinator: SAXBatteryCoordinator) -> None:
         """Initialize the SAX Battery Maximum Charge Power number."""
         self._coordinator = coordinator
-        self._attr_unique_id = f"{DOMAIN}_max_charge_power"
+        self._attr_unique_id = f"{coordinator.unique_id_prefix}_max_charge_power"
         self._attr_name = "Maximum Charge Power"
         self._attr_native_min_value = 0
 
@@ -196,7 +196,7 @@ class SAXBatteryMaxDischargeNumber(NumberEntity):
     def __init__(self, coordinator: SAXBatteryCoordinator) -> None:
         """Initialize the SAX Battery Maximum Discharge Power number."""
         self._coordinator = coordinator
-        self._attr_unique_id = f"{DOMAIN}_max_discharge_power"
+        self._attr_unique_id = f"{coordinator.unique_id_prefix}_max_discharge_power"
         self._attr_name = "Maximum Discharge Power"
         self._attr_native_min_value = 0
 
@@ -330,7 +330,7 @@ class SAXBatteryPilotIntervalNumber(NumberEntity):
     def __init__(self, coordinator: SAXBatteryCoordinator, entry: ConfigEntry) -> None:
         """Initialize the SAX Battery Pilot Interval number."""
         self._coordinator = coordinator
-        self._attr_unique_id = f"{DOMAIN}_pilot_interval"
+        self._attr_unique_id = f"{coordinator.unique_id_prefix}_pilot_interval"
         self._attr_name = "Pilot Interval"
         self._attr_native_min_value = 5  # Minimum 5 seconds for local network polling
         self._attr_native_max_value = 300  # Max 5 minutes in seconds
@@ -377,7 +377,7 @@ class SAXBatteryMinSOCNumber(NumberEntity):
     def __init__(self, coordinator: SAXBatteryCoordinator, entry: ConfigEntry) -> None:
         """Initialize the SAX Battery Minimum SoC number."""
         self._coordinator = coordinator
-        self._attr_unique_id = f"{DOMAIN}_min_soc"
+        self._attr_unique_id = f"{coordinator.unique_id_prefix}_min_soc"
         self._attr_name = "Minimum State of Charge"
         self._attr_native_min_value = 0
         self._attr_native_max_value = 100
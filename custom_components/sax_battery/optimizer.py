@@ -0,0 +1,217 @@
+"""Horizon charge-schedule optimizer for the SAX Battery pilot.
+
+The horizon is split into 15 minute slots. For every slot the price of grid
+energy and the expected PV and household power are known from forecasts; a
+dynamic program over a grid of stored energy levels then finds the battery
+setpoints that minimise the cost of grid energy over the whole horizon.
+Each step of the backward pass is vectorised over all pairs of energy levels,
+so a 48 h horizon takes a few milliseconds and can run in the executor.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import math
+from typing import Any
+
+import numpy as np
+
+from homeassistant.util import dt as dt_util
+
+SLOT_DURATION = timedelta(minutes=15)
+SLOTS_PER_HOUR = 4
+REPLAN_INTERVAL = SLOT_DURATION
+ENERGY_LEVELS = 201  # Stored energy grid, 0.5 % steps
+CHARGE_EFFICIENCY = 0.95  # AC to battery
+DISCHARGE_EFFICIENCY = 0.95  # Battery to AC
+
+# Keys of forecast entries in the attributes of common price and PV sensors
+FORECAST_START_KEYS = ("start", "start_time", "startsAt", "period_start", "datetime")
+FORECAST_VALUE_KEYS = ("value", "price", "total", "pv_estimate", "watts", "power")
+
+
+@dataclass(slots=True)
+class ChargeSchedule:
+    """Battery setpoints for consecutive slots.
+
+    Setpoints follow the pilot's convention: positive values discharge,
+    negative values charge the battery.
+    """
+
+    start: datetime
+    setpoints: np.ndarray  # W per slot
+    soc: np.ndarray  # Planned SOC in percent at the end of each slot
+    cost: float  # Planned cost of grid energy over the horizon
+
+    @property
+    def end(self) -> datetime:
+        """Return the end of the last slot."""
+        return self.start + SLOT_DURATION * len(self.setpoints)
+
+    def setpoint_at(self, when: datetime) -> float | None:
+        """Return the planned setpoint at a time, None outside the schedule."""
+        index = math.floor((when - self.start) / SLOT_DURATION)
+        if not 0 <= index < len(self.setpoints):
+            return None
+        return float(self.setpoints[index])
+
+
+def slot_start(when: datetime) -> datetime:
+    """Return the start of the slot a time falls in."""
+    return when.replace(minute=when.minute - when.minute % 15, second=0, microsecond=0)
+
+
+def _forecast_points(attributes: Mapping[str, Any]) -> list[tuple[datetime, float]]:
+    """Collect (start, value) pairs from all forecast attributes of a state.
+
+    Lists of entries with a start and a value key, e.g. ``raw_today`` and
+    ``raw_tomorrow`` of price sensors, and mappings of timestamps to values,
+    e.g. ``watts`` of PV forecast sensors, are recognised.
+    """
+    points: list[tuple[datetime, float]] = []
+    for attribute in attributes.values():
+        entries: list[Any]
+        if isinstance(attribute, Mapping):
+            entries = [
+                {"start": key, "value": value} for key, value in attribute.items()
+            ]
+        elif isinstance(attribute, list):
+            entries = attribute
+        else:
+            continue
+        for entry in entries:
+            if not isinstance(entry, Mapping):
+                continue
+            start = next(
+                (entry[key] for key in FORECAST_START_KEYS if key in entry), None
+            )
+            value = next(
+                (entry[key] for key in FORECAST_VALUE_KEYS if key in entry), None
+            )
+            if isinstance(start, str):
+                start = dt_util.parse_datetime(start)
+            if not isinstance(start, datetime) or start.tzinfo is None or value is None:
+                continue
+            try:
+                points.append((start, float(value)))
+            except (TypeError, ValueError):
+                continue
+    return points
+
+
+def parse_forecast(
+    attributes: Mapping[str, Any], start: datetime, slots: int, scale: float = 1.0
+) -> np.ndarray:
+    """Resample the forecast in a state's attributes to slots.
+
+    Each slot takes the value of the last forecast entry starting at or
+    before it. Slots before the first entry or more than one entry interval
+    after the last one are NaN.
+    """
+    result = np.full(slots, np.nan)
+    points = sorted(_forecast_points(attributes))
+    if not points:
+        return result
+    times = np.array([(point - start).total_seconds() for point, _ in points])
+    values = np.array([value for _, value in points]) * scale
+    spacing = np.diff(times)
+    spacing = spacing[spacing > 0]
+    interval = float(np.min(spacing)) if len(spacing) else 3600.0
+
+    slot_times = np.arange(slots) * SLOT_DURATION.total_seconds()
+    index = np.searchsorted(times, slot_times, side="right") - 1
+    covered = (index >= 0) & (slot_times < times[-1] + interval)
+    result[covered] = values[index[covered]]
+    return result
+
+
+def optimize_schedule(
+    start: datetime,
+    prices: np.ndarray,
+    net_load: np.ndarray,
+    *,
+    capacity: float,
+    soc: float,
+    min_soc: float,
+    max_charge: float,
+    max_discharge: float,
+    feed_in_price: float = 0.0,
+) -> ChargeSchedule:
+    """Return the cheapest setpoint schedule over the horizon.
+
+    ``prices`` are per kWh of grid import and ``net_load`` is household load
+    minus PV in W per slot; both define the horizon length. ``capacity`` is
+    in Wh. The battery never goes below ``min_soc`` unless it already is
+    below, in which case it may only charge, and its AC power stays within
+    ``max_charge`` and ``max_discharge`` W. Energy left at the end of the
+    horizon is valued at the mean price, so the plan does not empty the
+    battery just because the forecast ends.
+    """
+    if len(prices) != len(net_load) or not len(prices):
+        raise ValueError("prices and net_load must have the same, non-zero length")
+    if capacity <= 0:
+        raise ValueError("capacity must be positive")
+
+    hours = SLOT_DURATION.total_seconds() / 3600
+    levels = np.linspace(0.0, capacity, ENERGY_LEVELS)
+    lowest = math.ceil(min_soc / 100 * (ENERGY_LEVELS - 1))
+    current = min(ENERGY_LEVELS - 1, max(0, round(soc / 100 * (ENERGY_LEVELS - 1))))
+
+    # AC power of moving from level i (rows) to level j (columns) in one slot
+    stored = levels[np.newaxis, :] - levels[:, np.newaxis]
+    ac_power = (
+        np.where(stored > 0, stored / CHARGE_EFFICIENCY, stored * DISCHARGE_EFFICIENCY)
+        / hours
+    )
+    source, target = np.indices(ac_power.shape)
+    infeasible = (
+        (ac_power > max_charge)
+        | (ac_power < -max_discharge)
+        | ((target < lowest) & (target < source))
+    )
+
+    value = -levels * DISCHARGE_EFFICIENCY / 1000 * float(np.mean(prices))
+    policy = np.empty((len(prices), ENERGY_LEVELS), dtype=np.intp)
+    rows = np.arange(ENERGY_LEVELS)
+    for slot in range(len(prices) - 1, -1, -1):
+        total = (
+            _grid_cost(prices[slot], feed_in_price, net_load[slot] + ac_power, hours)
+            + value[np.newaxis, :]
+        )
+        total[infeasible] = np.inf
+        policy[slot] = np.argmin(total, axis=1)
+        value = total[rows, policy[slot]]
+
+    setpoints = np.empty(len(prices))
+    planned_soc = np.empty(len(prices))
+    cost = 0.0
+    level = current
+    for slot in range(len(prices)):
+        following = policy[slot, level]
+        setpoints[slot] = -ac_power[level, following]
+        planned_soc[slot] = 100 * following / (ENERGY_LEVELS - 1)
+        cost += float(
+            _grid_cost(
+                prices[slot],
+                feed_in_price,
+                net_load[slot] + ac_power[level, following],
+                hours,
+            )
+        )
+        level = following
+
+    return ChargeSchedule(start, setpoints, planned_soc, cost)
+
+
+def _grid_cost(
+    price: float, feed_in_price: float, grid: np.ndarray, hours: float
+) -> np.ndarray:
+    """Return the cost of importing (positive) or exporting grid power in W."""
+    cost: np.ndarray = (
+        (price * np.maximum(grid, 0.0) + feed_in_price * np.minimum(grid, 0.0))
+        * hours
+        / 1000
+    )
+    return cost
@@ -3,35 +3,56 @@
 import asyncio
 from collections.abc import Callable
 from datetime import timedelta
+from functools import partial
 import inspect
 import logging
 import time
 from typing import Any
 
+import numpy as np
+
 from homeassistant.components.number import NumberEntity, NumberMode
 from homeassistant.components.switch import SwitchEntity
-from homeassistant.const import UnitOfPower
+from homeassistant.const import UnitOfEnergy, UnitOfPower
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_component import EntityComponent
 from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.util import dt as dt_util
 
 from .const import (
     CONF_AUTO_PILOT_INTERVAL,
     CONF_ENABLE_SOLAR_CHARGING,
     CONF_MANUAL_CONTROL,
     CONF_MIN_SOC,
+    CONF_OPTIMIZER_HORIZON,
     CONF_PF_SENSOR,
     CONF_PILOT_FROM_HA,
     CONF_POWER_SENSOR,
+    CONF_PRICE_SENSOR,
     CONF_PRIORITY_DEVICES,
+    CONF_PV_FORECAST_SENSOR,
     DEFAULT_AUTO_PILOT_INTERVAL,
     DEFAULT_MIN_SOC,
+    DEFAULT_OPTIMIZER_HORIZON,
     DOMAIN,
+    PILOT_MAX_DATA_AGE,
     SAX_COMBINED_SOC,
 )
+from .hub import HubException
+from .optimizer import (
+    REPLAN_INTERVAL,
+    SLOTS_PER_HOUR,
+    ChargeSchedule,
+    optimize_schedule,
+    parse_forecast,
+    slot_start,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+# Coordinator values the pilot works with
+PILOT_DATA_KEYS = ("combined_soc", "combined_power")
+
 
 async def async_setup_pilot(hass: HomeAssistant, entry_id: str) -> bool:
     """Set up the SAX Battery pilot service."""
@@ -90,8 +111,14 @@ class SAXBatteryPilot:
         # Modbus
         self.master_battery = sax_data.master_battery
 
+        # Charge schedule optimized from price and PV forecasts, if configured
+        self.schedule: ChargeSchedule | None = None
+
         # Track state
         self._remove_interval_update: Callable[[], None] | None = None
+        self._remove_replan: Callable[[], None] | None = None
+        self._remove_subscription: Callable[[], None] | None = None
+        self._remove_replan_subscription: Callable[[], None] | None = None
         self._remove_config_update: Callable[[], None] | None = None
         self._running = False
 
@@ -100,6 +127,11 @@ class SAXBatteryPilot:
         self.power_sensor_entity_id = self.entry.data.get(CONF_POWER_SENSOR)
         self.pf_sensor_entity_id = self.entry.data.get(CONF_PF_SENSOR)
         self.priority_devices = self.entry.data.get(CONF_PRIORITY_DEVICES, [])
+        self.price_sensor_entity_id = self.entry.data.get(CONF_PRICE_SENSOR)
+        self.pv_forecast_entity_id = self.entry.data.get(CONF_PV_FORECAST_SENSOR)
+        self.optimizer_horizon = self.entry.data.get(
+            CONF_OPTIMIZER_HORIZON, DEFAULT_OPTIMIZER_HORIZON
+        )
         # Get min_soc from coordinator if available, then check entry options, then fall back to entry data
         self.min_soc = (
             self.sax_data.min_soc if hasattr(self.sax_data, 'min_soc')
@@ -153,6 +185,22 @@ class SAXBatteryPilot:
             self._async_config_updated
         )
 
+        # Keep the values the pilot works with as fresh as its interval
+        self._remove_subscription = self.sax_data.async_subscribe(
+            PILOT_DATA_KEYS, current_interval
+        )
+
+        # Re-optimize the charge schedule every slot if a price forecast is set
+        if self.price_sensor_entity_id:
+            self._remove_replan = async_track_time_interval(
+                self.hass, self._async_replan, REPLAN_INTERVAL
+            )
+            # The optimizer inputs need not be fresher than one slot
+            self._remove_replan_subscription = self.sax_data.async_subscribe(
+                self._replan_data_keys(), REPLAN_INTERVAL.total_seconds()
+            )
+            await self._async_replan()
+
         # Do initial calculation
         await self._async_update_pilot(None)
 
@@ -181,9 +229,123 @@ class SAXBatteryPilot:
             self._remove_config_update()
             self._remove_config_update = None
 
+        if self._remove_replan is not None:
+            self._remove_replan()
+            self._remove_replan = None
+
+        if self._remove_subscription is not None:
+            self._remove_subscription()
+            self._remove_subscription = None
+
+        if self._remove_replan_subscription is not None:
+            self._remove_replan_subscription()
+            self._remove_replan_subscription = None
+
         self._running = False
         _LOGGER.info("SAX Battery pilot stopped")
 
+    def _replan_data_keys(self) -> list[str]:
+        """Return the values the charge schedule needs besides PILOT_DATA_KEYS."""
+        return [
+            *(f"{battery_id}_capacity" for battery_id in self.sax_data.batteries),
+            "net_household_load",
+        ]
+
+    async def _async_replan(self, now: Any = None) -> None:
+        """Optimize the charge schedule from the current forecasts.
+
+        There is no load forecast: the household load is taken as constant
+        over the horizon, at its mean over the coordinator history.
+        """
+        start = slot_start(dt_util.utcnow())
+        price_state = self.hass.states.get(self.price_sensor_entity_id)
+        if price_state is None:
+            _LOGGER.warning("Price sensor %s not found", self.price_sensor_entity_id)
+            self.schedule = None
+            return
+
+        # Plan as far ahead as the price forecast reaches
+        prices = parse_forecast(
+            price_state.attributes, start, self.optimizer_horizon * SLOTS_PER_HOUR
+        )
+        missing = np.isnan(prices)
+        horizon = int(np.argmax(missing)) if missing.any() else len(prices)
+        if horizon == 0:
+            _LOGGER.warning(
+                "Price sensor %s has no forecast for the current slot",
+                self.price_sensor_entity_id,
+            )
+            self.schedule = None
+            return
+
+        pv = np.zeros(horizon)
+        if self.pv_forecast_entity_id and (
+            pv_state := self.hass.states.get(self.pv_forecast_entity_id)
+        ):
+            unit = pv_state.attributes.get("unit_of_measurement")
+            scale = (
+                1000.0
+                if unit in (UnitOfPower.KILO_WATT, UnitOfEnergy.KILO_WATT_HOUR)
+                else 1.0
+            )
+            pv = np.nan_to_num(
+                parse_forecast(pv_state.attributes, start, horizon, scale)
+            )
+
+        data = self.sax_data.data or {}
+        capacity = sum(
+            data.get(f"{battery_id}_capacity") or 0
+            for battery_id in self.sax_data.batteries
+        )
+        soc = data.get("combined_soc")
+        if not capacity or soc is None:
+            _LOGGER.debug("Skipping charge schedule - capacity or SOC unknown")
+            self.schedule = None
+            return
+
+        # Without a load forecast, assume the mean household load of the kept
+        # history, before PV, for the whole horizon
+        load = max(0.0, self._mean_net_load(data) + pv[0])
+        try:
+            self.schedule = await self.hass.async_add_executor_job(
+                partial(
+                    optimize_schedule,
+                    start,
+                    prices[:horizon],
+                    load - pv,
+                    capacity=capacity,
+                    soc=soc,
+                    min_soc=self.min_soc,
+                    max_charge=self.max_charge_power,
+                    max_discharge=self.max_discharge_power,
+                )
+            )
+        except ValueError as err:
+            _LOGGER.error("Could not optimize charge schedule: %s", err)
+            self.schedule = None
+            return
+
+        _LOGGER.debug(
+            "Charge schedule for %s slots from %s, planned cost %.2f",
+            horizon,
+            start,
+            self.schedule.cost,
+        )
+
+    def _mean_net_load(self, data: dict[str, Any]) -> float:
+        """Return the household load net of PV, averaged over the history.
+
+        Falls back to the current net household load without history.
+        """
+        history = self.sax_data.history
+        grid = history.get(f"{self.sax_data.master_battery_id}_smartmeter")
+        battery = history.get("combined_power")
+        if grid is not None and battery is not None:
+            grid_mean, battery_mean = grid.mean(), battery.mean()
+            if grid_mean is not None and battery_mean is not None:
+                return float(grid_mean + battery_mean)
+        return float(data.get("net_household_load") or 0.0)
+
     async def _async_update_pilot(self, now: Any = None) -> None:
         """Update the pilot calculations and send to battery."""
         current_time = time.time()
@@ -228,6 +390,18 @@ class SAXBatteryPilot:
         )
 
         try:
+            # Never act on SOC or power readings that are too old
+            for key in ("combined_soc", "combined_power"):
+                age = self.sax_data.value_age(key)
+                if age is None or age > PILOT_MAX_DATA_AGE:
+                    _LOGGER.warning(
+                        "Skipping pilot update - %s is %s (max age %ss)",
+                        key,
+                        "unavailable" if age is None else f"{age:.0f}s old",
+                        PILOT_MAX_DATA_AGE,
+                    )
+                    return
+
             # Check if in manual mode - if so, skip automatic calculations entirely
             if self.entry.data.get(CONF_MANUAL_CONTROL, False):
                 # In manual mode, use the stored calculated_power value
@@ -370,6 +544,17 @@ class SAXBatteryPilot:
 
             target_power = -net_power
 
+            # Follow the charge schedule while it covers the current slot
+            if self.schedule is not None:
+                planned = self.schedule.setpoint_at(dt_util.utcnow())
+                if planned is not None:
+                    _LOGGER.debug(
+                        "Following charge schedule: %sW instead of %sW",
+                        planned,
+                        target_power,
+                    )
+                    target_power = planned
+
             # Apply limits
             target_power = max(
                 -self.max_discharge_power, min(self.max_charge_power, target_power)
@@ -509,6 +694,11 @@ class SAXBatteryPilot:
                 "Pilot update scheduler restarted with %ss interval",
                 interval
             )
+        if self._remove_subscription is not None:
+            self._remove_subscription()
+            self._remove_subscription = self.sax_data.async_subscribe(
+                PILOT_DATA_KEYS, interval
+            )
 
         _LOGGER.debug("Pilot update interval changed to %ss", interval)
 
@@ -629,24 +819,25 @@ class SAXBatteryPilot:
                 _LOGGER.error("No master battery ID available")
                 return
 
+            # Write the setpoint and read status, SOC, power and smart meter
+            # in one request where the battery supports it; otherwise the hub
+            # sends a fast write, reads it back and retries if needed
             try:
-                # We ignore the result since the device has a known issue with response validation
-                await asyncio.wait_for(
-                    hub.modbus_write_registers(
-                        master_battery_id,
-                        41,  # Starting register
-                        values,
-                        slave=64,  # Device ID for SAX battery system
-                    ),
-                    timeout=10.0,  # 10 second timeout for writes
+                registers = await hub.modbus_readwrite_registers(
+                    master_battery_id,
+                    41,  # Starting register
+                    values,
+                    read_address=45,
+                    read_count=4,
+                    slave=64,  # Device ID for SAX battery system
                 )
-                _LOGGER.debug("Power command sent: %sW", power)
-            except Exception as write_err:  # noqa: BLE001
-                # Log as debug since we know the device often returns invalid responses but still works
-                _LOGGER.debug("Expected Modbus write response error (device limitation): %s", write_err)
+            except HubException:
+                _LOGGER.warning("Could not send power command: %sW", power)
+                return
+            if registers is not None:
+                self.sax_data.async_set_registers(master_battery_id, 64, 45, registers)
+            _LOGGER.debug("Power command sent: %sW", power)
 
-        except TimeoutError:
-            _LOGGER.error("Timeout sending power command: %sW (took >10s)", power)
         except Exception as err:  # noqa: BLE001
             _LOGGER.error("Error sending power command: %sW - %s", power, err)
 
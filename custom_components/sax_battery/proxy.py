@@ -0,0 +1,271 @@
+"""Local Modbus TCP proxy sharing the hub's battery connections.
+
+SAX batteries accept only a few Modbus TCP connections. Other local clients,
+e.g. EVCC or the generic Modbus integration, can connect to the proxy
+instead of the battery: requests go through the hub, so they share its
+single connection per battery and its transaction limit. Reads of registers
+the hub read within ``max_age``, typically by the coordinator's last read
+cycle, are answered from the hub's register cache without a request to the
+battery. Writes take the hub's fast path and are answered once the battery
+acknowledged them. While the hub pauses polls of a battery that keeps
+failing, requests are rejected instead of reconnecting. Each battery is
+served on its own port, ``port + index``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import struct
+
+from .frame_recorder import (
+    EXCEPTION_FLAG,
+    FC_READ_HOLDING_REGISTERS,
+    FC_READ_WRITE_MULTIPLE_REGISTERS,
+    FC_WRITE_MULTIPLE_REGISTERS,
+    MAX_PDU_LENGTH,
+    MBAP_HEADER,
+    encode_registers,
+)
+from .hub import HubException, SAXBatteryHub
+
+_LOGGER = logging.getLogger(__name__)
+
+FC_WRITE_SINGLE_REGISTER = 6
+
+# Modbus exception codes
+ILLEGAL_FUNCTION = 0x01
+ILLEGAL_DATA_VALUE = 0x03
+SERVER_DEVICE_FAILURE = 0x04
+GATEWAY_TARGET_FAILED = 0x0B  # The battery did not answer
+
+MAX_READ_COUNT = 125
+MAX_WRITE_COUNT = 123
+
+
+class ModbusProxyProtocol(asyncio.Protocol):
+    """Serve the requests of one client connection through the proxy.
+
+    Requests are handled concurrently and answered as they complete; clients
+    match responses by transaction ID.
+    """
+
+    def __init__(self, proxy: ModbusProxy) -> None:
+        """Initialize the protocol."""
+        self._proxy = proxy
+        self.transport: asyncio.Transport | None = None
+        self._buffer = bytearray()
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        """Store the transport."""
+        assert isinstance(transport, asyncio.Transport)
+        self.transport = transport
+        self._proxy.clients += 1
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        """Cancel the requests still in progress."""
+        self.transport = None
+        self._proxy.clients -= 1
+        for task in self._tasks:
+            task.cancel()
+
+    def data_received(self, data: bytes) -> None:
+        """Handle all complete request frames in the receive buffer."""
+        self._buffer += data
+        offset = 0
+        size = len(self._buffer)
+        while size - offset > MBAP_HEADER.size:
+            transaction_id, protocol, length, device_id = MBAP_HEADER.unpack_from(
+                self._buffer, offset
+            )
+            if protocol != 0 or not 2 <= length <= MAX_PDU_LENGTH + 1:
+                # Not a Modbus TCP stream, drop the client
+                assert self.transport is not None
+                self.transport.close()
+                return
+            end = offset + MBAP_HEADER.size - 1 + length
+            if end > size:
+                break
+            pdu = bytes(self._buffer[offset + MBAP_HEADER.size : end])
+            task = asyncio.get_running_loop().create_task(
+                self._respond(transaction_id, device_id, pdu)
+            )
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            offset = end
+        del self._buffer[:offset]
+
+    async def _respond(self, transaction_id: int, device_id: int, pdu: bytes) -> None:
+        """Send the response to one request."""
+        response = await self._proxy.handle_request(device_id, pdu)
+        if self.transport is not None:
+            self.transport.write(
+                MBAP_HEADER.pack(transaction_id, 0, len(response) + 1, device_id)
+                + response
+            )
+
+
+class ModbusProxy:
+    """Modbus TCP server forwarding requests for one battery to the hub."""
+
+    def __init__(
+        self,
+        hub: SAXBatteryHub,
+        battery_id: str,
+        host: str,
+        port: int,
+        max_age: float | None = None,
+    ) -> None:
+        """Initialize the proxy. Port 0 picks a free port on start.
+
+        Registers read at most ``max_age`` seconds ago are served from the
+        hub's register cache, None serves them only within their TTL.
+        """
+        self._hub = hub
+        self.battery_id = battery_id
+        self.host = host
+        self.port = port
+        self.max_age = max_age
+        self.clients = 0
+        self.requests = 0
+        self._server: asyncio.Server | None = None
+
+    async def async_start(self) -> None:
+        """Start listening, raises OSError if the port is not available."""
+        self._server = await asyncio.get_running_loop().create_server(
+            lambda: ModbusProxyProtocol(self), self.host, self.port
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        _LOGGER.info(
+            "Serving battery %s on Modbus TCP proxy %s:%d",
+            self.battery_id,
+            self.host,
+            self.port,
+        )
+
+    async def async_stop(self) -> None:
+        """Stop listening and close all client connections."""
+        if self._server is None:
+            return
+        self._server.close()
+        self._server.close_clients()
+        await self._server.wait_closed()
+        self._server = None
+
+    def as_dict(self) -> dict[str, object]:
+        """Return the proxy state for diagnostics."""
+        return {
+            "port": self.port,
+            "clients": self.clients,
+            "requests": self.requests,
+        }
+
+    async def handle_request(self, device_id: int, pdu: bytes) -> bytes:
+        """Return the response PDU to a request PDU."""
+        self.requests += 1
+        function_code = pdu[0]
+        if not self._hub.is_battery_available(self.battery_id):
+            # Keep the circuit breaker's backoff, only the hub probes the battery
+            return _exception(function_code, GATEWAY_TARGET_FAILED)
+        try:
+            match function_code:
+                case 3:
+                    return await self._read(device_id, pdu)
+                case 6 | 16:
+                    return await self._write(device_id, pdu)
+                case 23:
+                    return await self._readwrite(device_id, pdu)
+        except (struct.error, ValueError):
+            return _exception(function_code, ILLEGAL_DATA_VALUE)
+        except HubException as err:
+            _LOGGER.debug(
+                "Proxied request to battery %s failed: %s", self.battery_id, err
+            )
+            return _exception(function_code, GATEWAY_TARGET_FAILED)
+        return _exception(function_code, ILLEGAL_FUNCTION)
+
+    async def _read(self, device_id: int, pdu: bytes) -> bytes:
+        """Read holding registers, served from the register cache if recent."""
+        address, count = struct.unpack_from(">HH", pdu, 1)
+        if not 1 <= count <= MAX_READ_COUNT:
+            raise ValueError(f"Cannot read {count} registers")
+        registers = await self._hub.modbus_read_holding_registers(
+            address, count, device_id, self.battery_id, max_age=self.max_age
+        )
+        if len(registers) < count:
+            return _exception(pdu[0], GATEWAY_TARGET_FAILED)
+        return bytes([FC_READ_HOLDING_REGISTERS]) + encode_registers(registers)
+
+    async def _write(self, device_id: int, pdu: bytes) -> bytes:
+        """Write one or multiple registers, acknowledged by the battery.
+
+        The hub reads the registers back afterwards and sends writes that did
+        not stick again.
+        """
+        if pdu[0] == FC_WRITE_SINGLE_REGISTER:
+            address, value = struct.unpack_from(">HH", pdu, 1)
+            values = [value]
+            response = pdu[:5]  # Echo of the request
+        else:
+            address, count = struct.unpack_from(">HH", pdu, 1)
+            if not 1 <= count <= MAX_WRITE_COUNT:
+                raise ValueError(f"Cannot write {count} registers")
+            values = list(struct.unpack_from(f">{count}H", pdu, 6))
+            response = bytes([FC_WRITE_MULTIPLE_REGISTERS]) + pdu[1:5]
+        if not await self._hub.modbus_write_registers_fast(
+            self.battery_id, address, values, device_id
+        ):
+            return _exception(pdu[0], SERVER_DEVICE_FAILURE)
+        await self._hub.wait_for_write_acks(self.battery_id, device_id)
+        return response
+
+    async def _readwrite(self, device_id: int, pdu: bytes) -> bytes:
+        """Write registers, then read registers."""
+        read_address, read_count, write_address, write_count = struct.unpack_from(
+            ">HHHH", pdu, 1
+        )
+        if not (
+            1 <= read_count <= MAX_READ_COUNT and 1 <= write_count <= MAX_WRITE_COUNT
+        ):
+            raise ValueError("Register count out of range")
+        values = list(struct.unpack_from(f">{write_count}H", pdu, 10))
+        registers = await self._hub.modbus_readwrite_registers(
+            self.battery_id, write_address, values, read_address, read_count, device_id
+        )
+        if registers is None:
+            # Written separately, read the registers once the write is confirmed
+            await self._hub.wait_for_write_acks(self.battery_id, device_id)
+            registers = await self._hub.modbus_read_holding_registers(
+                read_address, read_count, device_id, self.battery_id, cached=False
+            )
+        if len(registers) < read_count:
+            return _exception(pdu[0], GATEWAY_TARGET_FAILED)
+        return bytes([FC_READ_WRITE_MULTIPLE_REGISTERS]) + encode_registers(registers)
+
+
+def _exception(function_code: int, exception_code: int) -> bytes:
+    """Return an exception response PDU."""
+    return bytes([function_code | EXCEPTION_FLAG, exception_code])
+
+
+async def async_start_proxies(
+    hub: SAXBatteryHub, host: str, port: int, max_age: float | None = None
+) -> list[ModbusProxy]:
+    """Start a proxy for every battery, skipping ports that are not available."""
+    proxies = []
+    for battery_id, battery in hub.batteries.items():
+        proxy = ModbusProxy(hub, battery_id, host, port + battery.index, max_age)
+        try:
+            await proxy.async_start()
+        except OSError as err:
+            _LOGGER.error(
+                "Cannot start Modbus TCP proxy for battery %s on %s:%d: %s",
+                battery_id,
+                host,
+                proxy.port,
+                err,
+            )
+            continue
+        proxies.append(proxy)
+    return proxies
@@ -0,0 +1,89 @@
+"""Short-lived cache of raw register values read from one battery."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import math
+import time
+
+DEFAULT_REGISTER_TTL = 1.0  # seconds, coalesces reads of the same registers
+
+
+@dataclass(slots=True)
+class CachedBlock:
+    """Registers read in one request, when and until when they are valid."""
+
+    registers: list[int]
+    read_at: float  # time.monotonic()
+    expires: float  # time.monotonic()
+
+
+class RegisterCache:
+    """Raw registers by (slave, address, count) with a TTL per block.
+
+    A read is served from a cached block with the same slave that covers the
+    whole requested range and has not expired, or with ``max_age`` was read
+    at most that many seconds ago. Writes invalidate every block overlapping
+    the written range.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty cache."""
+        self._blocks: dict[tuple[int, int, int], CachedBlock] = {}
+
+    def __len__(self) -> int:
+        """Return the number of cached blocks, including expired ones."""
+        return len(self._blocks)
+
+    def get(
+        self, slave: int, address: int, count: int, max_age: float | None = None
+    ) -> list[int] | None:
+        """Return cached registers of a range, None if not cached or expired."""
+        now = time.monotonic()
+        oldest = math.inf if max_age is None else now - max_age
+
+        def valid(block: CachedBlock) -> bool:
+            return block.expires > now or block.read_at >= oldest
+
+        block = self._blocks.get((slave, address, count))
+        if block is not None and valid(block):
+            return list(block.registers)
+        for (block_slave, start, size), block in self._blocks.items():
+            if (
+                block_slave == slave
+                and start <= address
+                and address + count <= start + size
+                and valid(block)
+            ):
+                return block.registers[address - start : address - start + count]
+        return None
+
+    def put(self, slave: int, address: int, registers: list[int], ttl: float) -> None:
+        """Cache registers read from a range for ``ttl`` seconds."""
+        if ttl <= 0 or not registers:
+            return
+        now = time.monotonic()
+        self._blocks[slave, address, len(registers)] = CachedBlock(
+            list(registers), now, now + ttl
+        )
+
+    def invalidate(self, slave: int, address: int, count: int) -> list[tuple[int, int]]:
+        """Drop blocks overlapping a range, return their unexpired (address, count)."""
+        now = time.monotonic()
+        overlapping = [
+            key
+            for key in self._blocks
+            if key[0] == slave
+            and key[1] < address + count
+            and address < key[1] + key[2]
+        ]
+        dropped = {key: self._blocks.pop(key) for key in overlapping}
+        return [
+            (start, size)
+            for (_, start, size), block in dropped.items()
+            if block.expires > now
+        ]
+
+    def clear(self) -> None:
+        """Drop all blocks."""
+        self._blocks.clear()
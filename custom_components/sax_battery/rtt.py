@@ -0,0 +1,65 @@
+"""Adaptive per-battery request timeouts for the SAX Battery hub."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+RTT_TIMEOUT_FLOOR = 0.2  # seconds
+RTT_TIMEOUT_CEILING = 8.0  # seconds, also the timeout before the first sample
+RTT_CLOCK_GRANULARITY = 0.01  # seconds, smallest variance term
+RTT_ALPHA = 1 / 8  # Gain of the smoothed round trip time
+RTT_BETA = 1 / 4  # Gain of the round trip time variation
+RTT_MAX_BACKOFF = 64  # Largest timeout multiplier after consecutive timeouts
+
+
+@dataclass(slots=True)
+class RttEstimator:
+    """Derive request timeouts from measured round trip times.
+
+    Follows the TCP retransmission timeout of RFC 6298: the timeout is the
+    smoothed round trip time plus four times its mean deviation, bounded by
+    ``floor`` and ``ceiling``. Every timeout doubles the next one until a
+    response arrives again, so a battery that slows down is not flooded with
+    requests that are bound to time out.
+    """
+
+    floor: float = RTT_TIMEOUT_FLOOR
+    ceiling: float = RTT_TIMEOUT_CEILING
+    srtt: float | None = None  # Smoothed round trip time in seconds
+    rttvar: float = 0.0  # Round trip time variation in seconds
+    backoff: int = 1  # Timeout multiplier, doubled on every timeout
+    samples: int = 0
+
+    @property
+    def timeout(self) -> float:
+        """Return the timeout of the next request in seconds."""
+        if self.srtt is None:
+            return self.ceiling
+        rto = self.srtt + max(RTT_CLOCK_GRANULARITY, 4 * self.rttvar)
+        return min(self.ceiling, max(self.floor, rto) * self.backoff)
+
+    def observe(self, rtt: float) -> None:
+        """Update the estimate with the round trip time of a response."""
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar += RTT_BETA * (abs(self.srtt - rtt) - self.rttvar)
+            self.srtt += RTT_ALPHA * (rtt - self.srtt)
+        self.backoff = 1
+        self.samples += 1
+
+    def timed_out(self) -> None:
+        """Back off after a request got no response in time."""
+        self.backoff = min(self.backoff * 2, RTT_MAX_BACKOFF)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the estimate for diagnostics."""
+        return {
+            "srtt": round(self.srtt, 4) if self.srtt is not None else None,
+            "rttvar": round(self.rttvar, 4),
+            "timeout": round(self.timeout, 3),
+            "backoff": self.backoff,
+            "samples": self.samples,
+        }
@@ -0,0 +1,72 @@
+"""Poll scheduler shared by all SAX Battery config entries."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN
+
+DATA_SCHEDULER = f"{DOMAIN}_scheduler"
+
+# Modbus transactions in flight across all config entries
+MAX_CONCURRENT_TRANSACTIONS = 8
+
+
+class SAXPollScheduler:
+    """Stagger read cycles and cap Modbus traffic across config entries.
+
+    Read cycles of different entries start at least ``interval / entries``
+    apart. Coordinators reschedule relative to the end of their last cycle, so
+    entries that were set up together drift into evenly spaced phases instead
+    of polling in lockstep. A single semaphore limits the number of Modbus
+    transactions in flight across all hubs.
+    """
+
+    def __init__(self, max_transactions: int = MAX_CONCURRENT_TRANSACTIONS) -> None:
+        """Initialize the scheduler."""
+        self._intervals: dict[str, float] = {}
+        self._slot_lock = asyncio.Lock()
+        self._next_start = 0.0
+        self.transactions = asyncio.Semaphore(max_transactions)
+
+    @property
+    def entries(self) -> int:
+        """Return the number of registered config entries."""
+        return len(self._intervals)
+
+    @property
+    def spacing(self) -> float:
+        """Return the minimum time between the start of two read cycles."""
+        if len(self._intervals) < 2:
+            return 0.0
+        return min(self._intervals.values()) / len(self._intervals)
+
+    def register(self, entry_id: str, interval: float) -> None:
+        """Register a config entry polling every ``interval`` seconds."""
+        self._intervals[entry_id] = interval
+
+    def unregister(self, entry_id: str) -> None:
+        """Remove a config entry from the schedule."""
+        self._intervals.pop(entry_id, None)
+
+    async def async_wait_for_slot(self) -> None:
+        """Wait until the next read cycle may start.
+
+        Waiters are served in arrival order.
+        """
+        async with self._slot_lock:
+            delay = self._next_start - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._next_start = time.monotonic() + self.spacing
+
+
+@callback
+def async_get_scheduler(hass: HomeAssistant) -> SAXPollScheduler:
+    """Return the scheduler of this Home Assistant instance."""
+    if (scheduler := hass.data.get(DATA_SCHEDULER)) is None:
+        scheduler = hass.data[DATA_SCHEDULER] = SAXPollScheduler()
+    return scheduler
@@ -14,14 +14,17 @@ from homeassistant.components.sensor import (
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
     PERCENTAGE,
+    EntityCategory,
     UnitOfElectricCurrent,
     UnitOfElectricPotential,
     UnitOfEnergy,
     UnitOfFrequency,
     UnitOfPower,
     UnitOfTemperature,
+    UnitOfTime,
 )
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
@@ -30,7 +33,9 @@ from .const import (
     DOMAIN,
     # Add any other constants you need from const.py
 )
-from .coordinator import SAXBatteryCoordinator
+from .coordinator import SAXBatteryCoordinator, SAXBatteryEntity
+from .derived import DerivedMetric
+from .hub import BatteryDataKey
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -72,6 +77,15 @@ async def async_setup_entry(
         else "None",
     )
 
+    # Sensors of registers no battery reads would stay unavailable
+    entity_registry = er.async_get(hass)
+    for key in coordinator.unread_keys:
+        if entity_id := entity_registry.async_get_entity_id(
+            "sensor", DOMAIN, f"{coordinator.unique_id_prefix}_{key}"
+        ):
+            _LOGGER.info("Removing sensor %s, its register is not read", entity_id)
+            entity_registry.async_remove(entity_id)
+
     entities: list[SensorEntity] = []
 
     # Create combined sensors first (these aggregate data from all batteries)
@@ -82,51 +96,48 @@ async def async_setup_entry(
         ]
     )
 
-    # Keep track of created sensors to avoid duplicates
-    created_sensors: set[str] = set()
-
     # Create sensors for all data keys from the coordinator
     if coordinator.data:
+        data_keys = coordinator.hub.data_keys
+
+        # Registers already exposed per battery, their unprefixed copies
+        # (kept for backward compatibility) must not become duplicate sensors
+        battery_registers = {
+            data_keys[key].register for key in coordinator.data if key in data_keys
+        }
+
         for key in coordinator.data:
-            # Skip combined keys as they're handled above
-            if key.startswith("combined_"):
+            # Skip combined and derived keys as they're handled separately
+            if key.startswith("combined_") or key in coordinator.derived.metrics:
                 continue
 
-            # Handle battery-specific sensors (battery_a_, battery_b_, etc.)
-            if key.startswith("battery_"):
-                for battery_prefix in ["battery_a_", "battery_b_", "battery_c_"]:
-                    if key.startswith(battery_prefix):
-                        battery_letter = battery_prefix.split("_")[1].upper()
-                        battery_name = f"Battery {battery_letter}"
-
-                        # Create unique sensor key to track duplicates
-                        sensor_key = f"battery_{battery_letter.lower()}_{key.replace(battery_prefix, '')}"
-
-                        if sensor_key not in created_sensors:
-                            entities.append(
-                                SAXBatterySensor(
-                                    coordinator, key, battery_name=battery_name
-                                )
-                            )
-                            created_sensors.add(sensor_key)
-                        break
-            else:
-                # Handle non-battery-specific keys
-                # Only create if this isn't duplicating a battery-specific sensor
-                sensor_base_key = key
-
-                # Check if this sensor would duplicate a battery-specific one
-                is_duplicate = False
-                for battery_id in ["battery_a", "battery_b", "battery_c"]:
-                    battery_specific_key = f"{battery_id}_{sensor_base_key}"
-                    if battery_specific_key in coordinator.data:
-                        is_duplicate = True
-                        break
-
-                # Only create the non-prefixed sensor if it's not a duplicate
-                if not is_duplicate and key not in created_sensors:
-                    entities.append(SAXBatterySensor(coordinator, key))
-                    created_sensors.add(key)
+            if (battery_key := data_keys.get(key)) is not None:
+                entities.append(
+                    SAXBatterySensor(coordinator, key, battery_key=battery_key)
+                )
+            elif key not in battery_registers:
+                entities.append(SAXBatterySensor(coordinator, key))
+
+    # Add sensors for the metrics derived from each snapshot
+    entities.extend(
+        SAXBatteryDerivedSensor(coordinator, metric)
+        for metric in coordinator.derived.metrics.values()
+    )
+
+    # Add read statistics sensors (disabled by default)
+    entities.extend(
+        [
+            SAXBatteryMetricSensor(coordinator, "cycle_duration_p50"),
+            SAXBatteryMetricSensor(coordinator, "cycle_duration_p95"),
+        ]
+    )
+    for battery_id in coordinator.batteries:
+        entities.extend(
+            [
+                SAXBatteryMetricSensor(coordinator, "error_rate", battery_id),
+                SAXBatteryMetricSensor(coordinator, "reconnects_per_hour", battery_id),
+            ]
+        )
 
     # Add cumulative energy sensors with the configured master battery
     if master_battery_id:
@@ -150,9 +161,12 @@ async def async_setup_entry(
     async_add_entities(entities)
 
 
-class SAXBatteryCombinedSensor(CoordinatorEntity, SensorEntity):
+class SAXBatteryCombinedSensor(SAXBatteryEntity, SensorEntity):
     """Combined sensor that aggregates data from all batteries."""
 
+    # The age changes every update and is not worth recording
+    _unrecorded_attributes = frozenset({"data_age"})
+
     def __init__(
         self,
         coordinator: SAXBatteryCoordinator,
@@ -162,6 +176,7 @@ class SAXBatteryCombinedSensor(CoordinatorEntity, SensorEntity):
         """Initialize the combined sensor."""
         super().__init__(coordinator)
         self._sensor_type = sensor_type
+        self._demand_keys = (sensor_type,)
 
         # Match old naming convention exactly
         match sensor_type:
@@ -176,7 +191,7 @@ class SAXBatteryCombinedSensor(CoordinatorEntity, SensorEntity):
                 self._attr_native_unit_of_measurement = UnitOfPower.WATT
                 self._attr_state_class = SensorStateClass.MEASUREMENT
 
-        self._attr_unique_id = f"{DOMAIN}_{sensor_type}"
+        self._attr_unique_id = f"{coordinator.unique_id_prefix}_{sensor_type}"
 
         # Add device info
         self._attr_device_info = {
@@ -187,11 +202,6 @@ class SAXBatteryCombinedSensor(CoordinatorEntity, SensorEntity):
             "sw_version": "1.0",
         }
 
-    @property
-    def should_poll(self) -> bool:
-        """Return True if entity has to be polled for state."""
-        return True
-
     @property
     def native_value(self) -> float | None:
         """Return the combined value."""
@@ -200,87 +210,121 @@ class SAXBatteryCombinedSensor(CoordinatorEntity, SensorEntity):
 
         return self.coordinator.data.get(self._sensor_type)
 
-    async def async_update(self) -> None:
-        """Update the sensor by recalculating combined values."""
-        # Force coordinator update first
-        await self.coordinator.async_request_refresh()
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the age and quality of the oldest contributing value."""
+        return self.coordinator.freshness_attributes(self._sensor_type)
 
-        # Calculate combined values similar to old implementation
-        match self._sensor_type:
-            case "combined_power":
-                await self._calculate_combined_power()
-            case "combined_soc":
-                await self._calculate_combined_soc()
-
-    async def _calculate_combined_power(self) -> None:
-        """Calculate combined power from all batteries."""
-        total_power = 0.0
-
-        # Sum power from all configured batteries
-        for battery_id in self.coordinator.batteries:
-            power_key = f"{battery_id}_power"
-            if (
-                self.coordinator.data
-                and power_key in self.coordinator.data
-                and self.coordinator.data[power_key] is not None
-            ):
-                total_power += self.coordinator.data[power_key]
-
-        # Store in coordinator data for consistency
+
+class SAXBatteryDerivedSensor(SAXBatteryEntity, SensorEntity):
+    """Sensor exposing a metric derived from the coordinator snapshot."""
+
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(
+        self, coordinator: SAXBatteryCoordinator, metric: DerivedMetric
+    ) -> None:
+        """Initialize the derived sensor."""
+        super().__init__(coordinator)
+        self._key = metric.key
+        self._demand_keys = (metric.key,)
+        self._attr_device_class = metric.device_class
+        self._attr_native_unit_of_measurement = metric.unit
+        self._attr_suggested_display_precision = metric.precision
+        self._attr_unique_id = f"{coordinator.unique_id_prefix}_{metric.key}"
+
+        if metric.battery_id:
+            battery_letter = metric.battery_id.split("_")[-1].upper()
+            self._attr_name = f"Sax Battery {battery_letter} {metric.name}"
+        else:
+            self._attr_name = f"Sax Battery {metric.name}"
+
+        # Add device info
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, coordinator.device_id)},
+            "name": "SAX Battery System",
+            "manufacturer": "SAX",
+            "model": "SAX Battery",
+            "sw_version": "1.0",
+        }
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the derived value."""
         if not self.coordinator.data:
-            self.coordinator.data = {}
-        self.coordinator.data["combined_power"] = round(total_power, 1)
-
-        # Also store in combined_data for backward compatibility
-        if not hasattr(self.coordinator, "combined_data"):
-            self.coordinator.combined_data = {}
-        self.coordinator.combined_data["sax_battery_combined_power"] = round(
-            total_power, 1
-        )
+            return None
+        return self.coordinator.data.get(self._key)
+
+
+class SAXBatteryMetricSensor(CoordinatorEntity[SAXBatteryCoordinator], SensorEntity):
+    """Diagnostic sensor exposing hub read statistics."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(
+        self,
+        coordinator: SAXBatteryCoordinator,
+        metric: str,
+        battery_id: str | None = None,
+    ) -> None:
+        """Initialize the metric sensor."""
+        super().__init__(coordinator)
+        self._metric = metric
+        self._battery_id = battery_id
+
+        match metric:
+            case "cycle_duration_p50":
+                name = "Read Cycle Duration P50"
+                self._attr_device_class = SensorDeviceClass.DURATION
+                self._attr_native_unit_of_measurement = UnitOfTime.SECONDS
+            case "cycle_duration_p95":
+                name = "Read Cycle Duration P95"
+                self._attr_device_class = SensorDeviceClass.DURATION
+                self._attr_native_unit_of_measurement = UnitOfTime.SECONDS
+            case "error_rate":
+                name = "Read Error Rate"
+                self._attr_native_unit_of_measurement = PERCENTAGE
+            case _:
+                name = "Reconnects Per Hour"
 
-        self._attr_native_value = round(total_power, 1)
-
-    async def _calculate_combined_soc(self) -> None:
-        """Calculate average SOC from all batteries."""
-        total_soc = 0.0
-        valid_batteries = 0
-
-        # Calculate average SOC from all configured batteries
-        for battery_id in self.coordinator.batteries:
-            soc_key = f"{battery_id}_soc"
-            if (
-                self.coordinator.data
-                and soc_key in self.coordinator.data
-                and self.coordinator.data[soc_key] is not None
-            ):
-                total_soc += self.coordinator.data[soc_key]
-                valid_batteries += 1
-
-        # Calculate average if we have valid data
-        if valid_batteries > 0:
-            combined_soc = round(total_soc / valid_batteries, 1)
-
-            # Store in coordinator data
-            if not self.coordinator.data:
-                self.coordinator.data = {}
-            self.coordinator.data["combined_soc"] = combined_soc
-
-            # Also store in combined_data for backward compatibility (matching old const)
-            if not hasattr(self.coordinator, "combined_data"):
-                self.coordinator.combined_data = {}
-            self.coordinator.combined_data["sax_battery_combined_soc"] = combined_soc
-
-            self._attr_native_value = combined_soc
+        if battery_id:
+            battery_letter = battery_id.split("_")[-1].upper()
+            self._attr_name = f"Sax Battery {battery_letter} {name}"
+            self._attr_unique_id = (
+                f"{coordinator.unique_id_prefix}_{battery_id}_{metric}"
+            )
         else:
-            # No valid SOC data
-            if self.coordinator.data:
-                self.coordinator.data["combined_soc"] = None
-            if hasattr(self.coordinator, "combined_data"):
-                self.coordinator.combined_data["sax_battery_combined_soc"] = None
-            self._attr_native_value = None
+            self._attr_name = f"Sax Battery {name}"
+            self._attr_unique_id = f"{coordinator.unique_id_prefix}_{metric}"
+
+        # Add device info
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, coordinator.device_id)},
+            "name": "SAX Battery System",
+            "manufacturer": "SAX",
+            "model": "SAX Battery",
+            "sw_version": "1.0",
+        }
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the current metric value."""
+        metrics = self.coordinator.hub.metrics
+        match self._metric, self._battery_id:
+            case "cycle_duration_p50", _:
+                return metrics.cycle_percentile(50)
+            case "cycle_duration_p95", _:
+                return metrics.cycle_percentile(95)
+            case "error_rate", str(battery_id):
+                return metrics.error_rate(battery_id)
+            case _, str(battery_id):
+                return metrics.reconnects_per_hour(battery_id)
+        return None
 
 
-class SAXBatteryCumulativeEnergyProducedSensor(CoordinatorEntity, SensorEntity):
+class SAXBatteryCumulativeEnergyProducedSensor(SAXBatteryEntity, SensorEntity):
     """SAX Battery Cumulative Energy Produced sensor - accumulates charging energy."""
 
     def __init__(
@@ -289,11 +333,16 @@ class SAXBatteryCumulativeEnergyProducedSensor(CoordinatorEntity, SensorEntity):
         """Initialize the sensor."""
         super().__init__(coordinator)
         self._master_battery_id = master_battery_id
+        # Sampled at most once per hour
+        self._demand_keys = (f"{master_battery_id}_energy_produced",)
+        self._demand_max_age = 3600
         self._attr_device_class = SensorDeviceClass.ENERGY
         self._attr_state_class = SensorStateClass.TOTAL_INCREASING
         self._attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
         self._attr_name = "Sax Battery Cumulative Energy Produced"
-        self._attr_unique_id = f"{DOMAIN}_cumulative_energy_produced"
+        self._attr_unique_id = (
+            f"{coordinator.unique_id_prefix}_cumulative_energy_produced"
+        )
         self._last_update_time: datetime | None = None
         self._cumulative_value = 0.0
 
@@ -395,7 +444,7 @@ class SAXBatteryCumulativeEnergyProducedSensor(CoordinatorEntity, SensorEntity):
             )
 
 
-class SAXBatteryCumulativeEnergyConsumedSensor(CoordinatorEntity, SensorEntity):
+class SAXBatteryCumulativeEnergyConsumedSensor(SAXBatteryEntity, SensorEntity):
     """SAX Battery Cumulative Energy Consumed sensor - accumulates discharging energy."""
 
     def __init__(
@@ -404,11 +453,16 @@ class SAXBatteryCumulativeEnergyConsumedSensor(CoordinatorEntity, SensorEntity):
         """Initialize the sensor."""
         super().__init__(coordinator)
         self._master_battery_id = master_battery_id
+        # Sampled at most once per hour
+        self._demand_keys = (f"{master_battery_id}_energy_consumed",)
+        self._demand_max_age = 3600
         self._attr_device_class = SensorDeviceClass.ENERGY
         self._attr_state_class = SensorStateClass.TOTAL_INCREASING
         self._attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
         self._attr_name = "Sax Battery Cumulative Energy Consumed"
-        self._attr_unique_id = f"{DOMAIN}_cumulative_energy_consumed"
+        self._attr_unique_id = (
+            f"{coordinator.unique_id_prefix}_cumulative_energy_consumed"
+        )
         self._last_update_time: datetime | None = None
         self._cumulative_value = 0.0
 
@@ -510,45 +564,44 @@ class SAXBatteryCumulativeEnergyConsumedSensor(CoordinatorEntity, SensorEntity):
             )
 
 
-class SAXBatterySensor(CoordinatorEntity, SensorEntity):
+class SAXBatterySensor(SAXBatteryEntity, SensorEntity):
     """SAX Battery sensor using coordinator."""
 
+    # The age changes every update and is not worth recording
+    _unrecorded_attributes = frozenset({"data_age"})
+
     def __init__(
         self,
         coordinator: SAXBatteryCoordinator,
         data_key: str,
-        battery_name: str | None = None,
+        battery_key: BatteryDataKey | None = None,
     ) -> None:
         """Initialize the SAX Battery sensor."""
         super().__init__(coordinator)
         self._data_key = data_key
-        self._battery_name = battery_name
+        self._demand_keys = (data_key,)
+        self._battery_key = battery_key
 
         # Use battery-specific name if provided
-        if battery_name:
-            # Remove battery prefix (battery_a_, battery_b_, etc.) from data key
-            sensor_key = data_key
-            for prefix in ["battery_a_", "battery_b_", "battery_c_"]:
-                if data_key.startswith(prefix):
-                    sensor_key = data_key.replace(prefix, "")
-                    break
-
+        if battery_key:
+            sensor_key = battery_key.register
             sensor_base_name = self._get_sensor_name(sensor_key)
             # Create entity name in format: SAX Battery A Sensor Name
-            battery_letter = battery_name.split()[-1].upper()
+            battery_letter = battery_key.battery_id.removeprefix("battery_").upper()
             self._attr_name = f"Sax Battery {battery_letter} {sensor_base_name}"
-            # Update unique_id to match the naming pattern you want: sax_battery_a_sensor_key
+            # Unique ID in the pattern sax_battery_battery_a_sensor_key
             self._attr_unique_id = (
-                f"{DOMAIN}_battery_{battery_letter.lower()}_{sensor_key}"
+                f"{coordinator.unique_id_prefix}_{battery_key.battery_id}_{sensor_key}"
             )
         else:
+            sensor_key = data_key
             self._attr_name = self._get_sensor_name(data_key)
-            self._attr_unique_id = f"{DOMAIN}_{data_key}"
+            self._attr_unique_id = f"{coordinator.unique_id_prefix}_{data_key}"
 
         self._attr_device_class, self._attr_native_unit_of_measurement = (
-            self._get_device_class_and_unit(data_key)
+            self._get_device_class_and_unit(sensor_key)
         )
-        self._attr_state_class = self._get_state_class(data_key)
+        self._attr_state_class = self._get_state_class(sensor_key)
 
         # Add device info - use coordinator device_id for consistency
         self._attr_device_info = {
@@ -599,14 +652,7 @@ class SAXBatterySensor(CoordinatorEntity, SensorEntity):
     def _get_device_class_and_unit(
         self, key: str
     ) -> tuple[SensorDeviceClass | None, str | None]:
-        """Get device class and unit for sensor."""
-        # Remove battery prefix for lookup
-        lookup_key = key
-        for prefix in ["battery_a_", "battery_b_", "battery_c_"]:
-            if key.startswith(prefix):
-                lookup_key = key.replace(prefix, "")
-                break
-
+        """Get device class and unit for a register key."""
         mapping = {
             "soc": (SensorDeviceClass.BATTERY, PERCENTAGE),
             "power": (SensorDeviceClass.POWER, UnitOfPower.WATT),
@@ -661,22 +707,15 @@ class SAXBatterySensor(CoordinatorEntity, SensorEntity):
             ),
             "smartmeter_total_power": (SensorDeviceClass.POWER, UnitOfPower.WATT),
         }
-        return mapping.get(lookup_key, (None, None))
+        return mapping.get(key, (None, None))
 
     def _get_state_class(self, key: str) -> SensorStateClass | None:
-        """Get state class for sensor."""
-        # Remove battery prefix for lookup
-        lookup_key = key
-        for prefix in ["battery_a_", "battery_b_", "battery_c_"]:
-            if key.startswith(prefix):
-                lookup_key = key.replace(prefix, "")
-                break
-
-        if lookup_key in ["energy_produced", "energy_consumed", "cycles"]:
+        """Get state class for a register key."""
+        if key in ["energy_produced", "energy_consumed", "cycles"]:
             return SensorStateClass.TOTAL_INCREASING
-        if lookup_key == "capacity":  # Capacity should be TOTAL, not MEASUREMENT
+        if key == "capacity":  # Capacity should be TOTAL, not MEASUREMENT
             return SensorStateClass.TOTAL
-        if lookup_key in [
+        if key in [
             "soc",
             "power",
             "temp",
@@ -713,9 +752,18 @@ class SAXBatterySensor(CoordinatorEntity, SensorEntity):
             return None
         return self.coordinator.data.get(self._data_key)
 
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the age and quality of the value."""
+        return self.coordinator.freshness_attributes(self._data_key)
+
     @property
     def available(self) -> bool:
         """Return True if entity is available."""
+        if self._battery_key is not None and not (
+            self.coordinator.hub.is_battery_available(self._battery_key.battery_id)
+        ):
+            return False
         return self.coordinator.last_update_success and self._data_key in (
             self.coordinator.data or {}
         )
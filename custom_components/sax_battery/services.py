@@ -0,0 +1,131 @@
+"""Services for SAX Battery integration."""
+
+from __future__ import annotations
+
+from datetime import datetime
+import logging
+from pathlib import Path
+
+import voluptuous as vol
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import HomeAssistantError
+import homeassistant.helpers.config_validation as cv
+from homeassistant.util.json import JsonValueType
+
+from .const import DOMAIN
+from .frame_recorder import write_frames_jsonl
+from .hub import SAXBatteryHub
+
+_LOGGER = logging.getLogger(__name__)
+
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_CAPACITY = "capacity"
+ATTR_CLEAR = "clear"
+
+SERVICE_START_FRAME_RECORDING = "start_frame_recording"
+SERVICE_STOP_FRAME_RECORDING = "stop_frame_recording"
+SERVICE_DUMP_FRAME_RECORDING = "dump_frame_recording"
+
+SERVICES = (
+    SERVICE_START_FRAME_RECORDING,
+    SERVICE_STOP_FRAME_RECORDING,
+    SERVICE_DUMP_FRAME_RECORDING,
+)
+
+START_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_CAPACITY): vol.All(
+            vol.Coerce(int), vol.Range(min=100, max=100000)
+        ),
+    }
+)
+STOP_SCHEMA = vol.Schema({vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string})
+DUMP_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_CLEAR, default=False): cv.boolean,
+    }
+)
+
+
+def _get_hubs(hass: HomeAssistant, call: ServiceCall) -> dict[str, SAXBatteryHub]:
+    """Return the hubs targeted by a service call keyed by entry ID."""
+    coordinators = hass.data.get(DOMAIN, {})
+    if (entry_id := call.data.get(ATTR_CONFIG_ENTRY_ID)) is not None:
+        if entry_id not in coordinators:
+            raise HomeAssistantError(f"Unknown SAX Battery config entry {entry_id}")
+        return {entry_id: coordinators[entry_id].hub}
+    return {entry_id: coordinator.hub for entry_id, coordinator in coordinators.items()}
+
+
+async def _async_start_frame_recording(call: ServiceCall) -> None:
+    """Start capturing Modbus frames."""
+    for hub in _get_hubs(call.hass, call).values():
+        hub.frame_recorder.start(call.data.get(ATTR_CAPACITY))
+
+
+async def _async_stop_frame_recording(call: ServiceCall) -> None:
+    """Stop capturing Modbus frames."""
+    for hub in _get_hubs(call.hass, call).values():
+        hub.frame_recorder.stop()
+
+
+async def _async_dump_frame_recording(call: ServiceCall) -> ServiceResponse:
+    """Write the captured Modbus frames to the config directory."""
+    hass = call.hass
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    files: list[JsonValueType] = []
+
+    for entry_id, hub in _get_hubs(hass, call).items():
+        frames = hub.frame_recorder.snapshot()
+        if call.data[ATTR_CLEAR]:
+            hub.frame_recorder.clear()
+
+        path = Path(hass.config.path(f"{DOMAIN}_frames_{entry_id}_{stamp}.jsonl"))
+        count = await hass.async_add_executor_job(write_frames_jsonl, path, frames)
+        _LOGGER.info("Wrote %d Modbus frames to %s", count, path)
+        files.append({"path": str(path), "frames": count})
+
+    return {"files": files}
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration services once."""
+    if hass.services.has_service(DOMAIN, SERVICE_DUMP_FRAME_RECORDING):
+        return
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_START_FRAME_RECORDING,
+        _async_start_frame_recording,
+        schema=START_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_STOP_FRAME_RECORDING,
+        _async_stop_frame_recording,
+        schema=STOP_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_DUMP_FRAME_RECORDING,
+        _async_dump_frame_recording,
+        schema=DUMP_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+def async_unload_services(hass: HomeAssistant) -> None:
+    """Remove the integration services when no entry is left."""
+    if hass.data.get(DOMAIN):
+        return
+
+    for service in SERVICES:
+        hass.services.async_remove(DOMAIN, service)
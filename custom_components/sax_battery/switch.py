@@ -11,7 +11,7 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import CONF_ENABLE_SOLAR_CHARGING, CONF_MANUAL_CONTROL, DOMAIN, SAX_STATUS
-from .coordinator import SAXBatteryCoordinator
+from .coordinator import SAXBatteryCoordinator, SAXBatteryEntity
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -24,7 +24,7 @@ async def async_setup_entry(
     """Set up the SAX Battery switches."""
     coordinator: SAXBatteryCoordinator = hass.data[DOMAIN][entry.entry_id]
 
-    entities = [
+    entities: list[SwitchEntity] = [
         SAXBatterySolarChargingSwitch(coordinator),
         SAXBatteryManualControlSwitch(coordinator),
     ]
@@ -80,7 +80,7 @@ class SAXBatterySolarChargingSwitch(CoordinatorEntity, SwitchEntity):
         """Initialize the switch."""
         super().__init__(coordinator)
         self._attr_name = "Sax Battery Solar Charging"
-        self._attr_unique_id = f"{DOMAIN}_solar_charging"
+        self._attr_unique_id = f"{coordinator.unique_id_prefix}_solar_charging"
         self._attr_icon = "mdi:solar-power"
 
         # Add device info
@@ -150,7 +150,7 @@ class SAXBatteryManualControlSwitch(CoordinatorEntity, SwitchEntity):
         """Initialize the switch."""
         super().__init__(coordinator)
         self._attr_name = "Sax Battery Manual Control"
-        self._attr_unique_id = f"{DOMAIN}_manual_control"
+        self._attr_unique_id = f"{coordinator.unique_id_prefix}_manual_control"
         self._attr_icon = "mdi:hand-back-right"
 
         # Add device info
@@ -213,7 +213,7 @@ class SAXBatteryManualControlSwitch(CoordinatorEntity, SwitchEntity):
         self.async_write_ha_state()
 
 
-class SAXBatteryOnOffSwitch(CoordinatorEntity, SwitchEntity):
+class SAXBatteryOnOffSwitch(SAXBatteryEntity, SwitchEntity):
     """SAX Battery On/Off switch."""
 
     def __init__(
@@ -223,7 +223,8 @@ class SAXBatteryOnOffSwitch(CoordinatorEntity, SwitchEntity):
         super().__init__(coordinator)
         self.battery_id = battery_id
         self.battery = battery
-        self._attr_unique_id = f"{DOMAIN}_{battery_id}_switch"
+        self._demand_keys = (f"{battery_id}_status",)
+        self._attr_unique_id = f"{coordinator.unique_id_prefix}_{battery_id}_switch"
         self._attr_name = f"Sax {battery_id.replace('_', ' ').title()} On/Off"
 
         # Get registers from coordinator's modbus_registers
@@ -275,8 +276,8 @@ class SAXBatteryOnOffSwitch(CoordinatorEntity, SwitchEntity):
 
                 # Match against configured on/off states from registers
                 if self._registers:
-                    state_on = self._registers.get("state_on", 3)
-                    state_off = self._registers.get("state_off", 1)
+                    state_on: int = self._registers.get("state_on", 3)
+                    state_off: int = self._registers.get("state_off", 1)
 
                     if isinstance(status_value, (int, float)):
                         is_on = int(status_value) == state_on
@@ -316,6 +317,10 @@ class SAXBatteryOnOffSwitch(CoordinatorEntity, SwitchEntity):
         if not self.coordinator.data:
             return False
 
+        # Battery is skipped after repeated failures
+        if not self.coordinator.hub.is_battery_available(self.battery_id):
+            return False
+
         # Check if any status key exists and has non-None value
         status_keys = [
             f"{self.battery_id}_status",
@@ -352,11 +357,9 @@ class SAXBatteryOnOffSwitch(CoordinatorEntity, SwitchEntity):
                 slave_id,
             )
 
-            success = await self.coordinator.async_write_modbus_registers(
-                self.battery_id,
-                address,
-                [command_on],
-                device_id=slave_id,
+            # Through the hub, which invalidates the cached status register
+            success = await self.coordinator.hub.modbus_write_registers(
+                self.battery_id, address, [command_on], slave_id
             )
 
             if success:
@@ -403,11 +406,9 @@ class SAXBatteryOnOffSwitch(CoordinatorEntity, SwitchEntity):
                 slave_id,
             )
 
-            success = await self.coordinator.async_write_modbus_registers(
-                self.battery_id,
-                address,
-                [command_off],
-                device_id=slave_id,
+            # Through the hub, which invalidates the cached status register
+            success = await self.coordinator.hub.modbus_write_registers(
+                self.battery_id, address, [command_off], slave_id
             )
 
             if success:
@@ -435,58 +436,51 @@ class SAXBatteryOnOffSwitch(CoordinatorEntity, SwitchEntity):
     async def _wait_for_status_change(
         self, expected_state: int, timeout: int = 180
     ) -> None:
-        """Wait for battery status to change to expected state."""
-        start_time = asyncio.get_event_loop().time()
-        check_interval = 10  # Check every 10 seconds to reduce coordinator load
-        last_log_time = start_time
-        log_interval = 30  # Log progress every 30 seconds
-
-        while (elapsed := asyncio.get_event_loop().time() - start_time) < timeout:
-            # Refresh coordinator data
-            await self.coordinator.async_request_refresh()
-            await asyncio.sleep(2)  # Give coordinator time to update
+        """Wait for battery status to change to expected state.
 
-            # Check current status
-            current_status = self._get_current_status()
+        Only the status register of this battery is polled; the coordinator
+        cycle is not triggered.
+        """
+        start_time = asyncio.get_running_loop().time()
 
-            if current_status is not None and int(current_status) == expected_state:
-                _LOGGER.info(
-                    "Battery %s status changed to %s after %d seconds",
-                    self.battery_id,
-                    expected_state,
-                    int(elapsed),
-                )
-                # Force entity state update
-                self.async_write_ha_state()
-                return
-
-            # Log progress every 30 seconds
-            if elapsed - last_log_time >= log_interval:
-                _LOGGER.debug(
-                    "Battery %s status is %s, waiting for %s (elapsed: %ds/%ds)",
-                    self.battery_id,
-                    current_status,
-                    expected_state,
-                    int(elapsed),
-                    timeout,
-                )
-                last_log_time = elapsed
-
-            # Wait before next check
-            await asyncio.sleep(check_interval)
-
-        # Timeout reached
-        final_status = self._get_current_status()
-        _LOGGER.warning(
-            "Timeout after %d seconds waiting for battery %s status change - Expected: %s, Current: %s",
-            timeout,
+        current_status = await self.coordinator.hub.wait_for_register_value(
             self.battery_id,
+            self._registers.get("address", 45),
             expected_state,
-            final_status,
+            slave=self._registers.get("slave", 64),
+            timeout=timeout,
         )
-        # Force final entity state update even on timeout
+        elapsed = asyncio.get_running_loop().time() - start_time
+
+        if current_status is not None:
+            self._store_status(current_status)
+
+        if current_status == expected_state:
+            _LOGGER.info(
+                "Battery %s status changed to %s after %d seconds",
+                self.battery_id,
+                expected_state,
+                int(elapsed),
+            )
+        else:
+            _LOGGER.warning(
+                "Timeout after %d seconds waiting for battery %s status change - Expected: %s, Current: %s",
+                timeout,
+                self.battery_id,
+                expected_state,
+                current_status,
+            )
+
+        # Force entity state update
         self.async_write_ha_state()
 
+    def _store_status(self, status: int) -> None:
+        """Store a freshly read status value in the coordinator snapshot."""
+        values = {f"{self.battery_id}_status": status}
+        if self.battery_id == self.coordinator.master_battery_id:
+            values["status"] = status
+        self.coordinator.async_set_values(values)
+
     def _get_current_status(self) -> int | None:
         """Get current battery status value."""
         if not self.coordinator.data:
@@ -0,0 +1,123 @@
+"""Bounded in-memory history of register values."""
+
+from __future__ import annotations
+
+from array import array
+from collections import deque
+
+HISTORY_DURATION = 3600.0  # seconds of history kept per value
+
+
+class RegisterSeries:
+    """Fixed-size ring buffer of timestamped samples.
+
+    Values and time.monotonic() timestamps are stored in two ``array('d')``
+    buffers, so memory is bounded by ``capacity``. Mean, minimum, maximum and
+    rate of change over the buffered window are O(1): the mean from a running
+    sum, minimum and maximum from monotonic queues of sample numbers.
+    """
+
+    __slots__ = (
+        "_count",
+        "_maxima",
+        "_minima",
+        "_sum",
+        "_timestamps",
+        "_values",
+        "capacity",
+    )
+
+    def __init__(self, capacity: int) -> None:
+        """Initialize an empty series holding at most ``capacity`` samples."""
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self._values = array("d", bytes(8 * capacity))
+        self._timestamps = array("d", bytes(8 * capacity))
+        self._count = 0  # Samples appended so far, also the next sample number
+        self._sum = 0.0
+        self._minima: deque[int] = deque()
+        self._maxima: deque[int] = deque()
+
+    def __len__(self) -> int:
+        """Return the number of buffered samples."""
+        return min(self._count, self.capacity)
+
+    def _value(self, sample: int) -> float:
+        """Return the value of a buffered sample number."""
+        return self._values[sample % self.capacity]
+
+    def append(self, timestamp: float, value: float) -> None:
+        """Add a sample, replacing the oldest one once the buffer is full."""
+        sample = self._count
+        index = sample % self.capacity
+        if sample >= self.capacity:
+            # Drop the replaced sample before its slot is overwritten
+            evicted = sample - self.capacity
+            for queue in (self._minima, self._maxima):
+                if queue and queue[0] == evicted:
+                    queue.popleft()
+            self._sum -= self._values[index]
+
+        self._values[index] = value
+        self._timestamps[index] = timestamp
+        self._sum += value
+        self._count += 1
+
+        while self._minima and self._value(self._minima[-1]) >= value:
+            self._minima.pop()
+        self._minima.append(sample)
+        while self._maxima and self._value(self._maxima[-1]) <= value:
+            self._maxima.pop()
+        self._maxima.append(sample)
+
+        # Bound the rounding error of the running sum
+        if index == self.capacity - 1:
+            self._sum = sum(self._values)
+
+    @property
+    def latest(self) -> float | None:
+        """Return the newest value."""
+        if not self._count:
+            return None
+        return self._value(self._count - 1)
+
+    def mean(self) -> float | None:
+        """Return the mean of the buffered values."""
+        if not self._count:
+            return None
+        return self._sum / len(self)
+
+    def minimum(self) -> float | None:
+        """Return the smallest buffered value."""
+        if not self._minima:
+            return None
+        return self._value(self._minima[0])
+
+    def maximum(self) -> float | None:
+        """Return the largest buffered value."""
+        if not self._maxima:
+            return None
+        return self._value(self._maxima[0])
+
+    def rate_of_change(self) -> float | None:
+        """Return the change per second between the oldest and newest sample."""
+        if len(self) < 2:
+            return None
+        first = (self._count - len(self)) % self.capacity
+        last = (self._count - 1) % self.capacity
+        elapsed = self._timestamps[last] - self._timestamps[first]
+        if elapsed <= 0:
+            return None
+        return (self._values[last] - self._values[first]) / elapsed
+
+    def samples(self) -> list[tuple[float, float]]:
+        """Return the buffered (timestamp, value) pairs, oldest first."""
+        start = self._count - len(self)
+        return [
+            (
+                self._timestamps[sample % self.capacity],
+                self._values[sample % self.capacity],
+            )
+            for sample in range(start, self._count)
+        ]
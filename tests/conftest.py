@@ -0,0 +1,91 @@
+"""Fixtures for SAX Battery integration tests."""
+
+from collections.abc import AsyncGenerator, Awaitable, Callable
+import json
+from pathlib import Path
+import platform
+from typing import Any
+
+import pymodbus
+import pytest
+
+from .sax_simulator import SAXBatterySimulator, SimulatorFaults, start_simulators
+
+BENCHMARK_RESULTS = pytest.StashKey[dict[str, Any]]()
+MANIFEST = Path(__file__).parents[1] / "custom_components/sax_battery/manifest.json"
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Add the benchmark options."""
+    group = parser.getgroup("sax_battery", "SAX Battery benchmarks")
+    group.addoption(
+        "--sax-benchmark-json",
+        metavar="PATH",
+        default=None,
+        help="Write the benchmark results to PATH as JSON",
+    )
+    group.addoption(
+        "--sax-benchmark-batteries",
+        type=int,
+        default=6,
+        help="Battery count of the N-battery read cycle benchmark",
+    )
+    group.addoption(
+        "--sax-benchmark-cycles",
+        type=int,
+        default=5,
+        help="Number of measured read cycles per benchmark",
+    )
+    group.addoption(
+        "--sax-benchmark-latency",
+        type=float,
+        default=0.002,
+        help="Simulated Modbus response latency in seconds",
+    )
+
+
+def pytest_sessionfinish(session: pytest.Session, exitstatus: int) -> None:
+    """Write the collected benchmark results."""
+    path = session.config.getoption("--sax-benchmark-json")
+    results = session.config.stash.get(BENCHMARK_RESULTS, None)
+    if not path or not results:
+        return
+
+    report = {
+        "integration_version": json.loads(MANIFEST.read_text())["version"],
+        "python": platform.python_version(),
+        "pymodbus": pymodbus.__version__,
+        "simulated_latency": session.config.getoption("--sax-benchmark-latency"),
+        "cycles": session.config.getoption("--sax-benchmark-cycles"),
+        "results": dict(sorted(results.items())),
+    }
+    Path(path).write_text(json.dumps(report, indent=2) + "\n")
+
+
+@pytest.fixture(name="benchmark_results", scope="session")
+def benchmark_results_fixture(pytestconfig: pytest.Config) -> dict[str, Any]:
+    """Return the session wide benchmark result store."""
+    return pytestconfig.stash.setdefault(BENCHMARK_RESULTS, {})
+
+
+@pytest.fixture(name="sax_simulators")
+async def sax_simulators_fixture(
+    socket_enabled: None,
+) -> AsyncGenerator[Callable[..., Awaitable[list[SAXBatterySimulator]]]]:
+    """Return a factory starting local SAX battery simulators.
+
+    All simulators started through the factory are stopped on teardown.
+    """
+    started: list[SAXBatterySimulator] = []
+
+    async def _start(
+        count: int = 1, faults: SimulatorFaults | None = None, **model_kwargs: object
+    ) -> list[SAXBatterySimulator]:
+        simulators = await start_simulators(count, faults, **model_kwargs)
+        started.extend(simulators)
+        return simulators
+
+    yield _start
+
+    for simulator in started:
+        await simulator.stop()
@@ -0,0 +1,387 @@
+"""Time-warped simulation harness for the SAX Battery pilot.
+
+Drives an unmodified SAXBatteryPilot through a 24 h household load and PV
+profile on a virtual clock. Modbus is replaced by SimulatedBatteryHub, which
+applies setpoint writes to a SAXBatteryModel, so a full day runs in seconds::
+
+    simulation = PilotSimulation(hass, HouseholdProfile.synthetic())
+    report = await simulation.run()
+
+The power sensor follows the pilot's convention of positive values for grid
+export and negative values for grid import. The battery model reports
+positive power while discharging.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import csv
+from dataclasses import asdict, dataclass
+import math
+from pathlib import Path
+import random
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import patch
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.sax_battery import pilot as pilot_module
+from custom_components.sax_battery.const import (
+    CONF_AUTO_PILOT_INTERVAL,
+    CONF_ENABLE_SOLAR_CHARGING,
+    CONF_MANUAL_CONTROL,
+    CONF_MIN_SOC,
+    CONF_PF_SENSOR,
+    CONF_PILOT_FROM_HA,
+    CONF_POWER_SENSOR,
+    DOMAIN,
+)
+from custom_components.sax_battery.hub import battery_id_for_index
+from custom_components.sax_battery.timeseries import RegisterSeries
+from homeassistant.core import HomeAssistant
+
+from .sax_simulator import REG_POWER_FACTOR, REG_SETPOINT, SAXBatteryModel
+
+DAY = 86400.0
+POWER_SENSOR = "sensor.simulated_grid_power"
+PF_SENSOR = "sensor.simulated_grid_power_factor"
+
+
+class VirtualClock:
+    """Clock shared by the pilot, the battery model and the harness."""
+
+    def __init__(self) -> None:
+        """Initialize the clock at midnight."""
+        self.now = 0.0
+
+    def time(self) -> float:
+        """Return the virtual time in seconds."""
+        return self.now
+
+    async def sleep(self, delay: float) -> None:
+        """Advance the virtual time instead of waiting."""
+        self.now += max(0.0, delay)
+        await asyncio.sleep(0)
+
+
+@dataclass(slots=True)
+class HouseholdProfile:
+    """Load and PV power samples over one day at a fixed resolution."""
+
+    step: float  # Seconds between samples
+    load: list[float]  # W
+    pv: list[float]  # W
+
+    def at(self, seconds: float) -> tuple[float, float]:
+        """Return the interpolated load and PV power at a time of day."""
+        position = (seconds % DAY) / self.step
+        index = int(position)
+        fraction = position - index
+        following = (index + 1) % len(self.load)
+        index %= len(self.load)
+        return (
+            self.load[index] + (self.load[following] - self.load[index]) * fraction,
+            self.pv[index] + (self.pv[following] - self.pv[index]) * fraction,
+        )
+
+    @classmethod
+    def synthetic(
+        cls,
+        *,
+        base_load: float = 300.0,
+        peak_pv: float = 6000.0,
+        step: float = 60.0,
+        noise: float = 0.0,
+        seed: int | None = None,
+    ) -> HouseholdProfile:
+        """Return a typical day with morning and evening load peaks.
+
+        PV follows a half sine between 06:00 and 20:00. ``noise`` adds
+        relative random variation, e.g. passing clouds and appliance spikes.
+        """
+        rng = random.Random(seed)
+        load = []
+        pv = []
+        for sample in range(int(DAY / step)):
+            hour = sample * step / 3600
+            value = (
+                base_load
+                + 1500 * math.exp(-(((hour - 7.5) / 1.0) ** 2))
+                + 2500 * math.exp(-(((hour - 19.0) / 1.5) ** 2))
+            )
+            sun = max(0.0, math.sin(math.pi * (hour - 6) / 14)) if hour < 20 else 0.0
+            production = peak_pv * sun
+            if noise:
+                value *= 1 + rng.uniform(-noise, noise)
+                production *= 1 - rng.uniform(0, noise)
+            load.append(value)
+            pv.append(production)
+        return cls(step, load, pv)
+
+    @classmethod
+    def from_csv(cls, path: Path) -> HouseholdProfile:
+        """Load a recorded profile with ``seconds,load,pv`` columns.
+
+        Samples must be equally spaced and start at midnight.
+        """
+        with path.open(encoding="utf-8", newline="") as file:
+            rows = [
+                (float(row["seconds"]), float(row["load"]), float(row["pv"]))
+                for row in csv.DictReader(file)
+            ]
+        step = rows[1][0] - rows[0][0]
+        return cls(step, [row[1] for row in rows], [row[2] for row in rows])
+
+
+@dataclass(slots=True)
+class PilotSimulationReport:
+    """Outcome of a simulated pilot run."""
+
+    duration: float  # Simulated seconds
+    grid_import_kwh: float = 0.0
+    grid_export_kwh: float = 0.0
+    writes: int = 0
+    setpoint_changes: int = 0
+    setpoint_reversals: int = 0  # Changes of direction between setpoints
+    setpoint_travel: float = 0.0  # Sum of absolute setpoint steps (W)
+    soc_constraint_hits: int = 0
+    min_soc: float = 100.0
+    max_soc: float = 0.0
+    final_soc: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the report as a JSON serialisable dict."""
+        return asdict(self)
+
+
+class SimulatedBatteryHub:
+    """Stand-in for SAXBatteryHub that writes to a battery model."""
+
+    def __init__(
+        self, model: SAXBatteryModel, clock: VirtualClock, write_delay: float
+    ) -> None:
+        """Initialize the hub."""
+        self.model = model
+        self._clock = clock
+        self._write_delay = write_delay
+        self.writes: list[tuple[float, int]] = []
+
+    async def modbus_write_registers(
+        self, battery_id: str, address: int, values: list[int], slave: int = 64
+    ) -> bool:
+        """Apply a register write after the hub's write delay."""
+        await self._clock.sleep(self._write_delay)
+        return await self.modbus_write_registers_fast(
+            battery_id, address, values, slave
+        )
+
+    async def modbus_write_registers_fast(
+        self, battery_id: str, address: int, values: list[int], slave: int = 64
+    ) -> bool:
+        """Apply a register write right away, like a confirmed fast write."""
+        self.model.sync()
+        for offset, value in enumerate(values):
+            self.model.write_control_register(address + offset, value)
+        if address == REG_SETPOINT:
+            setpoint = self.model.setpoint
+            if setpoint >= 0x8000:
+                setpoint -= 0x10000
+            self.writes.append((self._clock.now, setpoint))
+        return True
+
+    async def modbus_readwrite_registers(  # noqa: PLR0917
+        self,
+        battery_id: str,
+        address: int,
+        values: list[int],
+        read_address: int,
+        read_count: int,
+        slave: int = 64,
+    ) -> list[int] | None:
+        """Write like a battery without combined write and read requests."""
+        await self.modbus_write_registers_fast(battery_id, address, values, slave)
+        return None
+
+
+class _SimulatedCoordinator:
+    """The parts of SAXBatteryCoordinator the pilot relies on."""
+
+    def __init__(
+        self,
+        entry: MockConfigEntry,
+        hub: SimulatedBatteryHub,
+        clock: VirtualClock,
+        battery_count: int,
+    ) -> None:
+        self.entry = entry
+        self._clock = clock
+        self._last_refresh: float | None = None
+        self.device_id = "simulated"
+        self._hub = hub
+        self.batteries = {
+            battery_id_for_index(index): SimpleNamespace()
+            for index in range(battery_count)
+        }
+        self.master_battery = next(iter(self.batteries.values()))
+        self.master_battery_id = next(iter(self.batteries))
+        self.data: dict[str, Any] = {}
+        self.history: dict[str, RegisterSeries] = {}
+        # Max age of each subscribed key
+        self.subscriptions: dict[str, float | None] = {}
+
+    def async_subscribe(
+        self, keys: list[str], max_age: float | None = None
+    ) -> Callable[[], None]:
+        """Record the keys a consumer needs."""
+        self.subscriptions.update(dict.fromkeys(keys, max_age))
+
+        def _unsubscribe() -> None:
+            for key in keys:
+                self.subscriptions.pop(key, None)
+
+        return _unsubscribe
+
+    def refresh(self) -> None:
+        """Sample the battery model like a coordinator poll."""
+        model = self._hub.model
+        model.sync()
+        self.data = {
+            "combined_soc": float(round(model.soc)),
+            "combined_power": float(round(model.power)),
+        }
+        self._last_refresh = self._clock.now
+
+    def value_age(self, key: str) -> float | None:
+        """Return the virtual seconds since the last poll."""
+        if key not in self.data or self._last_refresh is None:
+            return None
+        return self._clock.now - self._last_refresh
+
+
+class PilotSimulation:
+    """Run the pilot against a household profile on a virtual clock.
+
+    ``scan_interval`` is the coordinator poll interval and ``sensor_interval``
+    the update interval of the grid power sensor. ``entry_data`` overrides the
+    pilot configuration, e.g. the pilot interval or manual control.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        profile: HouseholdProfile,
+        *,
+        battery_count: int = 1,
+        soc: float = 50.0,
+        scan_interval: float = 60.0,
+        sensor_interval: float = 10.0,
+        write_delay: float = 2.0,
+        entry_data: dict[str, Any] | None = None,
+    ) -> None:
+        """Initialize the simulation."""
+        self.hass = hass
+        self.profile = profile
+        self.clock = VirtualClock()
+        self.model = SAXBatteryModel(
+            capacity_wh=11520.0 * battery_count,
+            soc=soc,
+            max_charge=3500 * battery_count,
+            max_discharge=3500 * battery_count,
+            clock=self.clock.time,
+        )
+        self.hub = SimulatedBatteryHub(self.model, self.clock, write_delay)
+        self.entry = MockConfigEntry(
+            domain=DOMAIN,
+            data={
+                CONF_PILOT_FROM_HA: True,
+                CONF_POWER_SENSOR: POWER_SENSOR,
+                CONF_PF_SENSOR: PF_SENSOR,
+                CONF_MIN_SOC: 15,
+                CONF_AUTO_PILOT_INTERVAL: 60,
+                CONF_ENABLE_SOLAR_CHARGING: True,
+                CONF_MANUAL_CONTROL: False,
+                **(entry_data or {}),
+            },
+        )
+        self.coordinator = _SimulatedCoordinator(
+            self.entry, self.hub, self.clock, battery_count
+        )
+        self.scan_interval = scan_interval
+        self.sensor_interval = sensor_interval
+
+    def _grid_import(self, seconds: float) -> float:
+        """Return the grid import (negative for export) at a virtual time."""
+        load, pv = self.profile.at(seconds)
+        return load - pv - self.model.power
+
+    async def run(self, duration: float = DAY) -> PilotSimulationReport:
+        """Simulate ``duration`` seconds and return the report."""
+        clock = self.clock
+        report = PilotSimulationReport(duration)
+        pilot = pilot_module.SAXBatteryPilot(self.hass, self.coordinator)
+
+        apply_soc_constraints = pilot._apply_soc_constraints
+
+        async def _counting_soc_constraints(power_value: float) -> float:
+            constrained = await apply_soc_constraints(power_value)
+            if constrained != power_value:
+                report.soc_constraint_hits += 1
+            return constrained
+
+        pilot._apply_soc_constraints = _counting_soc_constraints
+        pilot_interval = pilot.update_interval
+        self.hass.states.async_set(PF_SENSOR, "1.0")
+        self.model.write_control_register(REG_POWER_FACTOR, 10)
+        self.model.sync()
+
+        next_refresh = next_pilot = 0.0
+        last = 0.0
+        with (
+            patch.object(pilot_module, "time", clock),
+            patch.object(
+                pilot_module,
+                "asyncio",
+                SimpleNamespace(sleep=clock.sleep, wait_for=asyncio.wait_for),
+            ),
+        ):
+            while clock.now < duration:
+                self.model.sync()
+                grid = self._grid_import(clock.now)
+                energy = grid * (clock.now - last) / 3600000
+                if energy > 0:
+                    report.grid_import_kwh += energy
+                else:
+                    report.grid_export_kwh -= energy
+                last = clock.now
+                report.min_soc = min(report.min_soc, self.model.soc)
+                report.max_soc = max(report.max_soc, self.model.soc)
+
+                self.hass.states.async_set(POWER_SENSOR, str(round(-grid)))
+                if clock.now >= next_refresh:
+                    self.coordinator.refresh()
+                    next_refresh += self.scan_interval
+                if clock.now >= next_pilot:
+                    await pilot._async_update_pilot(clock.now)
+                    next_pilot += pilot_interval
+
+                clock.now = max(
+                    clock.now,
+                    (clock.now // self.sensor_interval + 1) * self.sensor_interval,
+                )
+
+        self.model.sync()
+        report.final_soc = self.model.soc
+        report.writes = len(self.hub.writes)
+        previous = 0
+        direction = 0
+        for _, setpoint in self.hub.writes:
+            if (step := setpoint - previous) != 0:
+                report.setpoint_changes += 1
+                report.setpoint_travel += abs(step)
+                if direction and (step > 0) != (direction > 0):
+                    report.setpoint_reversals += 1
+                direction = step
+            previous = setpoint
+        return report
@@ -0,0 +1,438 @@
+"""Local SAX battery simulator built on the pymodbus TCP server.
+
+Implements the register map read and written by the integration:
+
+* slave 64, registers 41-48 (setpoint, power factor, limits, status, SOC,
+  power and smart meter)
+* slave 40, registers 40073-40117 (phase values, energy counters, smart
+  meter details, capacity, cycles and temperature)
+
+Writes to registers 41-44 drive a simple battery model whose power ramps
+towards the commanded setpoint within the configured limits and whose SOC is
+integrated from that power. Faults seen on real installations can be injected
+per simulator: response latency, dropped responses, transaction ID mismatches
+and the write quirk that makes pymodbus report "Request cancelled outside
+pymodbus" although the write was applied.
+
+Each simulator listens on its own port, so several batteries can be served
+from one test::
+
+    simulators = await start_simulators(3)
+    hub = await create_hub(hass, simulator_config(simulators))
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass, field, replace
+import random
+import time
+from typing import Self
+
+from pymodbus.constants import ExcCodes
+from pymodbus.datastore import ModbusBaseDeviceContext, ModbusServerContext
+from pymodbus.exceptions import NoSuchIdException
+from pymodbus.pdu import ModbusPDU
+from pymodbus.server import ModbusTcpServer
+
+from custom_components.sax_battery.hub import battery_id_for_index
+
+SIM_HOST = "127.0.0.1"
+
+SLAVE_CONTROL = 64
+SLAVE_DETAIL = 40
+
+REG_SETPOINT = 41
+REG_POWER_FACTOR = 42
+REG_MAX_DISCHARGE = 43
+REG_MAX_CHARGE = 44
+REG_STATUS = 45
+REG_SOC = 46
+REG_POWER = 47
+REG_SMARTMETER = 48
+
+CONTROL_FIRST = REG_SETPOINT
+CONTROL_LAST = REG_SMARTMETER
+CONTROL_WRITABLE = range(REG_SETPOINT, REG_STATUS + 1)
+DETAIL_FIRST = 40073
+DETAIL_LAST = 40117
+
+STATUS_OFF = 1
+STATUS_ON = 3
+STATUS_COMMAND_OFF = 1
+STATUS_COMMAND_ON = 2
+
+FC_READ_WRITE = 23  # Read/write multiple registers
+
+REGISTER_OFFSET = 16384  # Offset the hub subtracts from registers 47 and 48
+PHASE_VOLTAGE = 230.0
+
+
+def _u16(value: float) -> int:
+    """Return a value as an unsigned 16-bit register (two's complement)."""
+    return int(round(value)) & 0xFFFF
+
+
+def _s16(register: int) -> int:
+    """Return a register as a signed 16-bit value."""
+    return register - 0x10000 if register >= 0x8000 else register
+
+
+@dataclass(slots=True)
+class SimulatorFaults:
+    """Faults injected into the simulated Modbus exchanges.
+
+    Rates are probabilities per request. With ``write_quirk`` every write is
+    applied but answered with a stray transaction ID, so the client only sees
+    its own timeout or cancellation, as with the real SAX inverter. With
+    ``readwrite_unsupported`` function code 23 requests are rejected as an
+    illegal function.
+    """
+
+    latency: float = 0.0  # Seconds added to every response
+    jitter: float = 0.0  # Uniform extra latency in [0, jitter)
+    drop_rate: float = 0.0  # Requests that never get a response
+    tid_mismatch_rate: float = 0.0  # Responses sent with a wrong transaction ID
+    write_quirk: bool = False
+    readwrite_unsupported: bool = False
+    seed: int | None = None
+
+
+@dataclass(slots=True)
+class SAXBatteryModel:
+    """Physical model of a single SAX battery.
+
+    Time is taken from ``clock`` and multiplied by ``time_scale``, so a test
+    can run hours of battery behaviour in seconds or drive the clock by hand.
+    Positive power means discharging, matching the pilot's sign convention.
+    """
+
+    capacity_wh: float = 11520.0
+    soc: float = 50.0
+    setpoint: int = 0
+    power_factor: int = 10
+    max_discharge: int = 3500
+    max_charge: int = 3500
+    status: int = STATUS_ON
+    ramp_rate: float = 2000.0  # W/s
+    status_delay: float = 0.0  # Seconds until an on/off command takes effect
+    load: float = 500.0  # House consumption seen by the smart meter (W)
+    pv: float = 0.0  # PV production seen by the smart meter (W)
+    temperature: int = 25
+    clock: Callable[[], float] = time.monotonic
+    time_scale: float = 1.0
+    power: float = 0.0
+    energy_discharged_wh: float = 0.0
+    energy_charged_wh: float = 0.0
+    _last_update: float | None = field(default=None, repr=False)
+    _pending_status: tuple[float, int] | None = field(default=None, repr=False)
+
+    @property
+    def grid_power(self) -> float:
+        """Return the power drawn from the grid (negative when exporting)."""
+        return self.load - self.pv - self.power
+
+    @property
+    def cycles(self) -> int:
+        """Return the number of full equivalent discharge cycles."""
+        return int(self.energy_discharged_wh // self.capacity_wh)
+
+    def target_power(self) -> float:
+        """Return the power the inverter is currently heading for."""
+        if self.status != STATUS_ON:
+            return 0.0
+        target = float(
+            max(-self.max_charge, min(self.max_discharge, _s16(self.setpoint)))
+        )
+        if (target > 0 and self.soc <= 0.0) or (target < 0 and self.soc >= 100.0):
+            return 0.0
+        return target
+
+    def advance(self, seconds: float) -> None:
+        """Advance the model by the given number of simulated seconds."""
+        if self._pending_status is not None:
+            due, status = self._pending_status
+            if seconds >= due:
+                self.status = status
+                self._pending_status = None
+            else:
+                self._pending_status = (due - seconds, status)
+
+        if seconds <= 0:
+            return
+
+        target = self.target_power()
+        previous = self.power
+        ramp_time = min(seconds, abs(target - previous) / self.ramp_rate)
+        step = self.ramp_rate * ramp_time
+        self.power = max(previous - step, min(previous + step, target))
+
+        # Trapezoid while ramping, then constant power for the rest of the step
+        energy = (
+            (previous + self.power) / 2 * ramp_time + self.power * (seconds - ramp_time)
+        ) / 3600
+        if energy > 0:
+            self.energy_discharged_wh += energy
+        else:
+            self.energy_charged_wh -= energy
+        self.soc = max(0.0, min(100.0, self.soc - energy / self.capacity_wh * 100))
+        if (self.power > 0 and self.soc <= 0.0) or (
+            self.power < 0 and self.soc >= 100.0
+        ):
+            self.power = 0.0
+
+    def sync(self) -> None:
+        """Advance the model to the current clock time."""
+        now = self.clock()
+        if self._last_update is not None:
+            self.advance((now - self._last_update) * self.time_scale)
+        self._last_update = now
+
+    def control_registers(self) -> dict[int, int]:
+        """Return the slave 64 registers."""
+        return {
+            REG_SETPOINT: self.setpoint,
+            REG_POWER_FACTOR: self.power_factor,
+            REG_MAX_DISCHARGE: self.max_discharge,
+            REG_MAX_CHARGE: self.max_charge,
+            REG_STATUS: self.status,
+            REG_SOC: _u16(self.soc),
+            REG_POWER: _u16(self.power + REGISTER_OFFSET),
+            REG_SMARTMETER: _u16(self.grid_power + REGISTER_OFFSET),
+        }
+
+    def detail_registers(self) -> dict[int, int]:
+        """Return the populated slave 40 registers."""
+        phase_current = abs(self.power) / 3 / PHASE_VOLTAGE
+        grid = self.grid_power
+        grid_current = grid / 3 / PHASE_VOLTAGE
+        voltage = _u16(PHASE_VOLTAGE * 10)
+        return {
+            40073: _u16(phase_current * 300),
+            40074: _u16(phase_current * 100),
+            40075: _u16(phase_current * 100),
+            40076: _u16(phase_current * 100),
+            40081: voltage,
+            40082: voltage,
+            40083: voltage,
+            40085: _u16(self.power / 10),
+            40087: 500,
+            40089: _u16(abs(self.power) / 10),
+            40091: 0,
+            40093: 1,
+            40096: _u16(self.energy_discharged_wh % 0x10000),
+            40097: _u16(self.energy_charged_wh % 0x10000),
+            40099: self.status,
+            40100: _u16(grid_current * 100),
+            40101: _u16(grid_current * 100),
+            40102: _u16(grid_current * 100),
+            40103: _u16(grid / 30),
+            40104: _u16(grid / 30),
+            40105: _u16(grid / 30),
+            40107: voltage,
+            40108: voltage,
+            40109: voltage,
+            40110: _u16(grid),
+            40115: _u16(self.capacity_wh / 10),
+            40116: _u16(self.cycles),
+            40117: self.temperature,
+        }
+
+    def write_control_register(self, address: int, value: int) -> None:
+        """Apply a write to one of the slave 64 registers 41-45."""
+        if address == REG_SETPOINT:
+            self.setpoint = value
+        elif address == REG_POWER_FACTOR:
+            self.power_factor = value
+        elif address == REG_MAX_DISCHARGE:
+            self.max_discharge = value
+        elif address == REG_MAX_CHARGE:
+            self.max_charge = value
+        elif address == REG_STATUS:
+            status = {STATUS_COMMAND_ON: STATUS_ON, STATUS_COMMAND_OFF: STATUS_OFF}
+            if value in status:
+                if self.status_delay > 0:
+                    self._pending_status = (self.status_delay, status[value])
+                else:
+                    self.status = status[value]
+
+
+class SAXDeviceContext(ModbusBaseDeviceContext):
+    """Serve one SAX slave from the battery model."""
+
+    def __init__(self, simulator: SAXBatterySimulator, slave: int) -> None:
+        """Initialize the device context."""
+        self._simulator = simulator
+        self._slave = slave
+
+    def reset(self) -> None:
+        """Reset is not supported by the model."""
+
+    async def _before_response(self, function_code: int) -> None:
+        """Count the request and apply latency and drop faults."""
+        simulator = self._simulator
+        simulator.requests[(self._slave, function_code)] += 1
+        faults = simulator.faults
+        delay = faults.latency
+        if faults.jitter:
+            delay += simulator.random.uniform(0, faults.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+        if faults.drop_rate and simulator.random.random() < faults.drop_rate:
+            simulator.dropped += 1
+            # The server is configured to ignore missing devices, so this
+            # request is silently left without a response
+            raise NoSuchIdException(f"Dropped request for device {self._slave}")
+
+    async def async_getValues(
+        self, fc_as_hex: int, address: int, count: int = 1
+    ) -> list[int] | list[bool] | ExcCodes:
+        """Return register values from the model."""
+        if fc_as_hex != FC_READ_WRITE:
+            await self._before_response(fc_as_hex)  # Done when writing for FC23
+        model = self._simulator.model
+        model.sync()
+        if self._slave == SLAVE_CONTROL:
+            first, last = CONTROL_FIRST, CONTROL_LAST
+            registers = model.control_registers()
+        else:
+            first, last = DETAIL_FIRST, DETAIL_LAST
+            registers = model.detail_registers()
+        if address < first or address + count - 1 > last:
+            return ExcCodes.ILLEGAL_ADDRESS
+        return [registers.get(reg, 0) for reg in range(address, address + count)]
+
+    async def async_setValues(
+        self, fc_as_hex: int, address: int, values: list[int] | list[bool]
+    ) -> None | ExcCodes:
+        """Apply register writes to the model."""
+        await self._before_response(fc_as_hex)
+        if fc_as_hex == FC_READ_WRITE and self._simulator.faults.readwrite_unsupported:
+            return ExcCodes.ILLEGAL_FUNCTION
+        if self._slave != SLAVE_CONTROL or not all(
+            reg in CONTROL_WRITABLE for reg in range(address, address + len(values))
+        ):
+            return ExcCodes.ILLEGAL_ADDRESS
+        model = self._simulator.model
+        model.sync()
+        for offset, value in enumerate(values):
+            model.write_control_register(address + offset, int(value))
+        self._simulator.writes.append((address, [int(value) for value in values]))
+        self._simulator.last_write_at = time.monotonic()
+        return None
+
+
+class SAXBatterySimulator:
+    """Modbus TCP server simulating a single SAX battery."""
+
+    def __init__(
+        self,
+        model: SAXBatteryModel | None = None,
+        faults: SimulatorFaults | None = None,
+        *,
+        host: str = SIM_HOST,
+        port: int = 0,
+    ) -> None:
+        """Initialize the simulator. Port 0 picks a free port on start."""
+        self.model = model or SAXBatteryModel()
+        self.faults = faults or SimulatorFaults()
+        self.random = random.Random(self.faults.seed)
+        self.host = host
+        self.port = port
+        self.requests: Counter[tuple[int, int]] = Counter()
+        self.writes: list[tuple[int, list[int]]] = []
+        self.last_write_at: float | None = None  # time.monotonic() of last write
+        self.dropped = 0
+        self.mismatched = 0
+        self._server: ModbusTcpServer | None = None
+
+    @property
+    def transactions(self) -> int:
+        """Return the number of requests received so far."""
+        return sum(self.requests.values())
+
+    def reset_counters(self) -> None:
+        """Reset the request and fault counters."""
+        self.requests.clear()
+        self.writes.clear()
+        self.last_write_at = None
+        self.dropped = 0
+        self.mismatched = 0
+
+    def _trace_pdu(self, sending: bool, pdu: ModbusPDU) -> ModbusPDU:
+        """Corrupt the transaction ID of outgoing responses when requested."""
+        if not sending:
+            return pdu
+        faults = self.faults
+        if (faults.write_quirk and pdu.function_code == 16) or (
+            faults.tid_mismatch_rate and self.random.random() < faults.tid_mismatch_rate
+        ):
+            self.mismatched += 1
+            pdu.transaction_id = (pdu.transaction_id + 1) & 0xFFFF
+        return pdu
+
+    async def start(self) -> None:
+        """Start serving and resolve the listening port."""
+        context = ModbusServerContext(
+            devices={
+                SLAVE_CONTROL: SAXDeviceContext(self, SLAVE_CONTROL),
+                SLAVE_DETAIL: SAXDeviceContext(self, SLAVE_DETAIL),
+            },
+            single=False,
+        )
+        self._server = ModbusTcpServer(
+            context,
+            address=(self.host, self.port),
+            ignore_missing_devices=True,
+            trace_pdu=self._trace_pdu,
+        )
+        await self._server.serve_forever(background=True)
+        self.port = self._server.transport.sockets[0].getsockname()[1]
+        self.model.sync()
+
+    async def stop(self) -> None:
+        """Stop serving and close all client connections."""
+        if self._server is not None:
+            await self._server.shutdown()
+            self._server = None
+
+    async def __aenter__(self) -> Self:
+        """Start the simulator as an async context manager."""
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """Stop the simulator when leaving the context."""
+        await self.stop()
+
+
+async def start_simulators(
+    count: int,
+    faults: SimulatorFaults | None = None,
+    **model_kwargs: object,
+) -> list[SAXBatterySimulator]:
+    """Start one simulator per battery, each on its own port."""
+    simulators = [
+        SAXBatterySimulator(
+            SAXBatteryModel(**model_kwargs),  # type: ignore[arg-type]
+            replace(faults) if faults else None,
+        )
+        for _ in range(count)
+    ]
+    for simulator in simulators:
+        await simulator.start()
+    return simulators
+
+
+def simulator_config(simulators: list[SAXBatterySimulator]) -> dict[str, object]:
+    """Return config entry data pointing the integration at the simulators."""
+    config: dict[str, object] = {"battery_count": len(simulators)}
+    for index, simulator in enumerate(simulators):
+        battery = battery_id_for_index(index)
+        config[f"{battery}_host"] = simulator.host
+        config[f"{battery}_port"] = simulator.port
+    if simulators:
+        config["master_battery"] = "battery_a"
+    return config
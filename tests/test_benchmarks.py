@@ -0,0 +1,167 @@
+"""Benchmarks of the SAX Battery hub and pilot against the local simulator.
+
+The benchmarks run with the normal test suite. To track regressions between
+releases, write the results as JSON::
+
+    pytest tests/test_benchmarks.py --sax-benchmark-json=benchmarks.json
+
+All times are wall-clock seconds measured with time.perf_counter().
+"""
+
+import asyncio
+from functools import partial
+import statistics
+import time
+from typing import Any
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.sax_battery.const import (
+    CONF_MIN_SOC,
+    CONF_PF_SENSOR,
+    CONF_PILOT_FROM_HA,
+    CONF_POWER_SENSOR,
+    DOMAIN,
+)
+from custom_components.sax_battery.coordinator import SAXBatteryCoordinator
+from custom_components.sax_battery.hub import SAXBatteryHub, create_hub
+from custom_components.sax_battery.pilot import SAXBatteryPilot
+
+from .sax_simulator import REG_SETPOINT, SimulatorFaults, simulator_config
+
+POWER_SENSOR = "sensor.grid_power"
+PF_SENSOR = "sensor.grid_power_factor"
+
+
+def _summary(samples: list[float]) -> dict[str, Any]:
+    """Return summary statistics of timing samples."""
+    return {
+        "samples": len(samples),
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "max": max(samples),
+    }
+
+
+def _battery_configs(simulators) -> list[dict[str, Any]]:
+    """Return hub battery configs for any number of simulators."""
+    return [
+        {"battery_id": f"battery_{index}", "host": sim.host, "port": sim.port}
+        for index, sim in enumerate(simulators)
+    ]
+
+
+@pytest.fixture(name="bench_simulators")
+def bench_simulators_fixture(sax_simulators, pytestconfig):
+    """Return a simulator factory using the benchmark link latency."""
+    faults = SimulatorFaults(latency=pytestconfig.getoption("--sax-benchmark-latency"))
+    return partial(sax_simulators, faults=faults)
+
+
+@pytest.mark.parametrize("battery_count", [1, 3, None], ids=["1", "3", "N"])
+async def test_read_cycle(
+    hass, bench_simulators, pytestconfig, benchmark_results, battery_count
+):
+    """Benchmark a full SAXBatteryHub.read_data cycle."""
+    if battery_count is None:
+        battery_count = pytestconfig.getoption("--sax-benchmark-batteries")
+    cycles = pytestconfig.getoption("--sax-benchmark-cycles")
+    simulators = await bench_simulators(battery_count)
+    hub = SAXBatteryHub(hass, _battery_configs(simulators))
+
+    durations = []
+    try:
+        await hub.read_data()  # Connect and warm up
+        for simulator in simulators:
+            simulator.reset_counters()
+        for _ in range(cycles):
+            started = time.perf_counter()
+            data = await hub.read_data()
+            durations.append(time.perf_counter() - started)
+    finally:
+        await hub.disconnect()
+
+    assert data["soc"] == 50.0
+    for battery_id in hub.batteries:
+        assert data[f"{battery_id}_temp"] == 25
+
+    transactions = [simulator.transactions / cycles for simulator in simulators]
+    benchmark_results[f"read_cycle_{battery_count}_batteries"] = {
+        "batteries": battery_count,
+        "wall_time": _summary(durations),
+        "transactions_per_cycle": sum(transactions),
+        "transactions_per_battery_cycle": max(transactions),
+        "values_per_cycle": len(data),
+    }
+
+
+async def test_pilot_control_latency(hass, bench_simulators, benchmark_results):
+    """Benchmark the delay from a power sensor change to the setpoint write."""
+    simulators = await bench_simulators(1)
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            **simulator_config(simulators),
+            CONF_PILOT_FROM_HA: True,
+            CONF_POWER_SENSOR: POWER_SENSOR,
+            CONF_PF_SENSOR: PF_SENSOR,
+            CONF_MIN_SOC: 10,
+        },
+    )
+    hub = await create_hub(hass, dict(entry.data))
+    try:
+        coordinator = SAXBatteryCoordinator(hass, hub, 60, entry)
+        await coordinator.async_refresh()
+        pilot = SAXBatteryPilot(hass, coordinator)
+        hass.states.async_set(PF_SENSOR, "1.0")
+        simulators[0].reset_counters()
+
+        started = time.monotonic()
+        hass.states.async_set(POWER_SENSOR, "1500")
+        await pilot._async_update_pilot()
+        blocked = time.monotonic() - started
+        # Fast writes return before the battery has processed the request
+        async with asyncio.timeout(5):
+            while not simulators[0].writes:
+                await asyncio.sleep(0.01)
+    finally:
+        await hub.disconnect()
+
+    assert simulators[0].writes == [(REG_SETPOINT, [(65536 - 1500) & 0xFFFF, 10])]
+    assert simulators[0].last_write_at is not None
+    latency = simulators[0].last_write_at - started
+    benchmark_results["pilot_control_latency"] = {
+        "processing": latency,
+        "pilot_blocked": blocked,
+        "pilot_interval": pilot.update_interval,
+        # The pilot only reacts on its interval timer
+        "worst_case": pilot.update_interval + latency,
+    }
+
+
+@pytest.mark.parametrize("battery_count", [1, 3])
+async def test_cold_start(hass, bench_simulators, benchmark_results, battery_count):
+    """Benchmark create_hub plus the first coordinator refresh."""
+    simulators = await bench_simulators(battery_count)
+    entry = MockConfigEntry(domain=DOMAIN, data=simulator_config(simulators))
+
+    started = time.perf_counter()
+    hub = await create_hub(hass, dict(entry.data))
+    try:
+        hub_created = time.perf_counter()
+        coordinator = SAXBatteryCoordinator(hass, hub, 60, entry)
+        await coordinator.async_refresh()
+        refreshed = time.perf_counter()
+    finally:
+        await hub.disconnect()
+
+    assert coordinator.last_update_success
+    assert coordinator.data["combined_soc"] == 50.0
+    benchmark_results[f"cold_start_{battery_count}_batteries"] = {
+        "batteries": battery_count,
+        "create_hub": hub_created - started,
+        "first_refresh": refreshed - hub_created,
+        "total": refreshed - started,
+        "transactions": sum(simulator.transactions for simulator in simulators),
+    }
@@ -0,0 +1,72 @@
+"""Tests for the per-battery circuit breaker."""
+
+import random
+
+import pytest
+
+from custom_components.sax_battery.circuit_breaker import BreakerState, CircuitBreaker
+
+
+@pytest.fixture(name="now")
+def now_fixture() -> list[float]:
+    """Return a mutable fake clock value."""
+    return [0.0]
+
+
+@pytest.fixture(name="breaker")
+def breaker_fixture(now: list[float]) -> CircuitBreaker:
+    """Return a breaker on the fake clock."""
+    return CircuitBreaker(
+        failure_threshold=3,
+        initial_backoff=30.0,
+        max_backoff=100.0,
+        clock=lambda: now[0],
+        rng=random.Random(1),
+    )
+
+
+def test_opens_after_consecutive_failures(breaker):
+    """Test only consecutive failures open the breaker."""
+    assert not breaker.record_failure()
+    breaker.record_success()
+    assert not breaker.record_failure()
+    assert not breaker.record_failure()
+    assert breaker.closed
+
+    assert breaker.record_failure()
+    assert breaker.state is BreakerState.OPEN
+    assert not breaker.allow_request()
+
+
+def test_single_probe_after_backoff(breaker, now):
+    """Test one probe is allowed once the jittered backoff has passed."""
+    for _ in range(3):
+        breaker.record_failure()
+    assert 15.0 <= breaker.probe_at <= 30.0
+
+    now[0] = breaker.probe_at
+    assert breaker.allow_request()
+    assert breaker.state is BreakerState.HALF_OPEN
+    assert not breaker.allow_request()
+
+    breaker.record_success()
+    assert breaker.closed
+    assert breaker.allow_request()
+
+
+def test_failed_probe_doubles_backoff_up_to_maximum(breaker, now):
+    """Test each failed probe reopens the breaker with a longer backoff."""
+    for _ in range(3):
+        breaker.record_failure()
+
+    backoffs = []
+    for _ in range(4):
+        now[0] = breaker.probe_at
+        assert breaker.allow_request()
+        assert breaker.record_failure()
+        backoffs.append(breaker.probe_at - now[0])
+
+    assert 30.0 <= backoffs[0] <= 60.0
+    assert 50.0 <= backoffs[1] <= 100.0
+    assert 50.0 <= backoffs[3] <= 100.0
+    assert breaker.as_dict()["trips"] == 5
@@ -1,10 +1,13 @@
 """Tests for the SAX Battery config flow."""
 
+import json
+from pathlib import Path
 from unittest.mock import patch
 
 import pytest
 import voluptuous as vol
 
+from custom_components.sax_battery import config_flow as config_flow_module
 from custom_components.sax_battery.config_flow import SAXBatteryConfigFlow
 
 # filepath: custom_components/sax_battery/test_config_flow.py
@@ -23,6 +26,7 @@ from custom_components.sax_battery.const import (
     DEFAULT_AUTO_PILOT_INTERVAL,
     DEFAULT_MIN_SOC,
     DEFAULT_PORT,
+    MAX_BATTERY_COUNT,
 )
 
 
@@ -364,6 +368,21 @@ class TestBatteryConfigFlow:
         assert result["title"] == "SAX Battery"
         assert result["data"][CONF_MASTER_BATTERY] == "battery_a"
 
+    async def test_battery_config_fields_are_labelled(self, hass, config_flow):
+        """Test every field of the largest battery setup has a label."""
+        config_flow._battery_count = MAX_BATTERY_COUNT
+        result = await config_flow.async_step_battery_config()
+
+        translations = json.loads(
+            (
+                Path(config_flow_module.__file__).parent / "translations" / "en.json"
+            ).read_text(encoding="utf-8")
+        )
+        labels = translations["config"]["step"]["battery_config"]["data"]
+        fields = {str(key) for key in result["data_schema"].schema}
+        assert len(fields) == 3 * MAX_BATTERY_COUNT + 1
+        assert fields <= labels.keys()
+
     async def test_battery_config_none_battery_count(self, hass, config_flow):
         """Test battery configuration with None battery count."""
         config_flow._battery_count = None
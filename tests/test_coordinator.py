@@ -0,0 +1,237 @@
+"""Tests for the SAX Battery coordinator."""
+
+import asyncio
+from datetime import timedelta
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.sax_battery.const import (
+    CONF_DEVICE_ID,
+    CONF_MAX_DATA_AGE,
+    DOMAIN,
+    SAX_COMBINED_SOC,
+)
+from custom_components.sax_battery.coordinator import SAXBatteryCoordinator
+from custom_components.sax_battery.hub import SAXBatteryHub
+from homeassistant.helpers.update_coordinator import REQUEST_REFRESH_DEFAULT_COOLDOWN
+from homeassistant.util import dt as dt_util
+
+
+@pytest.fixture(name="coordinator")
+def coordinator_fixture(hass):
+    """Create a coordinator for two batteries with a 100 s max data age."""
+    hub = SAXBatteryHub(
+        hass,
+        [
+            {"battery_id": "battery_a", "host": "192.168.1.10", "port": 502},
+            {"battery_id": "battery_b", "host": "192.168.1.11", "port": 502},
+        ],
+    )
+    hub.read_data = AsyncMock()
+    entry = MockConfigEntry(
+        domain=DOMAIN, data={CONF_DEVICE_ID: "device", CONF_MAX_DATA_AGE: 100}
+    )
+    return SAXBatteryCoordinator(hass, hub, 60, entry)
+
+
+async def test_failed_values_are_served_stale_until_max_age(coordinator):
+    """Test the last good value is kept, marked stale, until it expires."""
+    hub = coordinator.hub
+    with patch("custom_components.sax_battery.coordinator.time") as mock_time:
+        monotonic = mock_time.monotonic
+        monotonic.return_value = 1000.0
+        hub.read_data.return_value = {"battery_a_soc": 60, "battery_b_soc": 40}
+        coordinator.data = await coordinator._async_update_data()
+        assert coordinator.data["combined_soc"] == 50.0
+        assert coordinator.combined_data[SAX_COMBINED_SOC] == 50.0
+
+        monotonic.return_value = 1050.0
+        hub.read_data.return_value = {"battery_a_soc": 70, "battery_b_soc": None}
+        coordinator.data = await coordinator._async_update_data()
+        assert coordinator.data["battery_b_soc"] == 40
+        assert coordinator.freshness_attributes("battery_a_soc") == {
+            "data_age": 0,
+            "data_quality": "good",
+        }
+        assert coordinator.freshness_attributes("combined_soc") == {
+            "data_age": 50,
+            "data_quality": "stale",
+        }
+
+        monotonic.return_value = 1101.0
+        coordinator.data = await coordinator._async_update_data()
+        assert coordinator.data["battery_b_soc"] is None
+        assert coordinator.value_age("battery_b_soc") is None
+        assert coordinator.data["combined_soc"] == 70.0
+        assert coordinator.freshness_attributes("combined_soc") == {
+            "data_age": 0,
+            "data_quality": "good",
+        }
+
+
+async def test_timed_out_cycle_keeps_previous_values(coordinator):
+    """Test a timed out read cycle serves the previous values as stale."""
+    coordinator.hub.read_data.return_value = {"battery_a_power": 500}
+    coordinator.data = await coordinator._async_update_data()
+
+    coordinator.hub.read_data.side_effect = TimeoutError
+    data = await coordinator._async_update_data()
+
+    assert data["battery_a_power"] == 500
+    assert data["combined_power"] == 500
+    assert coordinator.quality["combined_power"] == "stale"
+
+
+async def test_history_keeps_good_values(coordinator):
+    """Test only freshly read numeric values are added to the history."""
+    hub = coordinator.hub
+    with patch("custom_components.sax_battery.coordinator.time") as mock_time:
+        for now, power in ((0.0, 100), (60.0, None), (120.0, 300)):
+            mock_time.monotonic.return_value = now
+            hub.read_data.return_value = {"battery_a_power": power, "name": "SAX"}
+            coordinator.data = await coordinator._async_update_data()
+
+    series = coordinator.history["battery_a_power"]
+    assert series.samples() == [(0.0, 100.0), (120.0, 300.0)]
+    assert series.rate_of_change() == pytest.approx(200 / 120)
+    assert coordinator.history["combined_power"].mean() == 200.0
+    assert "name" not in coordinator.history
+    assert coordinator.history["battery_a_power"].capacity == 60
+
+
+async def test_concurrent_updates_share_one_read(coordinator):
+    """Test concurrent updates wait for the same hub read."""
+    release = asyncio.Event()
+
+    async def _read_data() -> dict[str, int]:
+        await release.wait()
+        return {"battery_a_soc": 55}
+
+    coordinator.hub.read_data.side_effect = _read_data
+    updates = [asyncio.create_task(coordinator._async_update_data()) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*updates)
+
+    assert coordinator.hub.read_data.await_count == 1
+    assert results[0] is results[1] is results[2]
+    assert results[0]["battery_a_soc"] == 55
+    assert results[0]["battery_a_stored_energy"] is None
+
+
+async def test_refresh_requests_are_debounced(hass, coordinator):
+    """Test a burst of refresh requests runs one cycle now and one follow-up."""
+    coordinator.hub.read_data.return_value = {"battery_a_soc": 55}
+
+    for _ in range(3):
+        await coordinator.async_request_refresh()
+    assert coordinator.hub.read_data.await_count == 1
+
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=REQUEST_REFRESH_DEFAULT_COOLDOWN + 1)
+    )
+    await hass.async_block_till_done()
+    assert coordinator.hub.read_data.await_count == 2
+
+
+async def test_misaligned_samples_are_not_combined(coordinator):
+    """Test combined values wait for samples taken within the skew window."""
+    hub = coordinator.hub
+    hub.synchronized_sampling = True
+    coordinator.sample_skew = 0.5
+    with patch("custom_components.sax_battery.coordinator.time") as mock_time:
+        mock_time.monotonic.return_value = 1000.0
+        hub.read_data.return_value = {"battery_a_soc": 60, "battery_b_soc": 40}
+        hub.sample_times = {"battery_a_soc": 999.8, "battery_b_soc": 999.9}
+        coordinator.data = await coordinator._async_update_data()
+        assert coordinator.data["combined_soc"] == 50.0
+        assert coordinator.value_age("battery_a_soc") == pytest.approx(0.2)
+
+        mock_time.monotonic.return_value = 1010.0
+        hub.read_data.return_value = {"battery_a_soc": 80, "battery_b_soc": 40}
+        hub.sample_times = {"battery_a_soc": 1009.9, "battery_b_soc": 1008.0}
+        coordinator.data = await coordinator._async_update_data()
+        assert coordinator.data["battery_a_soc"] == 80
+        assert coordinator.data["combined_soc"] == 50.0
+        assert coordinator.quality["combined_soc"] == "stale"
+
+        hub.sample_times = {"battery_a_soc": 1009.9}
+        coordinator.data = await coordinator._async_update_data()
+        assert coordinator.quality["combined_soc"] == "stale"
+
+
+async def test_subscriptions_limit_the_read_registers(coordinator):
+    """Test only registers behind subscribed keys are demanded from the hub."""
+    hub = coordinator.hub
+    hub.read_data.return_value = {}
+    await coordinator._async_update_data()
+    assert hub.batteries["battery_a"].demand is None
+
+    unsubscribe_combined = coordinator.async_subscribe(["combined_power"])
+    coordinator.async_subscribe(["battery_a_time_to_empty"], max_age=300)
+    coordinator.async_subscribe(["battery_b_temp"], max_age=30)
+    await coordinator._async_update_data()
+    # Read again once older than max_age minus the 60 s scan interval
+    assert hub.batteries["battery_a"].demand == {
+        "power": 0.0,
+        "soc": 240.0,
+        "capacity": 240.0,
+    }
+    assert hub.batteries["battery_b"].demand == {"power": 0.0, "temp": 0.0}
+
+    unsubscribe_combined()
+    await coordinator._async_update_data()
+    assert hub.batteries["battery_a"].demand["power"] == 240.0
+    assert "power" not in hub.batteries["battery_b"].demand
+
+
+async def test_registers_read_with_a_write_update_the_data(coordinator):
+    """Test registers returned by a write refresh values and combined values."""
+    coordinator.hub.read_data.return_value = {
+        "battery_a_soc": 60,
+        "battery_a_power": 100,
+    }
+    coordinator.data = await coordinator._async_update_data()
+
+    # Status, SOC, power and smart meter with the register offset of 16384
+    coordinator.async_set_registers("battery_a", 64, 45, [3, 72, 16884, 16184])
+
+    assert coordinator.data["battery_a_soc"] == 72
+    assert coordinator.data["soc"] == 72
+    assert coordinator.data["battery_a_smartmeter"] == -200
+    assert coordinator.data["combined_power"] == 500
+    assert coordinator.quality["combined_power"] == "good"
+
+
+async def test_values_set_outside_a_cycle_notify_listeners(coordinator):
+    """Test values set by a watcher are fresh and reach the listeners."""
+    coordinator.hub.read_data.return_value = {"battery_b_status": 1}
+    coordinator.data = await coordinator._async_update_data()
+    listener = Mock()
+    coordinator.async_add_listener(listener)
+
+    coordinator.async_set_values({"battery_b_status": 3})
+
+    assert coordinator.data["battery_b_status"] == 3
+    assert coordinator.quality["battery_b_status"] == "good"
+    assert coordinator.value_age("battery_b_status") < 1
+    listener.assert_called_once()
+
+
+def test_derived_metrics_skip_system_registers_of_slaves(coordinator):
+    """Test no metric of a slave uses a register only the master reads."""
+    slave = coordinator.batteries["battery_b"]
+    registers = [
+        key for key, config in slave._register_map.items() if config.get("system")
+    ]
+    assert registers
+    assert slave.read_plan.keys().isdisjoint(registers)
+    system = {slave.data_keys[key] for key in registers}
+    for metric in coordinator.derived.metrics.values():
+        assert system.isdisjoint(metric.inputs), metric.key
+    assert "battery_b_stored_energy" in coordinator.derived.metrics
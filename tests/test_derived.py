@@ -0,0 +1,105 @@
+"""Tests for the derived metrics engine."""
+
+from graphlib import CycleError
+
+import pytest
+
+from custom_components.sax_battery.derived import (
+    DerivedMetric,
+    DerivedMetricsEngine,
+    default_metrics,
+)
+
+
+def test_dependency_order_and_incremental_evaluation():
+    """Test metrics see their dependencies and only rerun on changed inputs."""
+    engine = DerivedMetricsEngine(
+        [
+            DerivedMetric("doubled_sum", ("sum",), lambda total: 2 * total, "Doubled"),
+            DerivedMetric("sum", ("a", "b"), lambda a, b: a + b, "Sum"),
+            DerivedMetric("a_squared", ("a",), lambda a: a * a, "Square"),
+        ]
+    )
+
+    assert engine.evaluate({"a": 1, "b": 2}) == {
+        "sum": 3,
+        "doubled_sum": 6,
+        "a_squared": 1,
+    }
+    assert engine.evaluations == 3
+
+    assert engine.evaluate({"a": 1, "b": 5})["doubled_sum"] == 12
+    assert engine.evaluations == 5
+
+    assert engine.evaluate({"a": 1})["doubled_sum"] is None
+    assert engine.evaluations == 5
+
+
+def test_cyclic_metrics_are_rejected():
+    """Test metrics depending on each other cannot be evaluated."""
+    with pytest.raises(CycleError):
+        DerivedMetricsEngine(
+            [
+                DerivedMetric("x", ("y",), float, "X"),
+                DerivedMetric("y", ("x",), float, "Y"),
+            ]
+        )
+
+
+def test_default_metrics():
+    """Test the battery and system metrics on a charging battery."""
+    engine = DerivedMetricsEngine(default_metrics(["battery_a"], "battery_a"))
+
+    values = engine.evaluate(
+        {
+            "battery_a_capacity": 11520.0,
+            "battery_a_soc": 50.0,
+            "battery_a_power": -2880.0,
+            "battery_a_energy_produced": 900.0,
+            "battery_a_energy_consumed": 1000.0,
+            "battery_a_current_l1": 4.0,
+            "battery_a_current_l2": 5.0,
+            "battery_a_current_l3": 6.0,
+            "battery_a_smartmeter": 3380,
+            "combined_power": -2880.0,
+        }
+    )
+
+    assert values["battery_a_stored_energy"] == 5760
+    assert values["battery_a_time_to_full"] == 2.0
+    assert values["battery_a_time_to_empty"] is None
+    assert values["battery_a_round_trip_efficiency"] == 90.0
+    assert values["battery_a_phase_imbalance"] == 40.0
+    assert values["combined_stored_energy"] == 5760
+    assert values["net_household_load"] == 500
+
+
+def test_default_metrics_of_slave_batteries():
+    """Test slave batteries only get metrics of the registers they read."""
+    metrics = default_metrics(
+        ["battery_a", "battery_b"], "battery_a", ["battery_b_smartmeter"]
+    )
+    keys = {metric.key for metric in metrics}
+    assert "battery_b_time_to_full" in keys
+    assert "net_household_load" in keys
+
+    values = DerivedMetricsEngine(metrics).evaluate(
+        {
+            "battery_a_soc": 50.0,
+            "battery_a_capacity": 5000,
+            "battery_b_soc": 20.0,
+            "battery_b_capacity": 5000,
+        }
+    )
+    assert values["combined_stored_energy"] == 3500
+
+    keys = {
+        metric.key
+        for metric in default_metrics(
+            ["battery_a", "battery_b"], "battery_a", ["battery_b_soc"]
+        )
+    }
+    assert "battery_b_stored_energy" not in keys
+    assert "battery_b_time_to_full" not in keys
+    assert "battery_b_round_trip_efficiency" in keys
+    assert "combined_stored_energy" not in keys
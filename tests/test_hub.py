@@ -0,0 +1,198 @@
+"""Tests for the SAX Battery hub."""
+
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from custom_components.sax_battery.frame_recorder import (
+    read_frames_jsonl,
+    write_frames_jsonl,
+)
+from custom_components.sax_battery.hub import (
+    MIN_READ_TIMEOUT,
+    READ_TIMEOUT,
+    BatteryDataKey,
+    HubConnectionError,
+    ReadBudget,
+    SAXBatteryHub,
+    battery_id_for_index,
+)
+
+
+@pytest.fixture(name="hub")
+def hub_fixture(hass):
+    """Create a hub with a single battery."""
+    return SAXBatteryHub(
+        hass, [{"battery_id": "battery_a", "host": "192.168.1.10", "port": 502}]
+    )
+
+
+class TestBatteryIdentity:
+    """Test structured battery identities."""
+
+    @pytest.mark.parametrize(
+        ("index", "battery_id"),
+        [(0, "battery_a"), (2, "battery_c"), (25, "battery_z"), (26, "battery_aa")],
+    )
+    def test_battery_id_for_index(self, index, battery_id):
+        """Test IDs stay stable for the first batteries and extend past z."""
+        assert battery_id_for_index(index) == battery_id
+
+    def test_data_keys_carry_battery_and_register(self, hass):
+        """Test every flattened data key maps back to its battery and register."""
+        configs = [
+            {"battery_id": battery_id_for_index(i), "host": "10.0.0.1", "port": 502 + i}
+            for i in range(30)
+        ]
+        hub = SAXBatteryHub(hass, configs)
+
+        assert hub.data_keys["battery_ad_soc"] == BatteryDataKey(
+            29, "battery_ad", "soc"
+        )
+        assert hub.batteries["battery_ad"].index == 29
+        assert len(hub.data_keys) == 30 * len(hub.batteries["battery_a"].data_keys)
+
+
+class TestReadBudget:
+    """Test the per-cycle read deadline."""
+
+    def test_attempts_share_the_remaining_time(self):
+        """Test each outstanding block gets an equal share within bounds."""
+        now = time.monotonic()
+        assert ReadBudget(now + 10.0, 4).attempt_timeout() == pytest.approx(
+            2.5, abs=0.01
+        )
+        assert ReadBudget(now + 10.0, 100).attempt_timeout() == MIN_READ_TIMEOUT
+        assert ReadBudget(now + 100.0, 1).attempt_timeout() == READ_TIMEOUT
+        assert ReadBudget(now - 1.0, 1).attempt_timeout() == 0.0
+
+    def test_retries_keep_a_reserve_for_outstanding_blocks(self):
+        """Test retries are refused once they would starve other blocks."""
+        budget = ReadBudget(time.monotonic() + 10.0, 4)
+        assert budget.allows_retry(1.0)
+        assert not budget.allows_retry(8.5)
+
+        budget.outstanding = 20
+        assert not budget.allows_retry(1.0)
+
+
+class TestStatusWatcher:
+    """Test the targeted status register watcher."""
+
+    async def test_returns_as_soon_as_expected_value_is_read(self, hass, hub):
+        """Test the watcher stops polling once the transition is seen."""
+        read = AsyncMock(side_effect=[[1], [1], [3]])
+        with (
+            patch.object(hub, "modbus_read_holding_registers", read),
+            patch("custom_components.sax_battery.hub.asyncio.sleep", AsyncMock()),
+        ):
+            result = await hub.wait_for_register_value("battery_a", 45, 3)
+
+        assert result == 3
+        assert read.await_count == 3
+        for call in read.await_args_list:
+            assert call.kwargs == {
+                "address": 45,
+                "count": 1,
+                "slave": 64,
+                "battery_id": "battery_a",
+            }
+
+    async def test_backs_off_between_polls(self, hass, hub):
+        """Test the poll interval grows and is capped."""
+        read = AsyncMock(side_effect=[[1]] * 8 + [[3]])
+        sleep = AsyncMock()
+        with (
+            patch.object(hub, "modbus_read_holding_registers", read),
+            patch("custom_components.sax_battery.hub.asyncio.sleep", sleep),
+        ):
+            await hub.wait_for_register_value("battery_a", 45, 3, timeout=3600)
+
+        delays = [call.args[0] for call in sleep.await_args_list]
+        assert delays == sorted(delays)
+        assert delays[0] < delays[-1] <= 15.0
+
+    async def test_read_errors_do_not_abort_watch(self, hass, hub):
+        """Test a failing read is retried on the next poll."""
+        read = AsyncMock(side_effect=[HubConnectionError("boom"), [3]])
+        with (
+            patch.object(hub, "modbus_read_holding_registers", read),
+            patch("custom_components.sax_battery.hub.asyncio.sleep", AsyncMock()),
+        ):
+            result = await hub.wait_for_register_value("battery_a", 45, 3)
+
+        assert result == 3
+
+    async def test_timeout_returns_last_value(self, hass, hub):
+        """Test the last seen value is returned when the deadline passes."""
+        read = AsyncMock(return_value=[1])
+        with patch.object(hub, "modbus_read_holding_registers", read):
+            result = await hub.wait_for_register_value("battery_a", 45, 3, timeout=0)
+
+        assert result == 1
+        assert read.await_count == 1
+
+
+class TestFrameRecorder:
+    """Test Modbus frame capture in the hub."""
+
+    REQUEST = bytes.fromhex("0007000000064003002e0001")
+    RESPONSE = bytes.fromhex("0007000000054003020037")
+
+    async def test_frames_are_not_recorded_by_default(self, hass, hub):
+        """Test the recorder is opt-in."""
+        hub._trace_packet("battery_a", True, self.REQUEST)
+        hub._trace_packet("battery_a", False, self.RESPONSE)
+        assert len(hub.frame_recorder) == 0
+
+    async def test_exchange_is_recorded_as_sent(self, hass, hub):
+        """Test the frames on the wire are captured and matched by transaction."""
+        hub.frame_recorder.start()
+        hub._trace_packet("battery_a", True, self.REQUEST)
+        hub._trace_packet("battery_a", False, self.RESPONSE[:5])
+        hub._trace_packet("battery_a", False, self.RESPONSE[5:])
+
+        (frame,) = hub.frame_recorder.snapshot()
+        assert frame.battery_id == "battery_a"
+        assert frame.slave == 64
+        assert frame.function_code == 3
+        assert (frame.address, frame.count) == (46, 1)
+        assert frame.transaction_id == 7
+        assert frame.request == self.REQUEST
+        assert frame.response == self.RESPONSE
+        assert frame.latency is not None
+        assert frame.error is None
+
+    async def test_misbehaving_traffic_is_kept(self, hass, hub):
+        """Test exception, stray, malformed and missing responses are captured."""
+        hub.frame_recorder.start()
+        exception = bytes.fromhex("000800000003408302")
+        stray = bytes.fromhex("0009000000054003020001")
+        hub._trace_packet("battery_a", True, self.REQUEST)
+        hub._trace_packet("battery_a", True, bytes.fromhex("0008000000064003002e0001"))
+        hub._trace_packet("battery_a", False, exception + stray + b"\xff" * 8)
+
+        frames = hub.frame_recorder.snapshot()
+        assert [frame.error for frame in frames] == [
+            "exception response 2",
+            "stray response",
+            "malformed",
+            "no response",
+        ]
+        assert frames[0].response == exception
+        assert frames[0].function_code == 3
+        assert frames[1].response == stray
+        assert frames[2].response == b"\xff" * 8
+        assert frames[3].request == self.REQUEST
+
+    async def test_dump_round_trip(self, hass, hub, tmp_path):
+        """Test captured frames survive a JSONL round trip."""
+        hub.frame_recorder.start()
+        hub._trace_packet("battery_a", True, self.REQUEST)
+        hub._trace_packet("battery_a", False, self.RESPONSE)
+        frames = hub.frame_recorder.snapshot()
+
+        path = tmp_path / "frames.jsonl"
+        assert write_frames_jsonl(path, frames) == 1
+        assert read_frames_jsonl(path) == frames
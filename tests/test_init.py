@@ -0,0 +1,130 @@
+"""Tests for the SAX Battery integration setup helpers."""
+
+import logging
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.sax_battery import (
+    async_migrate_entry,
+    remove_pymodbus_logging,
+    setup_pymodbus_logging,
+)
+from custom_components.sax_battery.const import CONF_DEVICE_ID, DOMAIN
+from custom_components.sax_battery.scheduler import DATA_SCHEDULER
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.helpers import entity_registry as er
+
+from .sax_simulator import simulator_config
+
+
+def test_pymodbus_logging_suppression_is_scoped_and_reference_counted():
+    """Test suppression only touches pymodbus loggers and is undone on unload."""
+    pymodbus_logger = logging.getLogger("pymodbus")
+    client_logger = logging.getLogger("pymodbus.client")
+    root_filters = list(logging.getLogger().filters)
+    pymodbus_logger.setLevel(logging.WARNING)
+
+    setup_pymodbus_logging("entry_1")
+    setup_pymodbus_logging("entry_2")
+    setup_pymodbus_logging("entry_2")
+
+    assert logging.getLogger().filters == root_filters
+    assert not pymodbus_logger.isEnabledFor(logging.CRITICAL)
+    assert client_logger.disabled
+
+    remove_pymodbus_logging("entry_1")
+    assert not pymodbus_logger.isEnabledFor(logging.CRITICAL)
+
+    remove_pymodbus_logging("entry_2")
+    assert pymodbus_logger.level == logging.WARNING
+    assert not client_logger.disabled
+
+    # Unknown or repeated removals are ignored
+    remove_pymodbus_logging("entry_2")
+    assert pymodbus_logger.level == logging.WARNING
+
+
+async def test_unique_ids_are_scoped_to_the_entry(
+    hass, enable_custom_integrations, sax_simulators
+):
+    """Test two config entries set up side by side without ID collisions."""
+    simulators = await sax_simulators(2)
+    entries = [
+        MockConfigEntry(
+            domain=DOMAIN,
+            data={**simulator_config([simulator]), CONF_DEVICE_ID: f"device_{index}"},
+            version=1,
+            minor_version=2,
+        )
+        for index, simulator in enumerate(simulators)
+    ]
+    for entry in entries:
+        entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    registry = er.async_get(hass)
+    for entry in entries:
+        assert entry.state is ConfigEntryState.LOADED
+        assert registry.async_get_entity_id(
+            "sensor", DOMAIN, f"{DOMAIN}_{entry.entry_id}_combined_soc"
+        )
+    assert DATA_SCHEDULER in hass.data
+    assert hass.data[DATA_SCHEDULER].entries == 2
+
+    for entry in entries:
+        assert await hass.config_entries.async_unload(entry.entry_id)
+    assert DATA_SCHEDULER not in hass.data
+
+
+async def test_migrate_global_unique_ids(hass):
+    """Test global unique IDs of an old entry are scoped to that entry."""
+    entry = MockConfigEntry(
+        domain=DOMAIN, data={CONF_DEVICE_ID: "device"}, version=1, minor_version=1
+    )
+    entry.add_to_hass(hass)
+    registry = er.async_get(hass)
+    soc = registry.async_get_or_create(
+        "sensor", DOMAIN, f"{DOMAIN}_combined_soc", config_entry=entry
+    )
+    pilot_power = registry.async_get_or_create(
+        "number", DOMAIN, f"{DOMAIN}_pilot_power_device", config_entry=entry
+    )
+
+    assert await async_migrate_entry(hass, entry)
+
+    assert entry.minor_version == 2
+    assert (
+        registry.async_get(soc.entity_id).unique_id
+        == f"{DOMAIN}_{entry.entry_id}_combined_soc"
+    )
+    assert (
+        registry.async_get(pilot_power.entity_id).unique_id
+        == f"{DOMAIN}_pilot_power_device"
+    )
+
+
+async def test_sensors_of_unread_registers_are_removed(
+    hass, enable_custom_integrations, sax_simulators
+):
+    """Test sensors of system registers a slave battery does not read are removed."""
+    simulators = await sax_simulators(2)
+    entry = MockConfigEntry(
+        domain=DOMAIN, data=simulator_config(simulators), version=1, minor_version=2
+    )
+    entry.add_to_hass(hass)
+    registry = er.async_get(hass)
+    prefix = f"{DOMAIN}_{entry.entry_id}"
+    smartmeter = registry.async_get_or_create(
+        "sensor", DOMAIN, f"{prefix}_battery_b_smartmeter", config_entry=entry
+    )
+    soc = registry.async_get_or_create(
+        "sensor", DOMAIN, f"{prefix}_battery_b_soc", config_entry=entry
+    )
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert registry.async_get(smartmeter.entity_id) is None
+    assert registry.async_get(soc.entity_id) is not None
+    assert await hass.config_entries.async_unload(entry.entry_id)
@@ -0,0 +1,58 @@
+"""Tests for the SAX Battery hub metrics."""
+
+from unittest.mock import patch
+
+from custom_components.sax_battery.metrics import HubMetrics
+
+
+def test_cycle_percentiles():
+    """Test percentiles over recent cycle durations."""
+    metrics = HubMetrics(["battery_a"])
+    assert metrics.cycle_percentile(50) is None
+
+    for duration in range(1, 101):
+        metrics.record_cycle(float(duration), timed_out=duration == 100)
+
+    assert metrics.cycle_percentile(50) == 50.0
+    assert metrics.cycle_percentile(95) == 95.0
+    assert metrics.cycles == 100
+    assert metrics.cycle_timeouts == 1
+
+
+def test_battery_counters_and_histograms():
+    """Test per-battery counters and per-block latency histograms."""
+    metrics = HubMetrics(["battery_a"])
+    metrics.record_read("battery_a", 64, 46, 1, 0.04)
+    metrics.record_read("battery_a", 64, 46, 1, 0.06)
+    metrics.record_read("battery_a", 40, 40115, 1, 9.0)
+    metrics.record_retry("battery_a")
+    metrics.record_error("battery_a")
+
+    assert metrics.error_rate("battery_a") == 25.0
+
+    result = metrics.as_dict()["batteries"]["battery_a"]
+    assert result["reads"] == 3
+    assert result["retries"] == 1
+    soc_block = result["blocks"]["64:46+1"]
+    assert soc_block["count"] == 2
+    assert soc_block["buckets"]["le_0.05"] == 1
+    assert soc_block["buckets"]["le_0.1"] == 1
+    assert result["blocks"]["40:40115+1"]["buckets"]["le_15.0"] == 1
+
+
+def test_reconnects_per_hour_window():
+    """Test reconnects older than one hour are not counted."""
+    metrics = HubMetrics(["battery_a"])
+    with patch(
+        "custom_components.sax_battery.metrics.time.monotonic", return_value=0.0
+    ):
+        metrics.record_reconnect("battery_a")
+    with patch(
+        "custom_components.sax_battery.metrics.time.monotonic", return_value=3000.0
+    ):
+        metrics.record_reconnect("battery_a")
+        assert metrics.reconnects_per_hour("battery_a") == 2
+    with patch(
+        "custom_components.sax_battery.metrics.time.monotonic", return_value=4000.0
+    ):
+        assert metrics.reconnects_per_hour("battery_a") == 1
@@ -0,0 +1,146 @@
+"""Tests for the built-in Modbus TCP client."""
+
+import asyncio
+import struct
+from unittest.mock import MagicMock
+
+from pymodbus.exceptions import ConnectionException, ModbusIOException
+import pytest
+
+from custom_components.sax_battery.const import TRANSPORT_NATIVE
+from custom_components.sax_battery.hub import SAXBatteryHub
+from custom_components.sax_battery.modbus_tcp import (
+    MBAP_HEADER,
+    ModbusTcpProtocol,
+    NativeModbusTcpClient,
+)
+
+from .sax_simulator import REG_SETPOINT, REG_SOC, SLAVE_CONTROL, SimulatorFaults
+
+
+def _frame(transaction_id: int, pdu: bytes, device_id: int = SLAVE_CONTROL) -> bytes:
+    """Return a Modbus TCP response frame."""
+    return MBAP_HEADER.pack(transaction_id, 0, len(pdu) + 1, device_id) + pdu
+
+
+@pytest.fixture(name="protocol")
+def protocol_fixture() -> ModbusTcpProtocol:
+    """Return a protocol on a fake transport."""
+    protocol = ModbusTcpProtocol()
+    protocol.connection_made(MagicMock(spec=asyncio.Transport))
+    return protocol
+
+
+async def test_protocol_resynchronises_after_stray_data(protocol):
+    """Test garbage and stray responses are skipped, split frames reassembled."""
+    future = asyncio.get_running_loop().create_future()
+    protocol.send(7, SLAVE_CONTROL, struct.pack(">BHH", 3, REG_SOC, 2), future)
+    sent = protocol.transport.write.call_args.args[0]
+    assert sent == _frame(7, bytes([3, 0, REG_SOC, 0, 2]))
+
+    response = _frame(7, bytes([3, 4, 0, 64, 0x40, 0]))
+    protocol.data_received(b"\xff\xfe" + _frame(6, bytes([3, 2, 0, 1])))
+    protocol.data_received(response[:5])
+    assert not future.done()
+    protocol.data_received(response[5:])
+
+    result = await future
+    assert result.registers == [64, 0x4000]
+    assert not result.isError()
+    assert protocol.skipped_bytes == 2
+    assert protocol.stray_frames == 1
+
+
+async def test_protocol_exception_and_lost_connection(protocol):
+    """Test exception responses and failing pending requests on disconnect."""
+    loop = asyncio.get_running_loop()
+    rejected = loop.create_future()
+    pending = loop.create_future()
+    protocol.send(1, SLAVE_CONTROL, struct.pack(">BHH", 3, 0, 1), rejected)
+    protocol.send(2, SLAVE_CONTROL, struct.pack(">BHH", 3, 0, 1), pending)
+
+    protocol.data_received(_frame(1, bytes([0x83, 2])))
+    protocol.connection_lost(None)
+
+    result = await rejected
+    assert result.isError()
+    assert result.exception_code == 2
+    with pytest.raises(ConnectionException):
+        await pending
+
+
+async def test_client_against_simulator(sax_simulators):
+    """Test function codes 3, 16 and 23 against the simulator."""
+    (simulator,) = await sax_simulators(1, soc=64.0)
+    client = NativeModbusTcpClient(simulator.host, simulator.port, timeout=2.0)
+    assert await client.connect()
+    try:
+        result = await client.read_holding_registers(
+            REG_SOC, count=1, device_id=SLAVE_CONTROL
+        )
+        assert result.registers == [64]
+
+        result = await client.write_registers(
+            REG_SETPOINT, [1500, 10], device_id=SLAVE_CONTROL
+        )
+        assert not result.isError()
+        assert simulator.model.setpoint == 1500
+
+        result = await client.readwrite_registers(
+            read_address=REG_SETPOINT,
+            read_count=2,
+            write_address=REG_SETPOINT,
+            values=[1200, 10],
+            device_id=SLAVE_CONTROL,
+        )
+        assert result.registers == [1200, 10]
+
+        result = await client.read_holding_registers(
+            1000, count=1, device_id=SLAVE_CONTROL
+        )
+        assert result.isError()
+    finally:
+        client.close()
+
+    assert not client.connected
+
+
+async def test_client_drops_mismatched_response(sax_simulators):
+    """Test a response with a foreign transaction ID times out the request."""
+    faults = SimulatorFaults(tid_mismatch_rate=1.0)
+    (simulator,) = await sax_simulators(1, faults)
+    client = NativeModbusTcpClient(simulator.host, simulator.port, timeout=0.2)
+    assert await client.connect()
+    try:
+        with pytest.raises(ModbusIOException, match="No response received"):
+            await client.read_holding_registers(
+                REG_SOC, count=1, device_id=SLAVE_CONTROL
+            )
+        assert client.protocol.stray_frames == 1
+    finally:
+        client.close()
+
+
+async def test_hub_reads_with_native_transport(hass, sax_simulators):
+    """Test a full read cycle of a battery using the built-in client."""
+    (simulator,) = await sax_simulators(1, soc=64.0, load=1200.0)
+    hub = SAXBatteryHub(
+        hass,
+        [
+            {
+                "battery_id": "battery_a",
+                "host": simulator.host,
+                "port": simulator.port,
+                "transport": TRANSPORT_NATIVE,
+            }
+        ],
+    )
+    try:
+        await hub.connect()
+        assert isinstance(hub.client, NativeModbusTcpClient)
+        data = await hub.read_data()
+    finally:
+        await hub.disconnect()
+
+    assert data["soc"] == 64.0
+    assert data["smartmeter"] == 1200
@@ -0,0 +1,97 @@
+"""Tests for the charge schedule optimizer."""
+
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+import pytest
+
+from custom_components.sax_battery.optimizer import (
+    SLOT_DURATION,
+    ChargeSchedule,
+    optimize_schedule,
+    parse_forecast,
+    slot_start,
+)
+
+START = datetime(2026, 1, 1, tzinfo=UTC)
+
+
+def _optimize(prices: list[float], net_load: list[float], **kwargs) -> ChargeSchedule:
+    """Optimize a 10 kWh battery with 2 kW limits."""
+    options = {
+        "capacity": 10000.0,
+        "soc": 50.0,
+        "min_soc": 20.0,
+        "max_charge": 2000.0,
+        "max_discharge": 2000.0,
+    } | kwargs
+    return optimize_schedule(
+        START, np.array(prices, dtype=float), np.array(net_load, dtype=float), **options
+    )
+
+
+def test_charges_cheap_and_discharges_expensive():
+    """Test energy is shifted from cheap to expensive slots within the limits."""
+    prices = [0.10] * 16 + [0.40] * 16
+    schedule = _optimize(prices, [1000.0] * 32)
+
+    assert np.all(schedule.setpoints[:16] <= 0)
+    assert schedule.setpoints[:16].min() >= -2000
+    assert np.all(schedule.setpoints[16:] > 0)
+    # Discharge covers the load, nothing is exported
+    assert schedule.setpoints[16:].max() <= 1000 + 1e-9
+    assert schedule.soc.min() >= 20.0
+    assert schedule.cost < sum(price * 0.25 for price in prices)
+
+
+def test_never_discharges_below_min_soc():
+    """Test a battery below the minimum SOC is only charged."""
+    schedule = _optimize([0.40] * 8, [3000.0] * 8, soc=10.0)
+
+    assert np.all(schedule.setpoints <= 0)
+    assert schedule.soc.min() >= 10.0
+
+
+def test_pv_surplus_is_stored_instead_of_exported():
+    """Test free PV surplus charges the battery for the expensive evening."""
+    net_load = [-1500.0] * 8 + [1500.0] * 8
+    schedule = _optimize([0.30] * 16, net_load)
+
+    # Within one step of the stored energy grid of the surplus
+    assert schedule.setpoints[:8] == pytest.approx([-1500.0] * 8, abs=250)
+    assert np.all(schedule.setpoints[8:] > 0)
+
+
+def test_schedule_lookup():
+    """Test setpoints are looked up by slot and missing outside the schedule."""
+    schedule = ChargeSchedule(START, np.array([-500.0, 800.0]), np.zeros(2), 0.0)
+
+    assert schedule.setpoint_at(START + timedelta(minutes=20)) == 800.0
+    assert schedule.setpoint_at(START - timedelta(seconds=1)) is None
+    assert schedule.setpoint_at(schedule.end) is None
+    assert slot_start(START + timedelta(minutes=44, seconds=5)) == START + 2 * (
+        SLOT_DURATION
+    )
+
+
+def test_parse_forecast_formats():
+    """Test hourly price lists and PV timestamp mappings are resampled."""
+    prices = {
+        "raw_today": [
+            {"start": START + timedelta(hours=hour), "value": 0.1 * hour}
+            for hour in range(2)
+        ],
+        "raw_tomorrow": [],
+        "currency": "EUR",
+    }
+    result = parse_forecast(prices, START + SLOT_DURATION, 10)
+    assert result[:7] == pytest.approx([0.0] * 3 + [0.1] * 4)
+    assert np.isnan(result[7:]).all()
+
+    pv = {
+        "watts": {"2026-01-01T00:00:00+00:00": 1.5, "2026-01-01T00:30:00+00:00": 2.0},
+        "unit_of_measurement": "kW",
+    }
+    result = parse_forecast(pv, START, 5, scale=1000.0)
+    assert result[:4] == pytest.approx([1500.0, 1500.0, 2000.0, 2000.0])
+    assert np.isnan(result[4])
@@ -0,0 +1,209 @@
+"""Tests for the time-warped pilot simulation harness."""
+
+from datetime import timedelta
+import time
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.sax_battery.const import (
+    CONF_ENABLE_SOLAR_CHARGING,
+    CONF_PRICE_SENSOR,
+    PILOT_MAX_DATA_AGE,
+)
+from custom_components.sax_battery.optimizer import (
+    REPLAN_INTERVAL,
+    optimize_schedule,
+    slot_start,
+)
+from custom_components.sax_battery.pilot import SAXBatteryPilot
+from custom_components.sax_battery.timeseries import RegisterSeries
+from homeassistant.util import dt as dt_util
+
+from .pilot_simulation import (
+    DAY,
+    PF_SENSOR,
+    POWER_SENSOR,
+    HouseholdProfile,
+    PilotSimulation,
+)
+
+PRICE_SENSOR = "sensor.simulated_electricity_price"
+
+
+def _baseline(profile: HouseholdProfile) -> tuple[float, float]:
+    """Return grid import and export in kWh without a battery."""
+    imported = exported = 0.0
+    for load, pv in zip(profile.load, profile.pv, strict=True):
+        energy = (load - pv) * profile.step / 3600000
+        if energy > 0:
+            imported += energy
+        else:
+            exported -= energy
+    return imported, exported
+
+
+async def test_full_day_runs_faster_than_real_time(hass):
+    """Test a 24 h day is simulated in seconds and the battery is used."""
+    profile = HouseholdProfile.synthetic(seed=1, noise=0.1)
+    simulation = PilotSimulation(hass, profile)
+
+    started = time.perf_counter()
+    report = await simulation.run()
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 60
+    assert report.duration == DAY
+    assert report.writes > 0
+    assert 0.0 <= report.min_soc <= report.max_soc <= 100.0
+    assert report.max_soc > 50.0
+
+    imported, exported = _baseline(profile)
+    assert report.grid_import_kwh < imported
+    assert report.grid_export_kwh < exported
+
+
+async def test_disabled_solar_charging_matches_baseline(hass):
+    """Test the battery stays idle with solar charging disabled."""
+    profile = HouseholdProfile.synthetic()
+    simulation = PilotSimulation(
+        hass, profile, entry_data={CONF_ENABLE_SOLAR_CHARGING: False}
+    )
+
+    report = await simulation.run()
+
+    imported, exported = _baseline(profile)
+    assert report.final_soc == 50.0
+    assert report.setpoint_changes == 0
+    assert report.grid_import_kwh == pytest.approx(imported, rel=0.02)
+    assert report.grid_export_kwh == pytest.approx(exported, rel=0.02)
+
+
+async def test_soc_constraint_hits_are_reported(hass):
+    """Test discharge requests below the minimum SOC are counted."""
+    profile = HouseholdProfile.synthetic(peak_pv=0.0)
+    simulation = PilotSimulation(hass, profile, soc=10.0)
+
+    report = await simulation.run(duration=3600)
+
+    assert report.soc_constraint_hits > 0
+    assert report.final_soc == pytest.approx(10.0)
+
+
+async def test_pilot_refuses_stale_data(hass):
+    """Test the pilot stops writing once the polled values are too old."""
+    profile = HouseholdProfile.synthetic(peak_pv=0.0)
+    simulation = PilotSimulation(hass, profile, scan_interval=DAY)
+
+    await simulation.run(duration=3600)
+
+    assert simulation.hub.writes
+    assert all(at <= PILOT_MAX_DATA_AGE + 60 for at, _ in simulation.hub.writes)
+
+
+async def test_pilot_follows_charge_schedule(hass):
+    """Test the pilot sends the optimized setpoint instead of zero balance."""
+    profile = HouseholdProfile.synthetic(peak_pv=0.0)
+    simulation = PilotSimulation(
+        hass, profile, entry_data={CONF_PRICE_SENSOR: PRICE_SENSOR}
+    )
+    start = slot_start(dt_util.utcnow())
+    prices = [
+        {"start": (start + timedelta(hours=hour)).isoformat(), "price": price}
+        for hour, price in enumerate([0.10] * 2 + [0.50] * 22)
+    ]
+    hass.states.async_set(PRICE_SENSOR, "0.10", {"prices": prices})
+    hass.states.async_set(POWER_SENSOR, "0")
+    hass.states.async_set(PF_SENSOR, "1.0")
+    coordinator = simulation.coordinator
+    coordinator.refresh()
+    coordinator.data |= {"battery_a_capacity": 11520.0, "net_household_load": 300.0}
+
+    pilot = SAXBatteryPilot(hass, coordinator)
+    await pilot._async_replan()
+
+    schedule = pilot.schedule
+    assert schedule is not None
+    assert len(schedule.setpoints) == 24 * 4
+    # Charge during the cheap hours, cover the load afterwards
+    assert schedule.setpoints[:8].min() < -1000
+    assert schedule.setpoints[8:].max() == pytest.approx(300.0, abs=150)
+    assert schedule.soc.min() >= 15
+
+    await pilot._async_update_pilot()
+    assert simulation.hub.writes[-1][1] == int(schedule.setpoint_at(dt_util.utcnow()))
+
+
+async def test_charge_schedule_uses_mean_household_load(hass):
+    """Test the planned load is the mean over the history, not one sample."""
+    simulation = PilotSimulation(
+        hass,
+        HouseholdProfile.synthetic(peak_pv=0.0),
+        entry_data={CONF_PRICE_SENSOR: PRICE_SENSOR},
+    )
+    start = slot_start(dt_util.utcnow())
+    prices = [
+        {"start": (start + timedelta(hours=hour)).isoformat(), "price": price}
+        for hour, price in enumerate([0.10] * 2 + [0.50] * 22)
+    ]
+    hass.states.async_set(PRICE_SENSOR, "0.10", {"prices": prices})
+    coordinator = simulation.coordinator
+    coordinator.refresh()
+    coordinator.data |= {"battery_a_capacity": 11520.0, "net_household_load": 2000.0}
+    for key, values in (
+        ("battery_a_smartmeter", (300, 500)),
+        ("combined_power", (0, 0)),
+    ):
+        series = coordinator.history[key] = RegisterSeries(10)
+        for timestamp, value in enumerate(values):
+            series.append(timestamp, value)
+
+    pilot = SAXBatteryPilot(hass, coordinator)
+    with patch(
+        "custom_components.sax_battery.pilot.optimize_schedule",
+        wraps=optimize_schedule,
+    ) as optimize:
+        await pilot._async_replan()
+
+    assert pilot.schedule is not None
+    # The mean load of 400 W, not the last sample of 2000 W
+    load = optimize.call_args.args[2]
+    assert load.tolist() == [400.0] * 24 * 4
+
+
+async def test_pilot_subscribes_to_charge_schedule_inputs(hass):
+    """Test the optimizer inputs are polled while the pilot runs."""
+    simulation = PilotSimulation(
+        hass,
+        HouseholdProfile.synthetic(),
+        battery_count=2,
+        entry_data={CONF_PRICE_SENSOR: PRICE_SENSOR},
+    )
+    coordinator = simulation.coordinator
+    coordinator.refresh()
+    pilot = SAXBatteryPilot(hass, coordinator)
+
+    await pilot.async_start()
+    replan_age = REPLAN_INTERVAL.total_seconds()
+    assert coordinator.subscriptions == {
+        "combined_soc": 60,
+        "combined_power": 60,
+        "battery_a_capacity": replan_age,
+        "battery_b_capacity": replan_age,
+        "net_household_load": replan_age,
+    }
+
+    await pilot.async_stop()
+    assert not coordinator.subscriptions
+
+
+def test_profile_from_csv(tmp_path):
+    """Test a recorded profile is loaded and interpolated."""
+    path = tmp_path / "profile.csv"
+    path.write_text("seconds,load,pv\n0,100,0\n900,300,1000\n1800,500,2000\n")
+
+    profile = HouseholdProfile.from_csv(path)
+
+    assert profile.step == 900
+    assert profile.at(450) == (200.0, 500.0)
+    assert profile.at(DAY + 900) == (300.0, 1000.0)
@@ -0,0 +1,213 @@
+"""Tests for the Modbus TCP proxy sharing the hub's battery connections."""
+
+import asyncio
+import time
+from unittest.mock import patch
+
+from pymodbus.client import AsyncModbusTcpClient
+import pytest
+
+from custom_components.sax_battery.hub import create_hub
+from custom_components.sax_battery.proxy import (
+    GATEWAY_TARGET_FAILED,
+    ILLEGAL_DATA_VALUE,
+    ILLEGAL_FUNCTION,
+    ModbusProxy,
+)
+
+from .sax_simulator import REG_SETPOINT, REG_SOC, SLAVE_CONTROL, simulator_config
+
+
+@pytest.fixture(autouse=True)
+def no_write_delay():
+    """Skip the fixed delays the hub adds around writes."""
+    with (
+        patch("custom_components.sax_battery.hub.WRITE_DELAY", 0),
+        patch("custom_components.sax_battery.hub.GLOBAL_DELAY", 0),
+    ):
+        yield
+
+
+@pytest.fixture
+async def proxied(hass, sax_simulators):
+    """Start a hub, a proxy for its battery and a client connected to it."""
+    (simulator,) = await sax_simulators(1, soc=64.0)
+    hub = await create_hub(hass, simulator_config([simulator]))
+    proxy = ModbusProxy(hub, "battery_a", "127.0.0.1", 0)
+    await proxy.async_start()
+    client = AsyncModbusTcpClient("127.0.0.1", port=proxy.port, timeout=5)
+    await client.connect()
+    yield simulator, proxy, client
+    client.close()
+    await proxy.async_stop()
+    await hub.disconnect()
+
+
+async def test_reads_are_served_from_the_register_cache(proxied):
+    """Test repeated reads of other clients do not reach the battery again."""
+    simulator, proxy, client = proxied
+    simulator.reset_counters()
+
+    first = await client.read_holding_registers(
+        REG_SOC, count=3, device_id=SLAVE_CONTROL
+    )
+    second = await client.read_holding_registers(
+        REG_SOC, count=1, device_id=SLAVE_CONTROL
+    )
+
+    assert not first.isError()
+    assert first.registers[0] == 64
+    assert second.registers == first.registers[:1]
+    assert simulator.transactions == 1
+    assert proxy.requests == 2
+
+
+async def test_reads_are_served_from_recent_hub_reads(proxied):
+    """Test registers read within the proxy's max age are served past the TTL."""
+    simulator, proxy, client = proxied
+    proxy.max_age = 60.0
+    proxy._hub.register_caches["battery_a"].clear()
+    simulator.reset_counters()
+
+    first = await client.read_holding_registers(
+        REG_SOC, count=1, device_id=SLAVE_CONTROL
+    )
+    with patch("custom_components.sax_battery.register_cache.time") as mock_time:
+        mock_time.monotonic.return_value = time.monotonic() + 10
+        second = await client.read_holding_registers(
+            REG_SOC, count=1, device_id=SLAVE_CONTROL
+        )
+        assert simulator.transactions == 1
+        proxy.max_age = None
+        third = await client.read_holding_registers(
+            REG_SOC, count=1, device_id=SLAVE_CONTROL
+        )
+
+    assert first.registers == second.registers == third.registers == [64]
+    assert simulator.transactions == 2
+
+
+async def test_writes_are_forwarded_to_the_battery(proxied):
+    """Test single and multiple register writes reach the battery."""
+    simulator, _, client = proxied
+
+    response = await client.write_registers(
+        REG_SETPOINT, [1500, 10], device_id=SLAVE_CONTROL
+    )
+    assert not response.isError()
+    response = await client.write_register(REG_SETPOINT, 800, device_id=SLAVE_CONTROL)
+    assert not response.isError()
+
+    assert simulator.writes == [(REG_SETPOINT, [1500, 10]), (REG_SETPOINT, [800])]
+    assert simulator.model.setpoint == 800
+
+
+async def test_writes_are_answered_without_write_delay(proxied):
+    """Test proxied writes take the fast path, answered on acknowledgement."""
+    simulator, _, client = proxied
+
+    with patch("custom_components.sax_battery.hub.WRITE_DELAY", 10):
+        async with asyncio.timeout(2):
+            response = await client.write_registers(
+                REG_SETPOINT, [1500, 10], device_id=SLAVE_CONTROL
+            )
+
+    assert not response.isError()
+    assert simulator.model.setpoint == 1500
+
+
+async def test_invalid_requests_get_exception_responses(proxied):
+    """Test unsupported functions and malformed requests are rejected."""
+    simulator, proxy, client = proxied
+    simulator.reset_counters()
+
+    response = await client.read_input_registers(
+        REG_SOC, count=1, device_id=SLAVE_CONTROL
+    )
+    assert response.isError()
+    assert response.exception_code == ILLEGAL_FUNCTION
+
+    assert await proxy.handle_request(SLAVE_CONTROL, bytes([3, 0, 46])) == bytes(
+        [0x83, ILLEGAL_DATA_VALUE]
+    )
+    assert await proxy.handle_request(
+        SLAVE_CONTROL, bytes([3, 0, 46, 0, 200])
+    ) == bytes([0x83, ILLEGAL_DATA_VALUE])
+    assert simulator.transactions == 0
+
+
+async def test_battery_failure_is_reported_as_gateway_error(proxied):
+    """Test a read the battery does not answer maps to a gateway exception."""
+    simulator, proxy, _ = proxied
+    await simulator.stop()
+    proxy._hub.register_caches["battery_a"].clear()
+
+    response = await proxy.handle_request(SLAVE_CONTROL, bytes([3, 0, 46, 0, 1]))
+
+    assert response == bytes([0x83, GATEWAY_TARGET_FAILED])
+
+
+async def test_incomplete_reads_are_reported_as_gateway_error(proxied):
+    """Test fewer registers than requested are not answered as a success."""
+    _, proxy, _ = proxied
+    hub = proxy._hub
+
+    with (
+        patch.object(hub, "modbus_read_holding_registers", return_value=[]),
+        patch.object(hub, "modbus_readwrite_registers", return_value=None),
+    ):
+        read = await proxy.handle_request(SLAVE_CONTROL, bytes([3, 0, 46, 0, 1]))
+        readwrite = await proxy.handle_request(
+            SLAVE_CONTROL, bytes([23, 0, 45, 0, 4, 0, 41, 0, 1, 2, 0, 0])
+        )
+
+    assert read == bytes([0x83, GATEWAY_TARGET_FAILED])
+    assert readwrite == bytes([0x97, GATEWAY_TARGET_FAILED])
+
+
+async def test_requests_are_rejected_while_battery_polls_are_paused(proxied):
+    """Test an open circuit breaker is not bypassed by proxied requests."""
+    simulator, proxy, client = proxied
+    breaker = proxy._hub.breakers["battery_a"]
+    while not breaker.record_failure():
+        pass
+    proxy._hub.register_caches["battery_a"].clear()
+    simulator.reset_counters()
+
+    response = await client.read_holding_registers(
+        REG_SOC, count=1, device_id=SLAVE_CONTROL
+    )
+
+    assert response.isError()
+    assert response.exception_code == GATEWAY_TARGET_FAILED
+    assert simulator.transactions == 0
+
+
+async def test_readwrite_fallback_reads_after_the_write(proxied):
+    """Test a combined request written separately reads once the write is acked."""
+    simulator, proxy, client = proxied
+    simulator.faults.readwrite_unsupported = True
+    simulator.faults.latency = 0.2
+    hub = proxy._hub
+    read = hub.modbus_read_holding_registers
+    unacknowledged = []
+
+    async def read_after_write(*args, **kwargs):
+        unacknowledged.append(
+            len(hub._write_tasks.get(("battery_a", SLAVE_CONTROL), ()))
+        )
+        return await read(*args, **kwargs)
+
+    with patch.object(hub, "modbus_read_holding_registers", read_after_write):
+        response = await client.readwrite_registers(
+            read_address=REG_SETPOINT,
+            read_count=2,
+            write_address=REG_SETPOINT,
+            values=[1500, 10],
+            device_id=SLAVE_CONTROL,
+        )
+
+    assert not response.isError()
+    assert response.registers == [1500, 10]
+    # The proxy's read is the first, the hub's write read-back may follow
+    assert unacknowledged[0] == 0
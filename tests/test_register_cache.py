@@ -0,0 +1,54 @@
+"""Tests for the raw register cache."""
+
+from unittest.mock import patch
+
+from custom_components.sax_battery.register_cache import RegisterCache
+
+
+def test_cache_serves_covered_ranges_until_expiry():
+    """Test reads inside a cached block are served until its TTL passes."""
+    cache = RegisterCache()
+    with patch("custom_components.sax_battery.register_cache.time") as mock_time:
+        mock_time.monotonic.return_value = 100.0
+        cache.put(40, 40100, [1, 2, 3, 4], ttl=5.0)
+        cache.put(64, 45, [7], ttl=0)
+
+        assert cache.get(40, 40100, 4) == [1, 2, 3, 4]
+        assert cache.get(40, 40101, 2) == [2, 3]
+        assert cache.get(40, 40103, 2) is None
+        assert cache.get(64, 40100, 1) is None
+        assert cache.get(64, 45, 1) is None
+
+        mock_time.monotonic.return_value = 105.0
+        assert cache.get(40, 40100, 4) is None
+
+
+def test_cache_serves_expired_blocks_within_max_age():
+    """Test a reader accepting older values is served past the TTL."""
+    cache = RegisterCache()
+    with patch("custom_components.sax_battery.register_cache.time") as mock_time:
+        mock_time.monotonic.return_value = 100.0
+        cache.put(64, 45, [3, 64], ttl=1.0)
+
+        mock_time.monotonic.return_value = 110.0
+        assert cache.get(64, 45, 2) is None
+        assert cache.get(64, 46, 1, max_age=15.0) == [64]
+        assert cache.get(64, 45, 2, max_age=5.0) is None
+
+
+def test_invalidate_drops_overlapping_blocks():
+    """Test a write drops overlapping blocks and reports the unexpired ones."""
+    cache = RegisterCache()
+    with patch("custom_components.sax_battery.register_cache.time") as mock_time:
+        mock_time.monotonic.return_value = 0.0
+        cache.put(64, 41, [1, 2], ttl=10.0)
+        cache.put(64, 43, [3], ttl=1.0)
+        cache.put(64, 45, [4], ttl=10.0)
+        cache.put(40, 42, [5], ttl=10.0)
+
+        mock_time.monotonic.return_value = 2.0
+        assert cache.invalidate(64, 42, 2) == [(41, 2)]
+
+        assert len(cache) == 2
+        assert cache.get(64, 45, 1) == [4]
+        assert cache.get(40, 42, 1) == [5]
@@ -0,0 +1,41 @@
+"""Tests for the adaptive request timeouts."""
+
+import pytest
+
+from custom_components.sax_battery.rtt import RttEstimator
+
+
+def test_timeout_follows_round_trip_times():
+    """Test the timeout is the smoothed RTT plus four deviations, bounded."""
+    estimator = RttEstimator(floor=0.2, ceiling=8.0)
+    assert estimator.timeout == 8.0
+
+    estimator.observe(0.1)
+    assert estimator.srtt == pytest.approx(0.1)
+    assert estimator.rttvar == pytest.approx(0.05)
+    assert estimator.timeout == pytest.approx(0.3)
+
+    estimator.observe(0.5)
+    assert estimator.srtt == pytest.approx(0.15)
+    assert estimator.rttvar == pytest.approx(0.1375)
+    assert estimator.timeout == pytest.approx(0.7)
+
+    for _ in range(50):
+        estimator.observe(0.03)
+    assert estimator.timeout == 0.2
+
+
+def test_timeouts_back_off_until_a_response():
+    """Test each timeout doubles the next one up to the ceiling."""
+    estimator = RttEstimator(floor=0.2, ceiling=1.0)
+    estimator.observe(0.05)
+
+    estimator.timed_out()
+    assert estimator.timeout == pytest.approx(0.4)
+    estimator.timed_out()
+    estimator.timed_out()
+    assert estimator.timeout == 1.0
+
+    estimator.observe(0.05)
+    assert estimator.backoff == 1
+    assert estimator.as_dict()["samples"] == 2
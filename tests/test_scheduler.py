@@ -0,0 +1,73 @@
+"""Tests for the SAX Battery poll scheduler."""
+
+import asyncio
+import time
+
+from custom_components.sax_battery.hub import create_hub
+from custom_components.sax_battery.scheduler import (
+    SAXPollScheduler,
+    async_get_scheduler,
+)
+
+from .sax_simulator import REG_SOC, SLAVE_CONTROL, simulator_config
+
+
+def test_spacing_follows_registered_entries():
+    """Test cycles are spread over the shortest interval of all entries."""
+    scheduler = SAXPollScheduler()
+    scheduler.register("entry_1", 60)
+    assert scheduler.spacing == 0.0
+
+    scheduler.register("entry_2", 60)
+    scheduler.register("entry_3", 30)
+    assert scheduler.spacing == 10.0
+
+    scheduler.unregister("entry_3")
+    scheduler.unregister("unknown")
+    assert scheduler.entries == 2
+    assert scheduler.spacing == 30.0
+
+
+async def test_cycles_are_staggered():
+    """Test simultaneous cycles of two entries start one spacing apart."""
+    scheduler = SAXPollScheduler()
+    scheduler.register("entry_1", 0.2)
+    scheduler.register("entry_2", 0.2)
+    started: list[float] = []
+
+    async def _cycle() -> None:
+        await scheduler.async_wait_for_slot()
+        started.append(time.monotonic())
+
+    await asyncio.gather(_cycle(), _cycle())
+
+    assert started[1] - started[0] >= 0.09
+
+
+async def test_scheduler_is_shared(hass):
+    """Test all config entries get the same scheduler."""
+    assert async_get_scheduler(hass) is async_get_scheduler(hass)
+
+
+async def test_hub_waits_for_transaction_slot(hass, sax_simulators):
+    """Test hub reads queue while all shared transaction slots are taken."""
+    simulators = await sax_simulators(1, soc=42.0)
+    hub = await create_hub(hass, simulator_config(simulators))
+    hub.scheduler = SAXPollScheduler(max_transactions=1)
+    try:
+        await hub.connect()
+        simulators[0].reset_counters()
+        await hub.scheduler.transactions.acquire()
+        read = asyncio.create_task(
+            hub.modbus_read_holding_registers(
+                REG_SOC, 1, SLAVE_CONTROL, "battery_a", cached=False
+            )
+        )
+        await asyncio.sleep(0.05)
+        assert not read.done()
+        assert simulators[0].transactions == 0
+
+        hub.scheduler.transactions.release()
+        assert await read == [42]
+    finally:
+        await hub.disconnect()
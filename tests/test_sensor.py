@@ -0,0 +1,42 @@
+"""Tests for the SAX Battery sensor platform."""
+
+from unittest.mock import MagicMock
+
+from custom_components.sax_battery.hub import BatteryDataKey
+from custom_components.sax_battery.sensor import SAXBatterySensor
+from homeassistant.components.sensor import SensorDeviceClass, SensorStateClass
+from homeassistant.const import PERCENTAGE
+
+
+def test_battery_sensor_uses_structured_key():
+    """Test per-battery sensors take name and unit from the register key."""
+    coordinator = MagicMock(device_id="device", unique_id_prefix="sax_battery_entry")
+    sensor = SAXBatterySensor(
+        coordinator,
+        "battery_aa_soc",
+        battery_key=BatteryDataKey(26, "battery_aa", "soc"),
+    )
+
+    assert sensor.name == "Sax Battery AA SOC"
+    assert sensor.unique_id == "sax_battery_entry_battery_aa_soc"
+    assert sensor.device_class == SensorDeviceClass.BATTERY
+    assert sensor.native_unit_of_measurement == PERCENTAGE
+    assert sensor.state_class == SensorStateClass.MEASUREMENT
+
+
+def test_battery_sensor_unavailable_while_breaker_open():
+    """Test per-battery sensors follow the battery's circuit breaker."""
+    coordinator = MagicMock(
+        device_id="device",
+        unique_id_prefix="sax_battery_entry",
+        data={"battery_b_soc": 50.0},
+    )
+    coordinator.hub.is_battery_available.return_value = False
+    sensor = SAXBatterySensor(
+        coordinator,
+        "battery_b_soc",
+        battery_key=BatteryDataKey(1, "battery_b", "soc"),
+    )
+
+    assert not sensor.available
+    coordinator.hub.is_battery_available.assert_called_once_with("battery_b")
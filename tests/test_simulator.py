@@ -0,0 +1,742 @@
+"""Tests running the SAX Battery hub against the local Modbus simulator."""
+
+import asyncio
+import time
+from unittest.mock import patch
+
+from pymodbus.client import AsyncModbusTcpClient
+from pymodbus.exceptions import ModbusIOException
+import pytest
+
+from custom_components.sax_battery.const import TRANSPORTS
+from custom_components.sax_battery.hub import (
+    READ_CYCLE_GRACE,
+    READ_TIMEOUT,
+    HubConnectionError,
+    SAXBatteryHub,
+    create_hub,
+)
+from custom_components.sax_battery.scheduler import SAXPollScheduler
+
+from .sax_simulator import (
+    REG_SETPOINT,
+    REG_SOC,
+    REG_STATUS,
+    SLAVE_CONTROL,
+    STATUS_COMMAND_OFF,
+    STATUS_OFF,
+    STATUS_ON,
+    SAXBatteryModel,
+    SimulatorFaults,
+    simulator_config,
+)
+
+
+@pytest.fixture(autouse=True)
+def no_write_delay():
+    """Skip the fixed delays the hub adds around writes."""
+    with (
+        patch("custom_components.sax_battery.hub.WRITE_DELAY", 0),
+        patch("custom_components.sax_battery.hub.GLOBAL_DELAY", 0),
+    ):
+        yield
+
+
+async def test_hub_reads_simulated_battery(hass, sax_simulators):
+    """Test a full hub read cycle against one simulated battery."""
+    simulators = await sax_simulators(1, soc=64.0, load=1200.0)
+    hub = await create_hub(hass, simulator_config(simulators))
+    try:
+        data = await hub.read_data()
+    finally:
+        await hub.disconnect()
+
+    assert data["soc"] == 64.0
+    assert data["status"] == 3
+    assert data["power"] == 0.0
+    assert data["smartmeter"] == 1200
+    assert data["capacity"] == 11520.0
+    assert data["temp"] == 25.0
+    assert data["voltage_l1"] == pytest.approx(230.0)
+    assert data["smartmeter_total_power"] == 1200.0
+
+
+async def test_setpoint_write_drives_power_and_soc(hass, sax_simulators):
+    """Test writes to the setpoint registers change the simulated battery."""
+    now = [0.0]
+    simulators = await sax_simulators(1, clock=lambda: now[0])
+    model = simulators[0].model
+    hub = await create_hub(hass, simulator_config(simulators))
+    try:
+        # Charge with 2000 W, written as two's complement like the pilot does
+        assert await hub.modbus_write_registers(
+            "battery_a", REG_SETPOINT, [(65536 - 2000) & 0xFFFF, 10]
+        )
+        now[0] += 3600.0
+        # The model clock jumped ahead, registers cached moments ago are stale
+        hub.register_caches["battery_a"].clear()
+        data = await hub.read_data()
+    finally:
+        await hub.disconnect()
+
+    assert data["power"] == -2000.0
+    assert data["smartmeter"] == 2500
+    assert model.soc == pytest.approx(50.0 + 2000 / 11520 * 100, abs=0.1)
+    assert data["soc"] == round(model.soc)
+    assert simulators[0].writes == [(REG_SETPOINT, [63536, 10])]
+
+
+async def test_fast_write_does_not_wait_for_write_quirk(hass, sax_simulators):
+    """Test fast writes return before the quirky acknowledgement and verify."""
+    (simulator,) = await sax_simulators(1, SimulatorFaults(write_quirk=True))
+    hub = SAXBatteryHub(
+        hass,
+        [{"battery_id": "battery_a", "host": simulator.host, "port": simulator.port}],
+    )
+    with patch("custom_components.sax_battery.hub.WRITE_VERIFY_DELAY", 0):
+        try:
+            await hub.connect()
+            started = time.monotonic()
+            assert await hub.modbus_write_registers_fast(
+                "battery_a", REG_SETPOINT, [1500, 10]
+            )
+            assert time.monotonic() - started < 0.5
+            await hub._verify_tasks[("battery_a", SLAVE_CONTROL)]
+        finally:
+            await hub.disconnect()
+
+    assert simulator.model.setpoint == 1500
+    assert simulator.writes == [(REG_SETPOINT, [1500, 10])]
+    assert not hub._pending_writes
+    assert hub.metrics.as_dict()["batteries"]["battery_a"]["write_retries"] == 0
+
+
+async def test_unconfirmed_fast_write_is_retried(hass, sax_simulators):
+    """Test writes the read-back does not confirm are sent again, then given up."""
+    (simulator,) = await sax_simulators(1)
+    hub = SAXBatteryHub(
+        hass,
+        [{"battery_id": "battery_a", "host": simulator.host, "port": simulator.port}],
+    )
+    with (
+        patch.object(SAXBatteryModel, "write_control_register"),
+        patch("custom_components.sax_battery.hub.WRITE_VERIFY_DELAY", 0),
+    ):
+        try:
+            await hub.connect()
+            assert await hub.modbus_write_registers_fast(
+                "battery_a", REG_SETPOINT, [1500, 10]
+            )
+            await hub._verify_tasks[("battery_a", SLAVE_CONTROL)]
+        finally:
+            await hub.disconnect()
+
+    assert len(simulator.writes) == 3
+    metrics = hub.metrics.as_dict()["batteries"]["battery_a"]
+    assert metrics["write_retries"] == 2
+    assert metrics["write_failures"] == 1
+
+
+@pytest.mark.parametrize("transport", TRANSPORTS)
+async def test_fast_write_is_not_held_up_by_the_battery_lock(
+    hass, sax_simulators, transport
+):
+    """Test a fast write is sent while a slow write holds the battery lock."""
+    (simulator,) = await sax_simulators(1)
+    hub = SAXBatteryHub(
+        hass,
+        [
+            {
+                "battery_id": "battery_a",
+                "host": simulator.host,
+                "port": simulator.port,
+                "transport": transport,
+            }
+        ],
+    )
+    with patch("custom_components.sax_battery.hub.WRITE_VERIFY_DELAY", 0):
+        try:
+            await hub.connect()
+            async with hub._battery_locks["battery_a"]:
+                async with asyncio.timeout(0.5):
+                    assert await hub.modbus_write_registers_fast(
+                        "battery_a", REG_SETPOINT, [1500, 10]
+                    )
+                await hub._verify_tasks[("battery_a", SLAVE_CONTROL)]
+        finally:
+            await hub.disconnect()
+
+    assert simulator.writes == [(REG_SETPOINT, [1500, 10])]
+    assert not hub._pending_writes
+
+
+async def test_write_read_back_does_not_delay_other_entries(hass, sax_simulators):
+    """Test a write read-back does not take a read cycle slot."""
+    (simulator,) = await sax_simulators(1)
+    hub = SAXBatteryHub(
+        hass,
+        [{"battery_id": "battery_a", "host": simulator.host, "port": simulator.port}],
+    )
+    # Two entries polling every 60 s, read cycles start 30 s apart
+    hub.scheduler = SAXPollScheduler()
+    hub.scheduler.register("entry_a", 60)
+    hub.scheduler.register("entry_b", 60)
+    with patch("custom_components.sax_battery.hub.WRITE_VERIFY_DELAY", 0):
+        try:
+            await hub.connect()
+            assert await hub.modbus_write_registers_fast(
+                "battery_a", REG_SETPOINT, [1500, 10]
+            )
+            async with asyncio.timeout(1):
+                await hub._verify_tasks[("battery_a", SLAVE_CONTROL)]
+                # The other entry's next poll starts right away
+                await hub.scheduler.async_wait_for_slot()
+        finally:
+            await hub.disconnect()
+
+    assert simulator.model.setpoint == 1500
+
+
+async def test_setpoint_respects_limits_and_soc(sax_simulators):
+    """Test the model clamps power to the limits and stops when full."""
+    now = [0.0]
+    (simulator,) = await sax_simulators(1, soc=99.0, clock=lambda: now[0])
+    model = simulator.model
+    model.max_charge = 1000
+    model.setpoint = (65536 - 3000) & 0xFFFF
+    model.sync()
+
+    now[0] += 10.0
+    model.sync()
+    assert model.power == -1000.0
+
+    now[0] += 3600.0
+    model.sync()
+    assert model.soc == 100.0
+    assert model.power == 0.0
+
+
+@pytest.mark.parametrize(
+    "faults",
+    [SimulatorFaults(drop_rate=1.0), SimulatorFaults(tid_mismatch_rate=1.0)],
+)
+async def test_lost_responses_time_out(sax_simulators, faults):
+    """Test dropped and mismatched responses never reach the client."""
+    (simulator,) = await sax_simulators(1, faults)
+    client = AsyncModbusTcpClient(
+        simulator.host, port=simulator.port, timeout=0.2, retries=0
+    )
+    await client.connect()
+    try:
+        with pytest.raises(ModbusIOException):
+            await client.read_holding_registers(46, count=1, device_id=SLAVE_CONTROL)
+    finally:
+        client.close()
+
+    assert simulator.transactions == 1
+    assert simulator.dropped + simulator.mismatched == 1
+
+
+async def test_write_quirk_cancels_applied_write(sax_simulators):
+    """Test the SAX write quirk surfaces as a cancelled request."""
+    (simulator,) = await sax_simulators(1, SimulatorFaults(write_quirk=True))
+    client = AsyncModbusTcpClient(simulator.host, port=simulator.port, timeout=5)
+    await client.connect()
+    try:
+        with pytest.raises(ModbusIOException, match="cancelled outside pymodbus"):
+            await asyncio.wait_for(
+                client.write_registers(
+                    REG_SETPOINT, [1500, 10], device_id=SLAVE_CONTROL
+                ),
+                timeout=0.3,
+            )
+    finally:
+        client.close()
+
+    assert simulator.model.setpoint == 1500
+
+
+async def test_latency_is_applied(sax_simulators):
+    """Test the configured latency delays every response."""
+    (simulator,) = await sax_simulators(1, SimulatorFaults(latency=0.1))
+    client = AsyncModbusTcpClient(simulator.host, port=simulator.port)
+    await client.connect()
+    try:
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        result = await client.read_holding_registers(
+            46, count=1, device_id=SLAVE_CONTROL
+        )
+        elapsed = loop.time() - started
+    finally:
+        client.close()
+
+    assert result.registers == [50]
+    assert elapsed >= 0.1
+
+
+async def test_multiple_batteries_on_separate_ports(hass, sax_simulators):
+    """Test the hub reads several simulated batteries at once."""
+    simulators = await sax_simulators(3)
+    for index, simulator in enumerate(simulators):
+        simulator.model.soc = 20.0 + 10 * index
+
+    assert len({simulator.port for simulator in simulators}) == 3
+
+    hub = await create_hub(hass, simulator_config(simulators))
+    try:
+        for simulator in simulators:
+            simulator.reset_counters()
+        for cache in hub.register_caches.values():
+            cache.clear()
+        data = await hub.read_data()
+    finally:
+        await hub.disconnect()
+
+    assert data["battery_a_soc"] == 20.0
+    assert data["battery_a_capacity"] == data["battery_c_capacity"]
+    assert data["battery_b_soc"] == 30.0
+    assert data["battery_c_soc"] == 40.0
+    assert data["soc"] == 20.0
+    # Smart meter registers are only read from the master battery
+    assert data["battery_b_status"] == STATUS_ON
+    assert "battery_b_smartmeter" not in data
+    assert "battery_c_smartmeter_total_power" not in data
+    transactions = [simulator.transactions for simulator in simulators]
+    read_plans = [len(battery.read_plan) for battery in hub.batteries.values()]
+    assert transactions == read_plans
+    assert read_plans[1] == read_plans[2] == read_plans[0] - 11
+
+
+async def test_more_than_three_batteries(hass, sax_simulators):
+    """Test create_hub picks up every consecutively numbered battery."""
+    simulators = await sax_simulators(5)
+    simulators[4].model.temperature = 30
+
+    hub = await create_hub(hass, simulator_config(simulators))
+    try:
+        data = await hub.read_data()
+    finally:
+        await hub.disconnect()
+
+    assert list(hub.batteries) == [
+        "battery_a",
+        "battery_b",
+        "battery_c",
+        "battery_d",
+        "battery_e",
+    ]
+    assert data["battery_e_temp"] == 30
+
+
+async def test_unresponsive_battery_finishes_within_budget(hass, sax_simulators):
+    """Test a read cycle against a silent battery ends at its deadline."""
+    (simulator,) = await sax_simulators(1, SimulatorFaults(drop_rate=1.0))
+    hub = SAXBatteryHub(
+        hass,
+        [{"battery_id": "battery_a", "host": simulator.host, "port": simulator.port}],
+    )
+    try:
+        started = time.monotonic()
+        data = await hub.read_data(budget=2.0)
+        elapsed = time.monotonic() - started
+    finally:
+        await hub.disconnect()
+
+    assert elapsed < 2.0 + READ_CYCLE_GRACE
+    assert data["battery_a_soc"] is None
+    assert hub.metrics.as_dict()["batteries"]["battery_a"]["retries"] == 0
+
+
+async def test_offline_battery_is_skipped_until_probe_succeeds(hass, sax_simulators):
+    """Test the circuit breaker skips an offline battery and probes it back."""
+    simulators = await sax_simulators(2)
+    hub = await create_hub(hass, simulator_config(simulators))
+    now = [0.0]
+    breaker = hub.breakers["battery_b"]
+    breaker.clock = lambda: now[0]
+    try:
+        await simulators[1].stop()
+        hub.register_caches["battery_b"].clear()
+        for _ in range(breaker.failure_threshold):
+            data = await hub.read_data()
+            assert data["battery_a_soc"] == 50.0
+        assert not hub.is_battery_available("battery_b")
+
+        # Skipped without touching the network
+        with patch.object(hub, "_probe_battery") as probe:
+            data = await hub.read_data()
+        probe.assert_not_called()
+        assert "battery_b_temp" not in data
+
+        await simulators[1].start()
+        now[0] = breaker.probe_at
+        data = await hub.read_data()
+    finally:
+        await hub.disconnect()
+
+    assert hub.is_battery_available("battery_b")
+    assert data["battery_b_temp"] == 25
+
+
+async def test_concurrent_reads_share_one_cycle(hass, sax_simulators):
+    """Test callers arriving during a read cycle get that cycle's result."""
+    (simulator,) = await sax_simulators(1, soc=64.0)
+    hub = SAXBatteryHub(
+        hass,
+        [{"battery_id": "battery_a", "host": simulator.host, "port": simulator.port}],
+    )
+    try:
+        await hub.connect()
+        simulator.reset_counters()
+        first = await hub.read_data()
+        single_cycle = simulator.transactions
+
+        simulator.reset_counters()
+        hub.register_caches["battery_a"].clear()
+        results = await asyncio.gather(*(hub.read_data() for _ in range(3)))
+    finally:
+        await hub.disconnect()
+
+    assert results[0] is results[1] is results[2]
+    assert results[0] == first
+    assert simulator.transactions == single_cycle
+
+
+async def test_register_cache_is_refreshed_after_write(hass, sax_simulators):
+    """Test cached registers are served locally and re-read after a write."""
+    (simulator,) = await sax_simulators(1)
+    hub = SAXBatteryHub(
+        hass,
+        [{"battery_id": "battery_a", "host": simulator.host, "port": simulator.port}],
+    )
+    try:
+        await hub.connect()
+        await hub.modbus_read_holding_registers(
+            REG_STATUS, 1, SLAVE_CONTROL, "battery_a"
+        )
+        simulator.reset_counters()
+        assert await hub.modbus_read_holding_registers(
+            REG_STATUS, 1, SLAVE_CONTROL, "battery_a"
+        ) == [STATUS_ON]
+        assert simulator.transactions == 0
+
+        assert await hub.modbus_write_registers(
+            "battery_a", REG_STATUS, [STATUS_COMMAND_OFF]
+        )
+        await asyncio.gather(*hub._refresh_tasks)
+        # The write and the targeted re-read of the cached status
+        assert simulator.transactions == 2
+
+        registers = await hub.modbus_read_holding_registers(
+            REG_STATUS, 1, SLAVE_CONTROL, "battery_a"
+        )
+    finally:
+        await hub.disconnect()
+
+    assert registers == [STATUS_OFF]
+    assert simulator.transactions == 2
+    assert hub.metrics.as_dict()["batteries"]["battery_a"]["cache_hits"] == 2
+
+
+async def test_unread_registers_are_not_refreshed_after_write(hass, sax_simulators):
+    """Test write read-backs bypass the cache and unread blocks are not re-read."""
+    (simulator,) = await sax_simulators(1)
+    hub = SAXBatteryHub(
+        hass,
+        [{"battery_id": "battery_a", "host": simulator.host, "port": simulator.port}],
+    )
+    try:
+        await hub.connect()
+        with patch("custom_components.sax_battery.hub.WRITE_VERIFY_DELAY", 0):
+            for setpoint in (1500, 1000):
+                assert await hub.modbus_write_registers_fast(
+                    "battery_a", REG_SETPOINT, [setpoint, 10]
+                )
+                await asyncio.gather(*hub._verify_tasks.values())
+        # Each write is acknowledged and read back, the setpoint block is
+        # neither cached by the read-back nor refreshed after the next write
+        assert not hub._refresh_tasks
+        assert simulator.transactions == 4
+
+        registers = await hub.modbus_read_holding_registers(
+            REG_SETPOINT, 2, SLAVE_CONTROL, "battery_a"
+        )
+    finally:
+        await hub.disconnect()
+
+    assert registers == [1000, 10]
+    assert simulator.transactions == 5
+    assert hub.metrics.as_dict()["batteries"]["battery_a"]["cache_hits"] == 0
+
+
+async def test_lost_response_is_detected_from_round_trip_times(hass, sax_simulators):
+    """Test a dropped request times out after a few round trips, not seconds."""
+    (simulator,) = await sax_simulators(1)
+    hub = SAXBatteryHub(
+        hass,
+        [{"battery_id": "battery_a", "host": simulator.host, "port": simulator.port}],
+    )
+    rtt = hub.rtt["battery_a"]
+    try:
+        await hub.connect()
+        assert rtt.timeout == READ_TIMEOUT
+        for _ in range(5):
+            await hub.modbus_read_holding_registers(
+                REG_SOC, 1, SLAVE_CONTROL, "battery_a", cached=False
+            )
+        assert rtt.samples == 5
+        assert rtt.timeout == rtt.floor
+
+        simulator.faults.drop_rate = 1.0
+        started = time.monotonic()
+        with (
+            patch("custom_components.sax_battery.hub.MODBUS_RETRIES", 0),
+            pytest.raises(HubConnectionError),
+        ):
+            await hub.modbus_read_holding_registers(
+                REG_SOC, 1, SLAVE_CONTROL, "battery_a", cached=False
+            )
+        elapsed = time.monotonic() - started
+    finally:
+        await hub.disconnect()
+
+    assert elapsed < 1.0
+    assert rtt.backoff == 2
+
+
+async def test_synchronized_sampling_reads_batteries_together(hass, sax_simulators):
+    """Test fast registers of all batteries are sampled in one aligned burst."""
+    simulators = await sax_simulators(2)
+    simulators[0].model.soc = 30.0
+    simulators[1].model.soc = 70.0
+    hub = SAXBatteryHub(
+        hass,
+        [
+            {"battery_id": battery_id, "host": simulator.host, "port": simulator.port}
+            for battery_id, simulator in zip(
+                ("battery_a", "battery_b"), simulators, strict=True
+            )
+        ],
+        master_battery="battery_a",
+        synchronized_sampling=True,
+    )
+    try:
+        data = await hub.read_data()
+    finally:
+        await hub.disconnect()
+
+    assert data["battery_a_soc"] == 30.0
+    assert data["battery_b_soc"] == 70.0
+    # The smart meter is only read from the master battery
+    assert set(hub.sample_times) == {
+        "battery_a_soc",
+        "battery_a_power",
+        "battery_a_smartmeter",
+        "battery_b_soc",
+        "battery_b_power",
+    }
+    times = hub.sample_times.values()
+    assert max(times) - min(times) < 0.1
+
+
+async def test_synchronized_sampling_reads_fast_registers_once(hass, sax_simulators):
+    """Test sampled registers are not read again and idle cycles skip the burst."""
+    (simulator,) = await sax_simulators(1)
+    hub = SAXBatteryHub(
+        hass,
+        [{"battery_id": "battery_a", "host": simulator.host, "port": simulator.port}],
+        synchronized_sampling=True,
+    )
+    read_plan = hub.batteries["battery_a"].read_plan
+    try:
+        await hub.read_data()
+        full_cycle = simulator.transactions
+        cache_hits = hub.metrics.as_dict()["batteries"]["battery_a"]["cache_hits"]
+
+        hub.set_demand({"battery_a": {"soc": 0.0, "temp": 0.0}})
+        hub.register_caches["battery_a"].clear()
+        simulator.reset_counters()
+        await hub.read_data()
+        sampled_cycle = simulator.transactions
+
+        hub.set_demand({"battery_a": {"soc": 3600.0, "temp": 0.0}})
+        hub.register_caches["battery_a"].clear()
+        simulator.reset_counters()
+        await hub.read_data()
+    finally:
+        await hub.disconnect()
+
+    assert full_cycle == len(read_plan) - 2
+    assert cache_hits == 0
+    assert sampled_cycle == 2
+    assert simulator.transactions == 1
+    assert hub.sample_times == {}
+
+
+async def test_demanded_registers_are_read_when_due(hass, sax_simulators):
+    """Test a cycle reads only demanded registers that are due."""
+    (simulator,) = await sax_simulators(1)
+    hub = SAXBatteryHub(
+        hass,
+        [{"battery_id": "battery_a", "host": simulator.host, "port": simulator.port}],
+    )
+    hub.set_demand({"battery_a": {"soc": 0.0, "temp": 3600.0}})
+    try:
+        first = await hub.read_data()
+        hub.register_caches["battery_a"].clear()
+        simulator.reset_counters()
+        second = await hub.read_data()
+    finally:
+        await hub.disconnect()
+
+    assert first["battery_a_soc"] == 50.0
+    assert first["battery_a_temp"] == 25
+    assert "battery_a_power" not in first
+    assert second == {"battery_a_soc": 50.0, "soc": 50.0}
+    assert simulator.transactions == 1
+    assert hub.deferred_keys == {"battery_a_temp", "temp"}
+
+
+@pytest.mark.parametrize("transport", ["pymodbus", "native"])
+async def test_setpoint_write_returns_status_in_one_request(
+    hass, sax_simulators, transport
+):
+    """Test function code 23 writes the setpoint and reads 45-48 in one request."""
+    (simulator,) = await sax_simulators(1, soc=70.0)
+    hub = SAXBatteryHub(
+        hass,
+        [
+            {
+                "battery_id": "battery_a",
+                "host": simulator.host,
+                "port": simulator.port,
+                "transport": transport,
+            }
+        ],
+    )
+    try:
+        await hub.connect()
+        simulator.reset_counters()
+        registers = await hub.modbus_readwrite_registers(
+            "battery_a", REG_SETPOINT, [1500, 10], read_address=45, read_count=4
+        )
+        cached = await hub.modbus_read_holding_registers(
+            REG_SOC, 1, SLAVE_CONTROL, "battery_a"
+        )
+    finally:
+        await hub.disconnect()
+
+    assert hub.readwrite_supported["battery_a"] is True
+    assert simulator.model.setpoint == 1500
+    assert registers[1] == cached[0] == 70
+    assert simulator.transactions == 1
+    assert not hub._pending_writes
+
+
+async def test_unsupported_readwrite_falls_back_to_fast_writes(hass, sax_simulators):
+    """Test a battery rejecting function code 23 is written separately."""
+    (simulator,) = await sax_simulators(1, SimulatorFaults(readwrite_unsupported=True))
+    hub = SAXBatteryHub(
+        hass,
+        [{"battery_id": "battery_a", "host": simulator.host, "port": simulator.port}],
+    )
+    with patch("custom_components.sax_battery.hub.WRITE_VERIFY_DELAY", 0):
+        try:
+            await hub.connect()
+            for setpoint in (1000, 1500):
+                assert (
+                    await hub.modbus_readwrite_registers(
+                        "battery_a",
+                        REG_SETPOINT,
+                        [setpoint, 10],
+                        read_address=45,
+                        read_count=4,
+                    )
+                    is None
+                )
+                await hub._verify_tasks[("battery_a", SLAVE_CONTROL)]
+        finally:
+            await hub.disconnect()
+
+    assert hub.readwrite_supported["battery_a"] is False
+    assert simulator.requests[(SLAVE_CONTROL, 23)] == 1
+    assert simulator.model.setpoint == 1500
+
+
+async def test_late_write_acknowledgement_is_not_a_failure(hass, sax_simulators):
+    """Test a write answered after several read round trips still succeeds."""
+    (simulator,) = await sax_simulators(1)
+    hub = await create_hub(hass, simulator_config([simulator]))
+    rtt = hub.rtt["battery_a"]
+    try:
+        for _ in range(5):
+            await hub.modbus_read_holding_registers(
+                REG_SOC, 1, SLAVE_CONTROL, "battery_a", cached=False
+            )
+        assert rtt.timeout == rtt.floor
+
+        simulator.faults.latency = 3 * rtt.floor
+        assert await hub.modbus_write_registers(
+            "battery_a", REG_SETPOINT, [1500, 10], SLAVE_CONTROL
+        )
+    finally:
+        await hub.disconnect()
+
+    assert simulator.model.setpoint == 1500
+
+
+async def test_late_readwrite_response_is_not_a_failure(hass, sax_simulators):
+    """Test a combined write and read answered late succeeds without backoff."""
+    (simulator,) = await sax_simulators(1, soc=70.0)
+    hub = await create_hub(hass, simulator_config([simulator]))
+    rtt = hub.rtt["battery_a"]
+    try:
+        for _ in range(5):
+            await hub.modbus_read_holding_registers(
+                REG_SOC, 1, SLAVE_CONTROL, "battery_a", cached=False
+            )
+        assert rtt.timeout == rtt.floor
+
+        simulator.faults.latency = 3 * rtt.floor
+        registers = await hub.modbus_readwrite_registers(
+            "battery_a", REG_SETPOINT, [1500, 10], read_address=45, read_count=4
+        )
+    finally:
+        await hub.disconnect()
+
+    assert registers is not None
+    assert registers[1] == 70
+    assert simulator.model.setpoint == 1500
+    assert rtt.backoff == 1
+
+
+@pytest.mark.parametrize("transport", TRANSPORTS)
+async def test_frame_recorder_captures_the_wire_bytes(hass, sax_simulators, transport):
+    """Test both transports record the complete request and response frames."""
+    (simulator,) = await sax_simulators(1, soc=64.0)
+    hub = SAXBatteryHub(
+        hass,
+        [
+            {
+                "battery_id": "battery_a",
+                "host": simulator.host,
+                "port": simulator.port,
+                "transport": transport,
+            }
+        ],
+    )
+    try:
+        await hub.connect()
+        hub.frame_recorder.start()
+        await hub.modbus_read_holding_registers(
+            REG_SOC, 1, SLAVE_CONTROL, "battery_a", cached=False
+        )
+    finally:
+        await hub.disconnect()
+
+    (frame,) = hub.frame_recorder.snapshot()
+    transaction_id = frame.request[:2]
+    assert frame.request == transaction_id + bytes.fromhex("000000064003002e0001")
+    assert frame.response == transaction_id + bytes.fromhex("000000054003020040")
+    assert frame.error is None
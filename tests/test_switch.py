@@ -0,0 +1,59 @@
+"""Tests for the SAX Battery switch platform."""
+
+from unittest.mock import patch
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.sax_battery.const import DOMAIN
+from custom_components.sax_battery.coordinator import SAXBatteryCoordinator
+from custom_components.sax_battery.hub import create_hub
+from custom_components.sax_battery.switch import SAXBatteryOnOffSwitch
+
+from .sax_simulator import REG_STATUS, SLAVE_CONTROL, simulator_config
+
+
+async def test_on_off_write_refreshes_the_cached_status(hass, sax_simulators):
+    """Test the on/off switch writes through the hub and its register cache."""
+    (simulator,) = await sax_simulators(1)
+    entry = MockConfigEntry(domain=DOMAIN, data=simulator_config([simulator]))
+    hub = await create_hub(hass, dict(entry.data))
+    try:
+        coordinator = SAXBatteryCoordinator(hass, hub, 60, entry)
+        await coordinator.async_refresh()
+        switch = SAXBatteryOnOffSwitch(
+            "battery_a", hub.batteries["battery_a"], coordinator
+        )
+        switch.hass = hass
+        assert switch.is_on
+
+        with (
+            patch("custom_components.sax_battery.hub.WRITE_DELAY", 0),
+            patch.object(switch, "_wait_for_status_change"),
+        ):
+            await switch.async_turn_off()
+        registers = await hub.modbus_read_holding_registers(
+            REG_STATUS, 1, SLAVE_CONTROL, "battery_a"
+        )
+    finally:
+        await hub.disconnect()
+
+    assert simulator.writes == [(REG_STATUS, [1])]
+    assert registers == [simulator.model.status]
+
+
+async def test_switch_of_slave_battery_is_available(hass, sax_simulators):
+    """Test the on/off switch of a slave battery reads its own status."""
+    simulators = await sax_simulators(2)
+    entry = MockConfigEntry(domain=DOMAIN, data=simulator_config(simulators))
+    hub = await create_hub(hass, dict(entry.data))
+    try:
+        coordinator = SAXBatteryCoordinator(hass, hub, 60, entry)
+        await coordinator.async_refresh()
+        switch = SAXBatteryOnOffSwitch(
+            "battery_b", hub.batteries["battery_b"], coordinator
+        )
+    finally:
+        await hub.disconnect()
+
+    assert switch.available
+    assert switch.is_on
@@ -0,0 +1,55 @@
+"""Tests for the register time series."""
+
+import random
+
+import pytest
+
+from custom_components.sax_battery.timeseries import RegisterSeries
+
+
+def test_empty_series():
+    """Test an empty series has no statistics."""
+    series = RegisterSeries(4)
+
+    assert len(series) == 0
+    assert series.latest is None
+    assert series.mean() is None
+    assert series.minimum() is None
+    assert series.maximum() is None
+    assert series.rate_of_change() is None
+
+
+def test_window_statistics_after_wrap():
+    """Test statistics only cover the newest ``capacity`` samples."""
+    series = RegisterSeries(3)
+    for second, value in enumerate([10.0, 1.0, 5.0, 7.0, 3.0]):
+        series.append(float(second * 60), value)
+
+    assert len(series) == 3
+    assert series.samples() == [(120.0, 5.0), (180.0, 7.0), (240.0, 3.0)]
+    assert series.latest == 3.0
+    assert series.mean() == pytest.approx(5.0)
+    assert series.minimum() == 3.0
+    assert series.maximum() == 7.0
+    assert series.rate_of_change() == pytest.approx(-2.0 / 120)
+
+
+def test_statistics_match_brute_force():
+    """Test the incremental statistics against recomputing the window."""
+    rng = random.Random(4)
+    series = RegisterSeries(7)
+    window: list[float] = []
+    for second in range(200):
+        value = rng.uniform(-100, 100)
+        series.append(float(second), value)
+        window = [*window, value][-7:]
+
+        assert series.mean() == pytest.approx(sum(window) / len(window))
+        assert series.minimum() == min(window)
+        assert series.maximum() == max(window)
+
+
+def test_invalid_capacity():
+    """Test a series needs room for at least one sample."""
+    with pytest.raises(ValueError):
+        RegisterSeries(0)